@@ -0,0 +1,5 @@
+"""
+Benchmarks
+Offline performance checks - run from the repo root:
+    python -m benchmarks.<name>
+"""
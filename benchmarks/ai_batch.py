@@ -0,0 +1,160 @@
+"""
+AI Batch Benchmark
+Weekly psychology insights for many premium users against a local stub of
+the chat completions endpoint that behaves like a rate-limited provider
+(at most PROVIDER_CONCURRENCY requests at a time, a fixed start-up cost
+per request plus generation time per insight):
+
+    serial      one call per user, one after another (old behaviour)
+    concurrent  one call per user, bounded pool
+    batched     services.ai_psychology.generate_psychology_insights_batch
+
+The stub also garbles some batch replies (a user left out, JSON cut off
+mid-way) to check that only the affected users get the rule-based
+insight.
+
+No OpenRouter needed (config.py still wants the env vars set):
+    BOT_TOKEN=x OPENROUTER_API_KEY=x python -m benchmarks.ai_batch [users]
+"""
+
+import asyncio
+import json
+import random
+import re
+import sys
+import threading
+import time
+
+from services.ai_gateway import AIGateway
+from services.ai_psychology import _fallback_insight, _week_context, generate_psychology_insights_batch
+
+USERS = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+REQUEST_COST = 0.2          # seconds per request before the first token
+PER_INSIGHT = 0.05          # seconds to generate one insight
+PROVIDER_CONCURRENCY = 4
+SERIAL_SAMPLE = 20          # serial run is timed on this many users and extrapolated
+MISSING_USER = 'User7'      # left out of its batch reply
+TRUNCATED_USER = 'User23'   # its batch reply is cut off after the third insight
+
+
+def _reply(text):
+    payload = json.dumps({
+        'id': 'stub', 'object': 'chat.completion', 'created': 0, 'model': 'stub',
+        'choices': [{'index': 0, 'finish_reason': 'stop', 'message': {'role': 'assistant', 'content': text}}],
+    }).encode()
+    return (b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+            b'Content-Length: ' + str(len(payload)).encode() + b'\r\n\r\n' + payload)
+
+
+def start_stub():
+    """Stub provider on its own thread and loop"""
+    ready = threading.Event()
+    state = {}
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                head = await reader.readuntil(b'\r\n\r\n')
+                length = 0
+                for line in head.decode().split('\r\n'):
+                    if line.lower().startswith('content-length:'):
+                        length = int(line.split(':')[1])
+                body = json.loads(await reader.readexactly(length))
+                prompt = body['messages'][-1]['content']
+                users = re.findall(r'^(u\d+): (\S+)', prompt, re.MULTILINE)
+                async with state['provider']:
+                    await asyncio.sleep(REQUEST_COST + PER_INSIGHT * max(len(users), 1))
+                if not users:
+                    text = "You showed up this week - that consistency matters. Pick one small win for tomorrow."
+                else:
+                    insights = {uid: f"{name}, your week shows steady effort. Keep one small routine going tomorrow."
+                                for uid, name in users if name != MISSING_USER}
+                    text = "Here you go:\n```json\n" + json.dumps(insights, indent=2) + "\n```"
+                    if any(name == TRUNCATED_USER for _, name in users):
+                        text = '\n'.join(text.splitlines()[:6])        # max_tokens hit mid-reply
+                writer.write(_reply(text))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    def run():
+        loop = asyncio.new_event_loop()
+        state['provider'] = asyncio.Semaphore(PROVIDER_CONCURRENCY)
+        server = loop.run_until_complete(asyncio.start_server(handle, '127.0.0.1', 0))
+        state['port'] = server.sockets[0].getsockname()[1]
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return f"http://127.0.0.1:{state['port']}/v1"
+
+
+def make_users():
+    rng = random.Random(1)
+    moods = ['great', 'good', 'okay', 'stressed', 'lonely', 'anxious']
+    users = []
+    for chat_id in range(1, USERS + 1):
+        users.append({
+            'chat_id': chat_id,
+            'user_name': f"User{chat_id}",
+            'weekly_stats': {'goals_completed': rng.randrange(8), 'total_goals': 7,
+                             'habits_completed': rng.randrange(8), 'total_habits': 7},
+            'moods': [{'mood': rng.choice(moods), 'energy_level': rng.randrange(1, 11)} for _ in range(5)],
+            'conversations': [{'user_message': rng.choice(['feeling stressed at work', 'had a good day', ''])}],
+        })
+    return users
+
+
+async def one_by_one(gateway, users, concurrency):
+    slots = asyncio.Semaphore(concurrency)
+
+    async def single(user):
+        async with slots:
+            return await gateway.complete([{"role": "user", "content": f"Psychology insight for {user['user_name']}"}])
+
+    return await asyncio.gather(*(single(user) for user in users))
+
+
+async def main():
+    gateway = AIGateway(base_url=start_stub(), api_key='x', timeout=30)
+    users = make_users()
+    print(f"🧠 {USERS} users, provider: {PROVIDER_CONCURRENCY} requests at a time, "
+          f"{REQUEST_COST}s + {PER_INSIGHT}s per insight\n")
+
+    started = time.perf_counter()
+    await one_by_one(gateway, users[:SERIAL_SAMPLE], 1)
+    serial_s = (time.perf_counter() - started) * USERS / SERIAL_SAMPLE
+    print(f"serial        {USERS:4} requests  {serial_s:6.1f}s  {USERS / serial_s:6.1f} users/s  "
+          f"(timed on {SERIAL_SAMPLE})")
+
+    started = time.perf_counter()
+    await one_by_one(gateway, users, 16)
+    concurrent_s = time.perf_counter() - started
+    print(f"concurrent    {USERS:4} requests  {concurrent_s:6.1f}s  {USERS / concurrent_s:6.1f} users/s")
+
+    started = time.perf_counter()
+    insights = await generate_psychology_insights_batch(users, gateway=gateway, batch_size=10, concurrency=4)
+    batched_s = time.perf_counter() - started
+    requests = -(-USERS // 10)
+    print(f"batched x10   {requests:4} requests  {batched_s:6.1f}s  {USERS / batched_s:6.1f} users/s  "
+          f"({serial_s / batched_s:.0f}x serial, {concurrent_s / batched_s:.1f}x concurrent)")
+
+    # Every user has an insight; only the garbled ones fell back to the rules
+    assert len(insights) == USERS
+    fallbacks = []
+    for user in users:
+        week = _week_context(user['weekly_stats'], user['moods'], user['conversations'])
+        if insights[user['chat_id']] == _fallback_insight(user['user_name'], week['completion_rate'], week['concerns']):
+            fallbacks.append(user['user_name'])
+        else:
+            assert insights[user['chat_id']].startswith(user['user_name']), insights[user['chat_id']]
+    print(f"\nparsed        {USERS - len(fallbacks)}/{USERS} from batch replies; rule-based fallback for "
+          f"{len(fallbacks)}: {', '.join(fallbacks)}")
+    await gateway.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+"""
+AI Response Cache Benchmark
+Replays a day of fixed/templated AI prompts (Daily Boost, support, menu,
+goal/habit celebrations with per-user names) through
+services.ai_cache.cached_reply with a fake API (fixed latency, a
+distinct reply per call). Reports API calls saved, hit rate, latency and
+how many different replies users saw per prompt.
+
+No OpenRouter needed:
+    python -m benchmarks.ai_cache [requests]
+"""
+
+import asyncio
+import itertools
+import random
+import sys
+import time
+from collections import defaultdict
+
+from services.ai_cache import AIResponseCache, cached_reply, normalize_prompt
+
+REQUESTS = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+API_LATENCY = 0.05
+NAMES = ['Anna', 'Ben', 'Chidi', 'Dana', 'Eli', 'Fatima', 'Gus', 'Hana']
+HABITS = ['Read', 'Meditate', 'Drink water', 'Walk 10k steps', 'Journal']
+
+
+def make_requests():
+    rng = random.Random(1)
+    prompts = []
+    for _ in range(REQUESTS):
+        name = rng.choice(NAMES)
+        kind = rng.random()
+        if kind < 0.35:
+            prompts.append(("Give me daily motivation and a boost of energy", None))
+        elif kind < 0.5:
+            prompts.append(("I need emotional support and someone to talk to", None))
+        elif kind < 0.6:
+            prompts.append((f"Give {name} a powerful, motivational message to boost their day. "
+                            f"Be energetic and inspiring. 2-3 sentences.", {'name': name}))
+        else:
+            habit = rng.choice(HABITS)
+            prompts.append((f"Celebrate! Habit: {habit}, Streak: {rng.randint(1, 7)}. Short!", {'habit': habit}))
+    return prompts
+
+
+async def main():
+    prompts = make_requests()
+    cache = AIResponseCache(ttl=3600, variants=5)
+    counter = itertools.count(1)
+    api_calls = 0
+    seen = defaultdict(set)
+    latencies = []
+
+    async def run(prompt, slots):
+        nonlocal api_calls
+
+        async def fetch():
+            nonlocal api_calls
+            api_calls += 1
+            await asyncio.sleep(API_LATENCY)
+            who = f", {slots['name']}" if slots and 'name' in slots else ''
+            return f"Reply #{next(counter)}{who}!", True
+
+        started = time.perf_counter()
+        reply = await cached_reply(prompt, fetch, slots, cache=cache)
+        latencies.append(time.perf_counter() - started)
+        seen[normalize_prompt(prompt, slots)].add(reply.split(',')[0])
+        if slots and 'name' in slots:
+            assert reply.endswith(f", {slots['name']}!"), reply
+
+    started = time.perf_counter()
+    # Bursts of 50 concurrent users, like a 9:00 rush
+    for i in range(0, len(prompts), 50):
+        await asyncio.gather(*(run(prompt, slots) for prompt, slots in prompts[i:i + 50]))
+    elapsed = time.perf_counter() - started
+
+    stats = cache.get_stats()
+    latencies.sort()
+    variety = [len(replies) for replies in seen.values()]
+    print(f"🤖 {REQUESTS} requests over {len(seen)} distinct prompts\n")
+    print(f"API calls          {api_calls:6}  (without cache: {REQUESTS}, {REQUESTS / api_calls:.1f}x fewer)")
+    print(f"hit rate           {stats['hit_rate']:6.1f}%")
+    print(f"latency p50 / p95  {latencies[len(latencies) // 2] * 1000:6.1f} / "
+          f"{latencies[int(len(latencies) * 0.95)] * 1000:.1f} ms  (API {API_LATENCY * 1000:.0f} ms)")
+    print(f"replies per prompt {min(variety)}-{max(variety)} different variants")
+    print(f"wall time          {elapsed:6.2f}s  (uncached ≈ {REQUESTS / 50 * API_LATENCY:.2f}s)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
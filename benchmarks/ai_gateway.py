@@ -0,0 +1,134 @@
+"""
+AI Gateway Benchmark
+Concurrent handler latency against a local stub of the OpenRouter chat
+completions endpoint (fixed latency per call): the old synchronous OpenAI
+client called inside async handlers vs services.ai_gateway. Also checks
+the timeout fallback and per-chat cancellation.
+
+No OpenRouter needed (config.py still wants the env vars set):
+    BOT_TOKEN=x OPENROUTER_API_KEY=x python -m benchmarks.ai_gateway [users] [latency_s]
+"""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+
+from openai import OpenAI
+
+from services.ai_gateway import AIGateway
+
+USERS = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+LATENCY = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+MESSAGES = [{"role": "user", "content": "Give me daily motivation and a boost of energy"}]
+
+
+async def stub_server(reader, writer):
+    """Minimal HTTP/1.1 keep-alive server answering every POST with a completion"""
+    try:
+        while True:
+            head = await reader.readuntil(b'\r\n\r\n')
+            length = 0
+            for line in head.decode().split('\r\n'):
+                if line.lower().startswith('content-length:'):
+                    length = int(line.split(':')[1])
+            body = json.loads(await reader.readexactly(length)) if length else {}
+            delay = LATENCY * (20 if 'slow' in json.dumps(body) else 1)
+            await asyncio.sleep(delay)
+            payload = json.dumps({
+                'id': 'stub', 'object': 'chat.completion', 'created': 0, 'model': 'stub',
+                'choices': [{'index': 0, 'finish_reason': 'stop',
+                             'message': {'role': 'assistant', 'content': 'You got this!'}}],
+            }).encode()
+            writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                         b'Content-Length: ' + str(len(payload)).encode() + b'\r\n\r\n' + payload)
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+
+def start_stub():
+    """Stub on its own thread and loop - the old sync client blocks the bot's loop"""
+    ready = threading.Event()
+    state = {}
+
+    def run():
+        loop = asyncio.new_event_loop()
+        server = loop.run_until_complete(asyncio.start_server(stub_server, '127.0.0.1', 0))
+        state['port'] = server.sockets[0].getsockname()[1]
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return f"http://127.0.0.1:{state['port']}/v1"
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+def report(label, latencies, elapsed):
+    print(f"{label:<22} {elapsed:6.2f}s total   handler p50 {percentile(latencies, 0.5):5.2f}s  "
+          f"p95 {percentile(latencies, 0.95):5.2f}s  max {max(latencies):5.2f}s")
+
+
+async def main():
+    base_url = start_stub()
+    print(f"🤖 {USERS} users ask at once, stub latency {LATENCY}s per completion\n")
+
+    # Old: blocking client inside the handler
+    sync_client = OpenAI(base_url=base_url, api_key='x', max_retries=0)
+
+    async def old_handler(latencies):
+        started = time.perf_counter()
+        sync_client.chat.completions.create(model='stub', messages=MESSAGES, max_tokens=250)
+        latencies.append(time.perf_counter() - started)
+
+
+    latencies = []
+    started = time.perf_counter()
+    await asyncio.gather(*(old_handler(latencies) for _ in range(USERS)))
+    blocking_s = time.perf_counter() - started
+    # The blocking call holds the loop: each user also waited for every call before theirs
+    waited = [sum(latencies[:n + 1]) for n in range(len(latencies))]
+    report('sync client (old)', waited, blocking_s)
+
+    gateway = AIGateway(base_url=base_url, api_key='x', timeout=LATENCY * 5)
+
+    async def new_handler(latencies):
+        started = time.perf_counter()
+        text = await gateway.ask(MESSAGES, fallback='fallback')
+        assert text == 'You got this!', text
+        latencies.append(time.perf_counter() - started)
+
+    latencies = []
+    started = time.perf_counter()
+    await asyncio.gather(*(new_handler(latencies) for _ in range(USERS)))
+    gateway_s = time.perf_counter() - started
+    report('ai_gateway', latencies, gateway_s)
+    print(f"\n{blocking_s / gateway_s:.1f}x faster for the burst")
+
+    # Timeout -> fallback
+    started = time.perf_counter()
+    text = await gateway.ask([{"role": "user", "content": "slow"}], fallback='fallback')
+    print(f"timeout: returned {text!r} after {time.perf_counter() - started:.2f}s (limit {gateway.timeout}s)")
+
+    # User moves on: the newer call for the chat cancels the older one
+    first = asyncio.create_task(gateway.ask(MESSAGES, fallback='fallback', chat_id=42))
+    await asyncio.sleep(LATENCY / 5)
+    second = await gateway.ask(MESSAGES, fallback='fallback', chat_id=42)
+    print(f"superseded: first -> {await first!r}, second -> {second!r}")
+
+    stats = gateway.get_stats()
+    print(f"stats: {stats['ok']} ok, {stats['timeouts']} timeouts, {stats['cancelled']} cancelled, "
+          f"avg {stats['avg_latency_s']:.2f}s")
+    await gateway.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,165 @@
+"""
+AI Streaming Benchmark
+Free-chat replies against a local stub of the OpenRouter streaming
+endpoint (server-sent events, a short "thinking" delay then one word per
+tick): time until the user sees text with the plain reply vs a streamed
+LiveMessage, how many edits it cost and their spacing. Also checks a
+superseded stream and a stream cut off by the timeout.
+
+No OpenRouter needed (config.py still wants the env vars set):
+    BOT_TOKEN=x OPENROUTER_API_KEY=x python -m benchmarks.ai_streaming [words] [word_s]
+"""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+
+from services.ai_gateway import AIGateway
+from services.live_message import LiveMessage
+
+WORDS = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+WORD_DELAY = float(sys.argv[2]) if len(sys.argv) > 2 else 0.04
+THINKING = 0.3
+EDIT_INTERVAL = 1.0
+REPLY = ' '.join(f"word{i}" for i in range(WORDS))
+
+
+def _chunk(payload):
+    data = payload.encode()
+    return f"{len(data):x}\r\n".encode() + data + b'\r\n'
+
+
+async def stub_server(reader, writer):
+    """HTTP/1.1 keep-alive stub: JSON completions, or SSE chunks when stream=true"""
+    try:
+        while True:
+            head = await reader.readuntil(b'\r\n\r\n')
+            length = 0
+            for line in head.decode().split('\r\n'):
+                if line.lower().startswith('content-length:'):
+                    length = int(line.split(':')[1])
+            body = json.loads(await reader.readexactly(length)) if length else {}
+            words = REPLY.split(' ')
+            if 'slow' in json.dumps(body['messages']):
+                words = words[:5] + [None]           # stalls after five words
+            await asyncio.sleep(THINKING)
+
+            if not body.get('stream'):
+                await asyncio.sleep(WORD_DELAY * len(words))
+                payload = json.dumps({
+                    'id': 'stub', 'object': 'chat.completion', 'created': 0, 'model': 'stub',
+                    'choices': [{'index': 0, 'finish_reason': 'stop',
+                                 'message': {'role': 'assistant', 'content': REPLY}}],
+                }).encode()
+                writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                             b'Content-Length: ' + str(len(payload)).encode() + b'\r\n\r\n' + payload)
+                await writer.drain()
+                continue
+
+            writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n'
+                         b'Transfer-Encoding: chunked\r\n\r\n')
+            for i, word in enumerate(words):
+                if word is None:
+                    await asyncio.sleep(3600)
+                event = {'id': 'stub', 'object': 'chat.completion.chunk', 'created': 0, 'model': 'stub',
+                         'choices': [{'index': 0, 'finish_reason': None,
+                                      'delta': {'content': word if i == 0 else ' ' + word}}]}
+                writer.write(_chunk(f"data: {json.dumps(event)}\n\n"))
+                await writer.drain()
+                await asyncio.sleep(WORD_DELAY)
+            writer.write(_chunk("data: [DONE]\n\n") + b'0\r\n\r\n')
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+
+def start_stub():
+    ready = threading.Event()
+    state = {}
+
+    def run():
+        loop = asyncio.new_event_loop()
+        server = loop.run_until_complete(asyncio.start_server(stub_server, '127.0.0.1', 0))
+        state['port'] = server.sockets[0].getsockname()[1]
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return f"http://127.0.0.1:{state['port']}/v1"
+
+
+class FakeMessage:
+    """Stands in for telegram.Message: records when text became visible"""
+
+    def __init__(self, log, started):
+        self.log = log
+        self.started = started
+
+    async def reply_text(self, text, **kwargs):
+        self.log.append(('send', time.perf_counter() - self.started, text))
+        await asyncio.sleep(0.05)                   # Bot API round trip
+        return FakeMessage(self.log, self.started)
+
+    async def edit_text(self, text, **kwargs):
+        self.log.append(('edit', time.perf_counter() - self.started, text))
+        await asyncio.sleep(0.05)
+
+
+async def plain(gateway, messages):
+    log = []
+    started = time.perf_counter()
+    response = await gateway.ask(messages, fallback='fallback')
+    await FakeMessage(log, started).reply_text(response)
+    return log
+
+
+async def streamed(gateway, messages, chat_id=None):
+    log = []
+    started = time.perf_counter()
+    live = LiveMessage(FakeMessage(log, started), interval=EDIT_INTERVAL)
+    response = await gateway.ask(messages, fallback='fallback', chat_id=chat_id, on_text=live.update)
+    await live.finish(response)
+    return log
+
+
+async def main():
+    gateway = AIGateway(base_url=start_stub(), api_key='x', timeout=10)
+    messages = [{"role": "user", "content": "Tell me something nice"}]
+    total = THINKING + WORDS * WORD_DELAY
+    print(f"💬 {WORDS}-word reply, first token after {THINKING}s, full reply after ~{total:.1f}s\n")
+
+    log = await plain(gateway, messages)
+    print(f"plain reply        first text at {log[0][1]:5.2f}s   1 message")
+
+    log = await streamed(gateway, messages)
+    sends = [entry for entry in log if entry[0] == 'send']
+    edits = [entry for entry in log if entry[0] == 'edit']
+    gaps = [b[1] - a[1] for a, b in zip(log, log[1:-1])]
+    assert len(sends) == 1 and log[-1][2] == REPLY, log[-1]
+    print(f"streamed reply     first text at {log[0][1]:5.2f}s   1 message + {len(edits)} edits, "
+          f"min gap {min(gaps) if gaps else 0:.2f}s between paced updates, final text complete")
+
+    # A newer message from the same chat supersedes the stream
+    first = asyncio.create_task(streamed(gateway, messages, chat_id=7))
+    await asyncio.sleep(THINKING + 10 * WORD_DELAY)
+    await streamed(gateway, messages, chat_id=7)
+    print(f"superseded         older reply ends {(await first)[-1][2][-12:]!r} (kept, marked cut off)")
+
+    # Stalled stream: keep what arrived
+    gateway.timeout = 1.5
+    log = await streamed(gateway, [{"role": "user", "content": "slow"}])
+    print(f"stalled stream     after {log[-1][1]:.2f}s shows {log[-1][2]!r}")
+
+    stats = gateway.get_stats()
+    print(f"\nstats: {stats['streams']} streams, avg first token {stats['avg_first_token_s']:.2f}s, "
+          f"{stats['truncated']} truncated, {stats['cancelled']} cancelled")
+    await gateway.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
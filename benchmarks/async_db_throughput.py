@@ -0,0 +1,121 @@
+"""
+Async DB Throughput Benchmark
+Updates dispatched by a real PTB Application (update queue -> handler),
+blocking DB calls vs database.async_db, with PTB's default one-at-a-time
+processing and with concurrent_updates(UPDATE_CONCURRENCY) as bot.py builds
+it. The async layer only helps once updates are processed concurrently.
+
+Each simulated update runs QUERIES_PER_UPDATE queries that block for
+QUERY_MS (time.sleep stands in for a mysql.connector round trip). The Bot
+API is replaced by an offline request backend, so no network is needed:
+    BOT_TOKEN=x OPENROUTER_API_KEY=x python -m benchmarks.async_db_throughput
+"""
+
+import asyncio
+import json
+import time
+
+from telegram import Update
+from telegram.ext import ApplicationBuilder, TypeHandler
+from telegram.request import BaseRequest
+
+from config import UPDATE_CONCURRENCY
+from database.async_db import run_sync, DB_WORKERS
+
+UPDATES = 200
+QUERIES_PER_UPDATE = 2
+QUERY_MS = 5
+
+
+class OfflineRequest(BaseRequest):
+    """Answers every Bot API call locally (getMe during initialize)"""
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def do_request(self, url, method, request_data=None, read_timeout=None,
+                         write_timeout=None, connect_timeout=None, pool_timeout=None):
+        me = {'id': 1, 'is_bot': True, 'first_name': 'bench', 'username': 'bench_bot'}
+        return 200, json.dumps({'ok': True, 'result': me}).encode()
+
+
+def fake_query(chat_id):
+    """Blocking stand-in for one DB round trip"""
+    time.sleep(QUERY_MS / 1000)
+    return chat_id
+
+
+async def handler_blocking(update, context):
+    """Handler as before: sync DB calls straight from the coroutine"""
+    for _ in range(QUERIES_PER_UPDATE):
+        fake_query(update.effective_chat.id)
+
+
+async def handler_async(update, context):
+    """Handler using the async layer"""
+    for _ in range(QUERIES_PER_UPDATE):
+        await run_sync(fake_query, update.effective_chat.id)
+
+
+def make_update(bot, n):
+    return Update.de_json({
+        'update_id': n,
+        'message': {'message_id': n, 'date': 0, 'text': 'hi',
+                    'chat': {'id': n, 'type': 'private'},
+                    'from': {'id': n, 'is_bot': False, 'first_name': 'User'}},
+    }, bot)
+
+
+async def measure(handler, concurrency):
+    app = (
+        ApplicationBuilder()
+        .token('1:bench')
+        .request(OfflineRequest())
+        .get_updates_request(OfflineRequest())
+        .concurrent_updates(concurrency)
+        .build()
+    )
+    done = asyncio.Event()
+    handled = 0
+
+    async def counted(update, context):
+        nonlocal handled
+        await handler(update, context)
+        handled += 1
+        if handled == UPDATES:
+            done.set()
+
+    app.add_handler(TypeHandler(Update, counted))
+    await app.initialize()
+    await app.start()
+    started = time.perf_counter()
+    for n in range(UPDATES):
+        await app.update_queue.put(make_update(app.bot, n))
+    await done.wait()
+    elapsed = time.perf_counter() - started
+    await app.stop()
+    await app.shutdown()
+    return elapsed, UPDATES / elapsed
+
+
+async def main():
+    print(f"📊 {UPDATES} queued updates × {QUERIES_PER_UPDATE} queries × {QUERY_MS}ms "
+          f"({DB_WORKERS} DB workers), dispatched by Application\n")
+
+    results = {}
+    for concurrency in (1, UPDATE_CONCURRENCY):
+        for label, handler in (('blocking calls', handler_blocking), ('async_db', handler_async)):
+            elapsed, rate = await measure(handler, concurrency)
+            results[label, concurrency] = elapsed
+            print(f"concurrent_updates={concurrency:<3} {label:<15}: {elapsed:6.2f}s  {rate:8.1f} updates/s")
+
+    baseline = results['blocking calls', 1]
+    print(f"\n⚡ async_db alone: {baseline / results['async_db', 1]:.1f}x   "
+          f"async_db + concurrent updates: {baseline / results['async_db', UPDATE_CONCURRENCY]:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
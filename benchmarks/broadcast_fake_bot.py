@@ -0,0 +1,112 @@
+"""
+Broadcast Benchmark
+Runs the broadcast sender against a local fake Bot that enforces a flood
+limit (429 RetryAfter), fails some chats as blocked, and adds network
+latency. Compares the old sequential loop with services.broadcast, paced
+by the outbound dispatcher the way ApplicationBuilder().rate_limiter()
+wires it into the real Bot.
+
+No database or Telegram needed. Limits are scaled up 10x so the run
+takes seconds instead of minutes:
+    python -m benchmarks.broadcast_fake_bot [users]
+"""
+
+import asyncio
+import sys
+import time
+from collections import deque
+
+from telegram.error import RetryAfter, Forbidden
+
+from services.broadcast import send_to_chats
+from services.outbound import OutboundDispatcher
+
+USERS = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+LATENCY = 0.1          # seconds per API call
+FLOOD_LIMIT = 300      # fake Telegram: messages per second (real: ~30)
+BLOCKED_EVERY = 50     # every Nth chat has blocked the bot
+
+
+class FakeBot:
+    """send_message with latency, a sliding-window flood limit and blocked chats"""
+
+    def __init__(self, dispatcher=None):
+        self.dispatcher = dispatcher
+        self.window = deque()
+        self.delivered = 0
+        self.flood_errors = 0
+
+    async def send_message(self, chat_id, text, rate_limit_args=None, **kwargs):
+        if self.dispatcher is None:
+            return await self._deliver(chat_id)
+        # What telegram.Bot does with a rate limiter set
+        return await self.dispatcher.process_request(
+            self._deliver, (chat_id,), {}, 'sendMessage', {'chat_id': chat_id}, rate_limit_args
+        )
+
+    async def _deliver(self, chat_id):
+        await asyncio.sleep(LATENCY)
+        now = time.monotonic()
+        while self.window and now - self.window[0] > 1:
+            self.window.popleft()
+        if len(self.window) >= FLOOD_LIMIT:
+            self.flood_errors += 1
+            raise RetryAfter(1)
+        if chat_id % BLOCKED_EVERY == 0:
+            raise Forbidden("Forbidden: bot was blocked by the user")
+        self.window.append(now)
+        self.delivered += 1
+
+
+async def sequential(bot, chat_ids):
+    """The old admin_broadcast_command loop"""
+    sent = failed = 0
+    for chat_id in chat_ids:
+        try:
+            await bot.send_message(chat_id=chat_id, text="hi", parse_mode='Markdown')
+            sent += 1
+        except Exception:
+            failed += 1
+    return {'sent': sent, 'failed': failed, 'blocked': 0}
+
+
+async def engine(bot, chat_ids, concurrency):
+    counts = {'sent': 0, 'failed': 0, 'blocked': 0}
+    await send_to_chats(bot, chat_ids, "hi", counts, concurrency=concurrency)
+    return counts
+
+
+async def run(label, coro_factory, rate=None):
+    dispatcher = OutboundDispatcher(global_rate=rate) if rate else None
+    if dispatcher:
+        await dispatcher.initialize()
+    bot = FakeBot(dispatcher)
+    started = time.perf_counter()
+    counts = await coro_factory(bot)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<36} {elapsed:7.2f}s  {USERS / elapsed:7.0f} msg/s  "
+          f"{counts}  429s: {bot.flood_errors}")
+    if dispatcher:
+        await dispatcher.shutdown()
+    return counts
+
+
+async def main():
+    chat_ids = list(range(1, USERS + 1))
+    expected_blocked = USERS // BLOCKED_EVERY
+    print(f"📢 {USERS} users, {LATENCY * 1000:.0f}ms latency, fake flood limit {FLOOD_LIMIT}/s\n")
+
+    await run("sequential (old)", lambda bot: sequential(bot, chat_ids))
+    ok = await run("engine, rate 250/s, 50 in flight",
+                   lambda bot: engine(bot, chat_ids, concurrency=50), rate=250)
+    pushy = await run("engine, rate 500/s (over the limit)",
+                      lambda bot: engine(bot, chat_ids, concurrency=100), rate=500)
+
+    for counts in (ok, pushy):
+        assert counts['sent'] == USERS - expected_blocked, counts
+        assert counts['blocked'] == expected_blocked, counts
+    print("\n✅ Every reachable user delivered exactly once; 429s were backed off and retried")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
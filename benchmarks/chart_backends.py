@@ -0,0 +1,83 @@
+"""
+Chart Backend Benchmark
+Cold start, render time and memory of the matplotlib vs Pillow chart
+backends. Each backend runs in a fresh Python process (CHART_BACKEND set
+in its environment) so import cost and peak RSS are measured honestly.
+
+No database or Telegram needed:
+    python -m benchmarks.chart_backends [renders_per_chart]
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+RENDERS = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+CHILD = r"""
+import json, resource, sys, time
+
+def rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+base = rss_mb()
+started = time.perf_counter()
+from services import chart_generator as cg
+imported = time.perf_counter() - started
+
+DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+jobs = {
+    'weekly': lambda: cg.render_weekly_chart(DAYS, [1, 2, 0, 3, 4, 2, 5]),
+    'three_day': lambda: cg.render_3day_feedback_chart('Run', DAYS, [True, False, True, True, False, False, False]),
+    'badges': lambda: cg.render_badge_showcase([{'badge_type': 'soul_gold'}]),
+}
+
+started = time.perf_counter()
+jobs['weekly']()
+first = time.perf_counter() - started
+
+result = {'import_s': imported, 'first_s': first, 'heavy_imported': 'matplotlib' in sys.modules}
+for kind, job in jobs.items():
+    started = time.perf_counter()
+    for _ in range(RENDERS):
+        png = job()
+    result[kind + '_ms'] = (time.perf_counter() - started) / RENDERS * 1000
+    result[kind + '_kb'] = len(png) / 1024
+result['rss_base_mb'] = base
+result['rss_peak_mb'] = rss_mb()
+print(json.dumps(result))
+"""
+
+
+def run(backend):
+    env = dict(os.environ, CHART_BACKEND=backend)
+    out = subprocess.run(
+        [sys.executable, '-c', f"RENDERS = {RENDERS}\n" + CHILD],
+        env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    print(f"🖼️ {RENDERS} renders per chart type, fresh process per backend\n")
+    results = {backend: run(backend) for backend in ('matplotlib', 'pillow')}
+
+    rows = [
+        ('import chart_generator', 'import_s', 1000, 'ms'),
+        ('first chart (cold)', 'first_s', 1000, 'ms'),
+        ('weekly', 'weekly_ms', 1, 'ms'),
+        ('3-day feedback', 'three_day_ms', 1, 'ms'),
+        ('badge showcase', 'badges_ms', 1, 'ms'),
+        ('weekly PNG size', 'weekly_kb', 1, 'KB'),
+        ('peak RSS', 'rss_peak_mb', 1, 'MB'),
+    ]
+    print(f"{'':<24} {'matplotlib':>12} {'pillow':>12} {'ratio':>7}")
+    for label, key, factor, unit in rows:
+        mpl, pil = results['matplotlib'][key] * factor, results['pillow'][key] * factor
+        print(f"{label:<24} {mpl:>9.1f} {unit:<2} {pil:>9.1f} {unit:<2} {mpl / pil if pil else 0:>6.1f}x")
+    print(f"\nmatplotlib imported by the pillow backend: {results['pillow']['heavy_imported']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Chart Cache Benchmark
+Replays repeated chart sends (the same few data series going to many
+chats, plus re-sends) against a fake Bot that charges upload time per
+byte and hands back file_ids. Compares renders, uploaded bytes and wall
+time without the cache vs with services.chart_cache, then checks the
+LRU size cap.
+
+No database or Telegram needed (charts render inline):
+    python -m benchmarks.chart_cache [sends] [distinct_series]
+"""
+
+import asyncio
+import itertools
+import random
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+from services.chart_cache import ChartCache, chart_key, get_chart, send_photo_cached
+from services.chart_generator import render_weekly_chart
+
+SENDS = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+SERIES = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+UPLOAD_BYTES_PER_S = 2 * 1024 * 1024
+DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+
+class InlineCharts:
+    """chart_service stand-in that renders on the loop and counts renders"""
+
+    def __init__(self):
+        self.renders = 0
+
+    async def render(self, kind, *args):
+        self.renders += 1
+        return render_weekly_chart(*args)
+
+
+class FakeBot:
+    def __init__(self):
+        self.uploaded = 0
+        self._ids = itertools.count(1)
+
+    async def send_photo(self, chat_id, photo, **kwargs):
+        if isinstance(photo, bytes):
+            self.uploaded += len(photo)
+            await asyncio.sleep(len(photo) / UPLOAD_BYTES_PER_S)
+        else:
+            await asyncio.sleep(0.01)
+        return SimpleNamespace(photo=[SimpleNamespace(file_id=f"AgAD{next(self._ids)}")])
+
+
+def make_sends():
+    rng = random.Random(1)
+    series = [[rng.randrange(6) for _ in DAYS] for _ in range(SERIES)]
+    return [(chat_id, series[rng.randrange(SERIES)]) for chat_id in range(SENDS)]
+
+
+async def without_cache(sends):
+    bot, charts = FakeBot(), InlineCharts()
+    started = time.perf_counter()
+    for chat_id, completions in sends:
+        png = await charts.render('weekly', DAYS, completions)
+        await bot.send_photo(chat_id=chat_id, photo=png)
+    return time.perf_counter() - started, charts.renders, bot.uploaded
+
+
+async def with_cache(sends, cache):
+    bot, charts = FakeBot(), InlineCharts()
+    started = time.perf_counter()
+    for chat_id, completions in sends:
+        key, photo = await get_chart('weekly', (DAYS, completions), cache=cache, charts=charts)
+        await send_photo_cached(bot, chat_id, key, photo, cache)
+    return time.perf_counter() - started, charts.renders, bot.uploaded
+
+
+async def main():
+    sends = make_sends()
+    print(f"🖼️ {SENDS} sends of {SERIES} distinct weekly charts\n")
+
+    plain = await without_cache(sends)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = ChartCache(cache_dir)
+        cached = await with_cache(sends, cache)
+        stats = cache.get_stats()
+
+        # Second run after a "restart": PNGs and file_ids come back from disk
+        restarted = await with_cache(sends, ChartCache(cache_dir))
+
+    for label, (elapsed, renders, uploaded) in (('no cache', plain), ('chart cache', cached),
+                                                ('after restart', restarted)):
+        print(f"{label:<14} {elapsed:6.2f}s  {renders:4} renders  {uploaded / 1024:8.0f} KB uploaded")
+    print(f"\n{plain[0] / cached[0]:.1f}x faster, {stats['entries']} cached charts "
+          f"({stats['size_mb']:.2f} MB), {stats['file_id_hits']} file_id reuses")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        png = render_weekly_chart(DAYS, [1] * 7)
+        cap = ChartCache(cache_dir, max_bytes=len(png) * 3)
+        for n in range(10):
+            cap.put(chart_key('weekly', (n,)), png)
+        stats = cap.get_stats()
+        assert stats['entries'] == 3 and stats['evictions'] == 7, stats
+        print(f"size cap 3 charts: {stats['entries']} kept, {stats['evictions']} evicted")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,88 @@
+"""
+Chart Backend Parity Check
+Renders every chart type with both backends (matplotlib and Pillow) on the
+same data and checks they show the same picture: image size within 5%,
+downscaled grayscale images close (mean difference), and the same share
+of each key color (done/missed bars, line fill, earned badges).
+Side-by-side PNGs are written for eyeballing.
+
+Exits 1 on any mismatch:
+    python -m benchmarks.chart_parity [output_dir]
+"""
+
+import io
+import os
+import sys
+
+from PIL import Image, ImageChops, ImageStat
+
+from services import chart_generator, chart_pillow
+
+OUT_DIR = sys.argv[1] if len(sys.argv) > 1 else os.path.join('data', 'chart_parity')
+MAX_MEAN_DIFF = 20          # of 255, on a 60x36 grayscale thumbnail
+MAX_COLOR_SHARE_DIFF = 0.04
+DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+CASES = [
+    ('weekly rising', 'render_weekly_chart', (DAYS, [1, 2, 0, 3, 4, 2, 5]), ['#4A90E2', '#27AE60']),
+    ('weekly empty', 'render_weekly_chart', (DAYS, [0] * 7), ['#4A90E2']),
+    ('3-day goal', 'render_3day_feedback_chart', ('Run 5k', DAYS, [True, False, True, True, False, False, False], 'goal'),
+     ['#27AE60', '#E74C3C']),
+    ('3-day habit', 'render_3day_feedback_chart', ('Read', DAYS, [False] * 7, 'habit'), ['#27AE60', '#E74C3C']),
+    ('badges none', 'render_badge_showcase', ([],), ['#4A90E2']),
+    ('badges gold x2', 'render_badge_showcase', ([{'badge_type': 'soul_gold'}] * 2,), ['#4A90E2']),
+]
+
+
+def color_share(image, color, tolerance=40):
+    """Fraction of pixels within tolerance of color"""
+    target = tuple(int(color.lstrip('#')[i:i + 2], 16) for i in (0, 2, 4))
+    pixels = image.convert('RGB').resize((300, 180)).getdata()
+    close = sum(1 for p in pixels if sum(abs(a - b) for a, b in zip(p, target)) <= tolerance)
+    return close / len(pixels)
+
+
+def render(backend, func, args):
+    module = chart_pillow if backend == 'pillow' else chart_generator
+    return Image.open(io.BytesIO(getattr(module, func)(*args)))
+
+
+def main():
+    chart_generator.CHART_BACKEND = 'matplotlib'     # whatever the env says, compare against matplotlib
+    os.makedirs(OUT_DIR, exist_ok=True)
+    failures = 0
+    print(f"{'chart':<16} {'size mpl':>11} {'size pil':>11} {'diff':>6}  colors (mpl/pil)")
+    for name, func, args, colors in CASES:
+        mpl, pil = render('matplotlib', func, args), render('pillow', func, args)
+        problems = []
+
+        if any(abs(a - b) / a > 0.05 for a, b in zip(mpl.size, pil.size)):
+            problems.append('size')
+
+        thumbs = [img.convert('L').resize((60, 36)) for img in (mpl, pil)]
+        diff = ImageStat.Stat(ImageChops.difference(*thumbs)).mean[0]
+        if diff > MAX_MEAN_DIFF:
+            problems.append('layout')
+
+        shares = []
+        for color in colors:
+            a, b = color_share(mpl, color), color_share(pil, color)
+            shares.append(f"{color} {a:.1%}/{b:.1%}")
+            if abs(a - b) > MAX_COLOR_SHARE_DIFF:
+                problems.append(color)
+
+        side = Image.new('RGB', (mpl.width + pil.width, max(mpl.height, pil.height)), 'white')
+        side.paste(mpl.convert('RGB'), (0, 0))
+        side.paste(pil.convert('RGB'), (mpl.width, 0))
+        side.save(os.path.join(OUT_DIR, name.replace(' ', '_') + '.png'))
+
+        status = '✅' if not problems else f"❌ {', '.join(problems)}"
+        print(f"{name:<16} {'%dx%d' % mpl.size:>11} {'%dx%d' % pil.size:>11} {diff:6.1f}  {'  '.join(shares)}  {status}")
+        failures += bool(problems)
+
+    print(f"\nside-by-side images in {OUT_DIR}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Chart Service Benchmark
+Charts/sec and event-loop stalls: rendering inline on the loop (old
+behaviour) vs services.chart_service with warm worker processes. A ticker
+coroutine measures how late the loop wakes up while charts render - that
+is the delay every other handler sees.
+
+No database or Telegram needed:
+    python -m benchmarks.chart_service [charts] [workers]
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+
+from services.chart_generator import render_weekly_chart, render_3day_feedback_chart
+from services.chart_service import ChartService
+
+CHARTS = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+WORKERS = int(sys.argv[2]) if len(sys.argv) > 2 else max(1, os.cpu_count() or 1)
+TICK = 0.01
+DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+
+def make_jobs():
+    rng = random.Random(1)
+    jobs = []
+    for n in range(CHARTS):
+        if n % 2:
+            jobs.append(('weekly', (DAYS, [rng.randrange(6) for _ in DAYS])))
+        else:
+            jobs.append(('three_day', (f"Habit {n}", DAYS, [rng.random() < 0.6 for _ in DAYS], 'habit')))
+    return jobs
+
+
+INLINE = {'weekly': render_weekly_chart, 'three_day': render_3day_feedback_chart}
+
+
+async def ticker(lags, stop):
+    """Sleeps TICK and records how late it wakes up"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - started - TICK)
+
+
+async def measure(label, render_all):
+    lags, stop = [], asyncio.Event()
+    tick = asyncio.create_task(ticker(lags, stop))
+    await asyncio.sleep(TICK * 2)
+    started = time.perf_counter()
+    pngs = await render_all()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await tick
+    assert len(pngs) == CHARTS and all(png[:4] == b'\x89PNG' for png in pngs)
+    lags.sort()
+    print(f"{label:<18} {elapsed:6.2f}s  {CHARTS / elapsed:6.1f} charts/s  "
+          f"loop lag p50 {lags[len(lags) // 2] * 1000:6.0f}ms  max {lags[-1] * 1000:6.0f}ms")
+    return elapsed
+
+
+async def main():
+    jobs = make_jobs()
+    print(f"🖼️ {CHARTS} charts, {WORKERS} worker(s), {os.cpu_count()} CPU(s)\n")
+
+    async def inline():
+        pngs = []
+        for kind, args in jobs:
+            pngs.append(INLINE[kind](*args))
+            await asyncio.sleep(0)
+        return pngs
+
+    service = ChartService(workers=WORKERS, max_queue=CHARTS)
+    started = time.perf_counter()
+    service.start()
+    print(f"workers warm in {time.perf_counter() - started:.2f}s (once, before the first chart)\n")
+
+    async def pooled():
+        return await asyncio.gather(*(service.render(kind, *args) for kind, args in jobs))
+
+    try:
+        inline_s = await measure('inline (old)', inline)
+        pooled_s = await measure('chart service', pooled)
+    finally:
+        service.shutdown()
+    print(f"\n{inline_s / pooled_s:.1f}x throughput")
+
+    limited = ChartService(workers=1, max_queue=5)
+    results = await asyncio.gather(*(limited.render(kind, *args) for kind, args in jobs[:10]),
+                                   return_exceptions=True)
+    limited.shutdown()
+    rejected = sum(1 for r in results if isinstance(r, Exception))
+    print(f"queue limit 5: {10 - rejected} rendered, {rejected} rejected with ChartQueueFull")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
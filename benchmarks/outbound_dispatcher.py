@@ -0,0 +1,108 @@
+"""
+Outbound Dispatcher Load Test
+Simulates a 9:00 burst - thousands of reminders, a running broadcast and
+a trickle of interactive replies - through services.outbound against a
+fake Telegram backend with a flood limit and latency. Reports per-class
+throughput, wait times and 429s.
+
+No Telegram needed. Rates are scaled up 10x so the run takes seconds:
+    python -m benchmarks.outbound_dispatcher
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+
+from telegram.error import RetryAfter
+
+from services.outbound import OutboundDispatcher, PRIORITIES
+
+SCALE = 10
+FLOOD_LIMIT = 30 * SCALE     # fake Telegram: messages per second
+LATENCY = 0.05
+REMINDERS = 3000
+BROADCAST = 2000
+INTERACTIVE = 200            # replies spread over the run
+
+
+class FakeTelegram:
+    """Sliding-window flood limit; over the limit answers 429 retry_after=1"""
+
+    def __init__(self):
+        self.window = deque()
+        self.flood_errors = 0
+
+    async def post(self, endpoint, data):
+        await asyncio.sleep(LATENCY)
+        now = time.monotonic()
+        while self.window and now - self.window[0] > 1:
+            self.window.popleft()
+        if len(self.window) >= FLOOD_LIMIT:
+            self.flood_errors += 1
+            raise RetryAfter(1)
+        self.window.append(now)
+        return True
+
+
+async def send(dispatcher, backend, priority, chat_id, latencies):
+    started = time.monotonic()
+    data = {'chat_id': chat_id, 'text': 'hi'}
+    await dispatcher.process_request(
+        callback=backend.post, args=('sendMessage', data), kwargs={},
+        endpoint='sendMessage', data=data, rate_limit_args={'priority': priority}
+    )
+    latencies[priority].append(time.monotonic() - started)
+
+
+async def interactive_trickle(dispatcher, backend, latencies, duration):
+    """Users tapping buttons while the burst is going out"""
+    tasks = []
+    for _ in range(INTERACTIVE):
+        await asyncio.sleep(duration / INTERACTIVE)
+        tasks.append(asyncio.create_task(
+            send(dispatcher, backend, 'interactive', random.randrange(10**6, 2 * 10**6), latencies)
+        ))
+    await asyncio.gather(*tasks)
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))] if values else 0.0
+
+
+async def main():
+    dispatcher = OutboundDispatcher(global_rate=25 * SCALE, per_chat_rate=1 * SCALE)
+    backend = FakeTelegram()
+    await dispatcher.initialize()
+    latencies = {name: [] for name in PRIORITIES}
+
+    total = REMINDERS + BROADCAST + INTERACTIVE
+    expected = total / (25 * SCALE)
+    print(f"📤 {REMINDERS} reminders + {BROADCAST} broadcast + {INTERACTIVE} replies, "
+          f"flood limit {FLOOD_LIMIT}/s (≈{expected:.0f}s at the configured rate)\n")
+
+    started = time.monotonic()
+    await asyncio.gather(
+        *(send(dispatcher, backend, 'reminder', 1000 + i, latencies) for i in range(REMINDERS)),
+        *(send(dispatcher, backend, 'broadcast', 100000 + i, latencies) for i in range(BROADCAST)),
+        interactive_trickle(dispatcher, backend, latencies, duration=expected * 0.8),
+    )
+    elapsed = time.monotonic() - started
+    await dispatcher.shutdown()
+
+    print(f"{'class':<12} {'sent':>6} {'msg/s':>7} {'p50':>8} {'p95':>8} {'max':>8}")
+    stats = dispatcher.get_stats()
+    for name in PRIORITIES:
+        values = latencies[name]
+        if not values:
+            continue
+        print(f"{name:<12} {stats[name]['sent']:>6} {stats[name]['sent'] / elapsed:>7.0f} "
+              f"{percentile(values, 0.5) * 1000:>7.0f}ms {percentile(values, 0.95) * 1000:>7.0f}ms "
+              f"{max(values) * 1000:>7.0f}ms")
+
+    print(f"\n⏱️ {elapsed:.1f}s total, {total / elapsed:.0f} msg/s, 429s from fake Telegram: {backend.flood_errors}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
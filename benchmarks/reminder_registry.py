@@ -0,0 +1,133 @@
+"""
+Reminder Registry Benchmark
+Registers 100k reminders and compares lookup / cancel / reschedule on the
+reminder engine against the old approach: scanning every job_queue job and
+matching its name.
+
+No database or Telegram needed. FakeJob only holds a name, so the old
+approach's memory figure is a lower bound - a real PTB/APScheduler job
+costs several KB more each.
+"""
+
+import random
+import time
+import tracemalloc
+
+import pytz
+
+from services.reminder_engine import ReminderEngine
+
+REMINDERS = 100_000
+OPERATIONS = 1_000
+TIMEZONES = ['UTC', 'Europe/Moscow', 'America/New_York', 'Asia/Tokyo', 'Asia/Kolkata']
+
+
+class FakeJob:
+    """Just enough of a PTB Job for name scans"""
+
+    def __init__(self, name):
+        self.name = name
+        self.removed = False
+
+    def schedule_removal(self):
+        self.removed = True
+
+
+def make_reminders():
+    """(chat_id, kind, item_id, 'HH:MM', tz) for REMINDERS reminders"""
+    rng = random.Random(42)
+    reminders = []
+    chat_id = 100000
+    while len(reminders) < REMINDERS:
+        chat_id += 1
+        tz = pytz.timezone(rng.choice(TIMEZONES))
+        for kind in ('goal', 'habit'):
+            for item_id in range(1, 4):
+                at = f"{rng.randrange(24):02d}:{rng.choice((0, 15, 30, 45)):02d}"
+                reminders.append((chat_id, kind, item_id, at, tz))
+        reminders.append((chat_id, 'eod', 0, "21:00", tz))
+    return reminders[:REMINDERS]
+
+
+def job_name(chat_id, kind, item_id, at):
+    return f"{kind}_{chat_id}_{item_id}_{at.replace(':', '')}"
+
+
+def timed(label, func, targets):
+    started = time.perf_counter()
+    for target in targets:
+        func(*target)
+    elapsed = time.perf_counter() - started
+    per_op = elapsed / len(targets) * 1_000_000
+    print(f"   {label:<28} {elapsed * 1000:9.1f}ms total  {per_op:10.2f}µs/op")
+    return per_op
+
+
+def bench_jobs(reminders, targets):
+    print("\n📋 Linear job-name scan (old)")
+    tracemalloc.start()
+    jobs = [FakeJob(job_name(c, k, i, at)) for c, k, i, at, _ in reminders]
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"   {'memory':<28} {memory / 1024 / 1024:9.1f}MB")
+
+    def lookup(chat_id, kind, item_id, at):
+        name = job_name(chat_id, kind, item_id, at)
+        return [job for job in jobs if job.name == name]
+
+    def cancel(chat_id, kind, item_id, at):
+        prefix = f"{kind}_{chat_id}_{item_id}_"
+        for job in jobs:
+            if job.name.startswith(prefix):
+                job.schedule_removal()
+
+    results = {}
+    results['lookup'] = timed("lookup", lookup, targets)
+    results['cancel'] = timed("cancel item", cancel, targets)
+    results['reschedule'] = results['cancel']  # scan + re-add: the scan dominates
+    return results
+
+
+def bench_engine(reminders, targets):
+    print("\n⚡ Reminder engine (new)")
+    engine = ReminderEngine()
+    by_item = {}
+    for chat_id, kind, item_id, at, tz in reminders:
+        by_item.setdefault((chat_id, kind, item_id, tz), []).append(at)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    for (chat_id, kind, item_id, tz), times in by_item.items():
+        engine.add(chat_id, kind, item_id, times, tz)
+    elapsed = time.perf_counter() - started
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"   {'memory':<28} {memory / 1024 / 1024:9.1f}MB")
+    print(f"   {'register ' + str(engine.stats()['reminders']):<28} {elapsed * 1000:9.1f}ms total")
+
+    tz = pytz.timezone('Europe/Berlin')
+    results = {}
+    results['lookup'] = timed("lookup", engine.get, targets)
+    results['reschedule'] = timed(
+        "reschedule item", lambda c, k, i, at: engine.reschedule(c, k, i, [at, "08:00"], tz), targets
+    )
+    results['cancel'] = timed("cancel item", lambda c, k, i, at: engine.cancel(c, k, i), targets)
+    return results
+
+
+def main():
+    reminders = make_reminders()
+    rng = random.Random(7)
+    targets = [r[:4] for r in rng.sample(reminders, OPERATIONS)]
+
+    print(f"🔔 {REMINDERS:,} reminders, {OPERATIONS:,} operations each")
+    old = bench_jobs(reminders, targets)
+    new = bench_engine(reminders, targets)
+
+    print("\n📊 Speedup")
+    for op in ('lookup', 'cancel', 'reschedule'):
+        print(f"   {op:<28} {old[op] / new[op]:9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Streak Concurrency Check
+Hammers one habit and one goal with concurrent "done today" taps through
+database.async_db and verifies the streak moved exactly once.
+
+Needs a reachable MySQL (same MYSQL* env vars as the bot). Uses a throwaway
+chat_id and deletes it afterwards.
+"""
+
+import asyncio
+import time
+
+from database import get_db_connection, save_user, add_habit, add_goal
+from database import async_db
+
+TEST_CHAT_ID = -900000001
+TAPS = 50
+
+
+def cleanup():
+    """Remove the throwaway user (goals/habits cascade)"""
+    connection = get_db_connection()
+    if not connection:
+        return
+    cursor = connection.cursor()
+    try:
+        cursor.execute("DELETE FROM users WHERE chat_id = %s", (TEST_CHAT_ID,))
+        connection.commit()
+    finally:
+        cursor.close()
+        connection.close()
+
+
+async def hammer(name, complete, get_item, item_id):
+    started = time.perf_counter()
+    results = await asyncio.gather(*(complete(TEST_CHAT_ID, item_id) for _ in range(TAPS)))
+    elapsed = time.perf_counter() - started
+
+    successes = sum(1 for ok, _ in results if ok)
+    item = await get_item(TEST_CHAT_ID, item_id)
+
+    status = "✅" if successes == 1 and item['streak'] == 1 else "❌"
+    print(f"{status} {name}: {TAPS} concurrent taps -> {successes} success, "
+          f"streak {item['streak']} ({elapsed * 1000:.0f}ms)")
+    return successes == 1 and item['streak'] == 1
+
+
+async def main():
+    connection = get_db_connection()
+    if not connection:
+        print("❌ No database - set MYSQLHOST/MYSQLUSER/... and retry")
+        return
+    connection.close()
+
+    cleanup()
+    save_user(TEST_CHAT_ID, {'name': 'streak-bench', 'timezone': 'UTC', 'onboarded': True})
+    habit_id = add_habit(TEST_CHAT_ID, "Concurrency habit")
+    goal_id = add_goal(TEST_CHAT_ID, "Concurrency goal", target_days=30)
+
+    try:
+        habit_ok = await hammer("habit", async_db.complete_habit_today, async_db.get_habit_by_id, habit_id)
+        goal_ok = await hammer("goal", async_db.complete_goal_today, async_db.get_goal_by_id, goal_id)
+    finally:
+        cleanup()
+
+    print("\n🎯 Atomic" if habit_ok and goal_ok else "\n⚠️ Lost update detected")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
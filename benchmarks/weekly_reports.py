@@ -0,0 +1,101 @@
+"""
+Weekly Report Benchmark
+Serial per-user loop (old send_weekly_reports) vs the staged pipeline for
+one chunk of fake premium users: real matplotlib charts, a fake blocking AI
+call and a fake Bot with network latency.
+
+No database, OpenRouter or Telegram needed (config.py still wants the
+env vars set, any value works):
+    BOT_TOKEN=x OPENROUTER_API_KEY=x python -m benchmarks.weekly_reports [users]
+"""
+
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from services.chart_cache import ChartCache
+from services.chart_generator import render_weekly_chart
+from services.weekly_report_pipeline import (
+    WeeklyReportPipeline, build_report, completion_rate, pick_badge, week_series
+)
+
+USERS = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+AI_LATENCY = 0.8       # seconds per (blocking) AI call
+SEND_LATENCY = 0.15    # seconds per send_photo upload
+
+
+def fake_ai(chat_id, stats, user_name):
+    time.sleep(AI_LATENCY)
+    return f"{user_name}, solid week - keep going."
+
+
+class FakeBot:
+    def __init__(self):
+        self.sent = 0
+
+    async def send_photo(self, chat_id, photo, caption, **kwargs):
+        await asyncio.sleep(SEND_LATENCY)
+        assert photo[:4] == b'\x89PNG'
+        self.sent += 1
+
+
+def make_users(today):
+    rng = random.Random(1)
+    users, stats, series = [], {}, {}
+    for chat_id in range(1, USERS + 1):
+        users.append({'chat_id': chat_id, 'name': f"User{chat_id}"})
+        daily = {today - timedelta(days=d): rng.randrange(6) for d in range(7)}
+        done = sum(daily.values())
+        stats[chat_id] = {'goals_completed': done // 2, 'habits_completed': done - done // 2,
+                          'total_goals': 21, 'total_habits': 21}
+        series[chat_id] = daily
+    return users, stats, series
+
+
+async def serial(bot, users, stats, series, today):
+    """One user at a time, everything on the event loop (old behaviour)"""
+    for user in users:
+        chat_id = user['chat_id']
+        rate = completion_rate(stats[chat_id])
+        days, completions = week_series(series[chat_id], today)
+        png = render_weekly_chart(days, completions)
+        insight = fake_ai(chat_id, stats[chat_id], user['name'])
+        report = build_report(user['name'], stats[chat_id], rate, pick_badge(rate), insight)
+        await bot.send_photo(chat_id=chat_id, photo=png, caption=report)
+
+
+async def main():
+    today = date.today()
+    users, stats, series = make_users(today)
+    print(f"📊 {USERS} users, AI {AI_LATENCY}s, send {SEND_LATENCY}s\n")
+
+    bot = FakeBot()
+    started = time.perf_counter()
+    await serial(bot, users, stats, series, today)
+    serial_s = time.perf_counter() - started
+    print(f"serial (old)   {serial_s:7.1f}s  {USERS / serial_s:6.1f} reports/s")
+
+    bot = FakeBot()
+    cache_dir = tempfile.TemporaryDirectory()
+    pipeline = WeeklyReportPipeline(bot, cache=ChartCache(cache_dir.name), ai_func=fake_ai, ai_batch=1)
+    try:
+        started = time.perf_counter()
+        await pipeline.process_chunk(users, stats, series, today)
+        pipeline_s = time.perf_counter() - started
+    finally:
+        pipeline.close()
+        cache_dir.cleanup()
+    print(f"pipeline       {pipeline_s:7.1f}s  {USERS / pipeline_s:6.1f} reports/s  ({serial_s / pipeline_s:.1f}x)")
+
+    summary = pipeline.summary()
+    for stage in ('chart', 'ai', 'send'):
+        timing = summary[stage]
+        print(f"   {stage:<6} {timing['calls']:4} calls  avg {timing['avg_s']:.2f}s  max {timing['max_s']:.2f}s")
+    assert bot.sent == USERS, bot.sent
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -3,21 +3,30 @@ from telegram.ext import (
     ApplicationBuilder, CommandHandler, CallbackQueryHandler,
     MessageHandler, filters, ContextTypes
 )
-from config import BOT_TOKEN
+from config import BOT_TOKEN, UPDATE_CONCURRENCY
 from handlers import start, goals, habits
 from handlers.timezone_handler import get_timezone_handlers
-from handlers.menu_handlers import handle_menu_buttons
+from handlers.menu_handlers import handle_menu_buttons, free_chat
 from handlers.goals import goal_conversation, edit_goal_conversation, handle_goal_actions
 from handlers.habits import add_habit_handler, edit_add_habit_handler, handle_habit_actions
-from handlers.admin import admin_stats_command, admin_users_command, admin_broadcast_command
+from handlers.admin import admin_stats_command, admin_users_command, admin_broadcast_command, admin_broadcast_stop_command
 from handlers.premium import handle_premium_callback, premium_command, cancel_premium_command, get_premium_handlers  # 🆕 Import premium handlers, cancel_premium_command
-from jobs.scheduled_jobs import get_scheduled_jobs  # 🆕 Import scheduled jobs
+from handlers.jobs.scheduled_jobs import get_scheduled_jobs
 from handlers.mood_enhanced import get_mood_handlers_enhanced
-from database import load_data, get_all_goals, get_all_habits, delete_goal, delete_habit
+from database import load_data_chunks, get_all_goals, get_all_habits, delete_goal, delete_habit
 from database import get_goal_by_id, get_habit_by_id, get_user_timezone, get_user, save_user
+from database import get_user_tzinfo, peek_user_tzinfo
+from database import async_db, write_behind, close_pool, is_done, mark_done
 from services.ui_service import get_main_menu_keyboard
 from services.ai_response import chat_with_ai
+from services.ai_gateway import ai_gateway
+from services.reminder_engine import reminder_engine
+from services.broadcast import resume_broadcasts
+from services.outbound import outbound
+from services.chart_service import chart_service
+from services.content_pool import content_pool, refresh_content_pool, CONTENT_POOL_HOUR
 # from services.ui_service import render_detailed_progress_screen  # Not needed
+import asyncio
 import datetime
 from datetime import time
 import pytz
@@ -25,81 +34,75 @@ import re
 
 # ===== MENU BUTTON HANDLER =====
 def get_user_tz_object(chat_id):
-    """Get timezone object for user"""
-    tz_name = get_user_timezone(chat_id)
-    try:
-        return pytz.timezone(tz_name)
-    except:
-        return pytz.UTC
+    """Get timezone object for user (cached, no DB hit once warm)"""
+    return get_user_tzinfo(chat_id)
+
+async def get_user_tz_object_async(chat_id):
+    """Timezone lookup without blocking the event loop"""
+    tzinfo = peek_user_tzinfo(chat_id)
+    if tzinfo is None:
+        tzinfo = await async_db.run_sync(get_user_tzinfo, chat_id)
+    return tzinfo
 
 # ===== REMINDER FUNCTIONS (MULTI-TIMEZONE) =====
-async def send_goal_reminder(context):
-    """Send goal reminder if not completed today"""
-    job = context.job
-    chat_id = job.data['chat_id']
-    goal = job.data['goal']
-    
-    user_tz = get_user_tz_object(chat_id)
-    user_now = datetime.datetime.now(user_tz)
-    today = user_now.date().isoformat()
-    
-    if goal.get('last_checkin') != today and goal.get('status') == 'active':
-        await context.bot.send_message(
-            chat_id=chat_id,
-            text=f"🔔 **GOAL REMINDER** 🔔\n\n"
-                 f"💭 {goal.get('motivation', 'Stay on track!')}\n\n"
-                 f"**Goal:** {goal['goal']}\n"
-                 f"🔥 Streak: {goal.get('streak', 0)} days\n"
-                 f"🎯 Target: {goal.get('target_days', 30)} days\n\n"
-                 f"Mark it done: /goaldone {goal['id']}",
-            parse_mode='Markdown',
-            disable_notification=False
-        )
+async def send_goal_reminder(bot, chat_id, goal):
+    """Send goal reminder (goal is current state from the tick's batch lookup)"""
+    # Precomputed nudge only - the reminder tick never waits on the AI
+    motivation = (goal.get('motivation')
+                  or content_pool.pick('goal_reminder', chat_id, slots={'goal': goal['goal']})
+                  or 'Stay on track!')
+    await bot.send_message(
+        chat_id=chat_id,
+        text=f"🔔 **GOAL REMINDER** 🔔\n\n"
+             f"💭 {motivation}\n\n"
+             f"**Goal:** {goal['goal']}\n"
+             f"🔥 Streak: {goal.get('streak', 0)} days\n"
+             f"🎯 Target: {goal.get('target_days', 30)} days\n\n"
+             f"Mark it done: /goaldone {goal['id']}",
+        parse_mode='Markdown',
+        disable_notification=False,
+        rate_limit_args={'priority': 'reminder'}
+    )
 
-async def send_habit_reminder(context):
-    """Send habit reminder if not completed today"""
-    job = context.job
-    chat_id = job.data['chat_id']
-    habit = job.data['habit']
-    
-    user_tz = get_user_tz_object(chat_id)
-    user_now = datetime.datetime.now(user_tz)
-    today = user_now.date().isoformat()
-    
-    if habit.get('last_completed') != today and habit.get('status') == 'active':
-        days_left = 21 - habit.get('streak', 0)
-        await context.bot.send_message(
-            chat_id=chat_id,
-            text=f"🔔 **HABIT REMINDER** 🔔\n\n"
-                 f"**Habit:** {habit['habit']}\n"
-                 f"🔥 Streak: {habit.get('streak', 0)}/21 days\n"
-                 f"⏳ Days left: {days_left}\n\n"
-                 f"Complete it: /habitdone {habit['id']}",
-            parse_mode='Markdown',
-            disable_notification=False
-        )
+async def send_habit_reminder(bot, chat_id, habit):
+    """Send habit reminder (habit is current state from the tick's batch lookup)"""
+    days_left = 21 - habit.get('streak', 0)
+    nudge = content_pool.pick('habit_reminder', chat_id, slots={'habit': habit['habit']})
+    nudge_line = f"💭 {nudge}\n\n" if nudge else ""
+    await bot.send_message(
+        chat_id=chat_id,
+        text=f"🔔 **HABIT REMINDER** 🔔\n\n"
+             f"{nudge_line}"
+             f"**Habit:** {habit['habit']}\n"
+             f"🔥 Streak: {habit.get('streak', 0)}/21 days\n"
+             f"⏳ Days left: {days_left}\n\n"
+             f"Complete it: /habitdone {habit['id']}",
+        parse_mode='Markdown',
+        disable_notification=False,
+        rate_limit_args={'priority': 'reminder'}
+    )
 
 # ===== EOD SUMMARY FUNCTIONS =====
-async def send_eod_summary(context):
+async def send_eod_summary(bot, chat_id, item_id=0):
     """Send End of Day summary"""
-    job = context.job
-    chat_id = job.data['chat_id']
-    
-    user_tz = get_user_tz_object(chat_id)
+    user_tz = await get_user_tz_object_async(chat_id)
     user_now = datetime.datetime.now(user_tz)
-    today = user_now.date().isoformat()
+    today = user_now.date()
     
-    goals_list = get_all_goals(chat_id)
-    habits_list = get_all_habits(chat_id)
+    goals_list = await async_db.get_all_goals(chat_id)
+    habits_list = await async_db.get_all_habits(chat_id)
     
     if not goals_list and not habits_list:
         return
     
-    completed_goals = [g for g in goals_list if g.get('last_checkin') == today]
-    missed_goals = [g for g in goals_list if g.get('last_checkin') != today]
+    # Today's bit for every item, one query
+    done = await async_db.get_histories([chat_id], today, today)
+    
+    completed_goals = [g for g in goals_list if done.get((chat_id, 'goal', g['id']))]
+    missed_goals = [g for g in goals_list if not done.get((chat_id, 'goal', g['id']))]
     
-    completed_habits = [h for h in habits_list if h.get('last_completed') == today]
-    missed_habits = [h for h in habits_list if h.get('last_completed') != today]
+    completed_habits = [h for h in habits_list if done.get((chat_id, 'habit', h['id']))]
+    missed_habits = [h for h in habits_list if not done.get((chat_id, 'habit', h['id']))]
     
     total_completed = len(completed_goals) + len(completed_habits)
     
@@ -129,103 +132,138 @@ async def send_eod_summary(context):
     else:
         summary += f"\n🎉 Perfect day! Keep it up tomorrow!"
     
-    await context.bot.send_message(
+    await bot.send_message(
         chat_id=chat_id,
         text=summary,
         parse_mode='Markdown',
-        disable_notification=False
+        disable_notification=False,
+        rate_limit_args={'priority': 'reminder'}
+    )
+
+REMINDER_SENDERS = {'goal': send_goal_reminder, 'habit': send_habit_reminder}
+LAST_DONE_FIELD = {'goal': 'last_checkin', 'habit': 'last_completed'}
+
+async def load_due_items(due, today):
+    """
+    Current state of every due goal/habit in one batched lookup per kind.
+    Items already known done today are answered from the completion cache.
+    """
+    keys = {'goal': [], 'habit': []}
+    for chat_id, kind, item_id, _ in due:
+        if kind in keys and not is_done(chat_id, kind, item_id, today[chat_id]):
+            keys[kind].append((chat_id, item_id))
+    
+    goals, habits = await asyncio.gather(
+        async_db.get_goals_by_keys(keys['goal']),
+        async_db.get_habits_by_keys(keys['habit'])
     )
+    return {'goal': goals, 'habit': habits}
 
-def schedule_eod_summary(application, chat_id, eod_time):
-    """Schedule EOD summary for a user"""
-    user_tz = get_user_tz_object(chat_id)
+async def reminder_tick(context):
+    """Every minute: resolve fresh state for everything due, then fan out the sends"""
+    due = reminder_engine.due()
+    if not due:
+        return
+    
+    # Local "today" per user (timezones come from the user cache)
+    chat_ids = list({chat_id for chat_id, _, _, _ in due})
+    tzinfos = await asyncio.gather(*(get_user_tz_object_async(chat_id) for chat_id in chat_ids))
+    today = {
+        chat_id: datetime.datetime.now(tzinfo).date().isoformat()
+        for chat_id, tzinfo in zip(chat_ids, tzinfos)
+    }
+    
+    items = await load_due_items(due, today)
+    
+    sends = []
+    sent_keys = []
+    for key in due:
+        chat_id, kind, item_id, _ = key
+        if kind == 'eod':
+            sends.append(send_eod_summary(context.bot, chat_id))
+            sent_keys.append(key)
+            continue
+        
+        item = items[kind].get((chat_id, item_id))
+        if not item or item.get('status') != 'active':
+            continue
+        if item.get(LAST_DONE_FIELD[kind]) == today[chat_id]:
+            mark_done(chat_id, kind, item_id, today[chat_id])
+            continue
+        
+        sends.append(REMINDER_SENDERS[kind](context.bot, chat_id, item))
+        sent_keys.append(key)
+    
+    results = await asyncio.gather(*sends, return_exceptions=True)
+    for (chat_id, kind, item_id, at), result in zip(sent_keys, results):
+        if isinstance(result, Exception):
+            print(f"❌ {kind} #{item_id} reminder for {chat_id} at {at} failed: {result}")
+
+async def schedule_eod_summary(application, chat_id, eod_time):
+    """Schedule EOD summary for a user (replaces any previous time)"""
+    user_tz = await get_user_tz_object_async(chat_id)
     
     try:
-        parts = eod_time.split(':')
-        if len(parts) == 2:
-            h = int(parts[0])
-            m = int(parts[1])
-            
-            current_jobs = application.job_queue.jobs()
-            for job in current_jobs:
-                if job.name and job.name == f"{chat_id}_eod":
-                    job.schedule_removal()
-            
-            eod_time_obj = time(hour=h, minute=m, tzinfo=user_tz)
-            
-            application.job_queue.run_daily(
-                send_eod_summary,
-                time=eod_time_obj,
-                data={'chat_id': chat_id},
-                name=f"{chat_id}_eod"
-            )
-            print(f"✅ EOD Summary scheduled for user {chat_id} at {h:02d}:{m:02d} {user_tz.zone}")
-            return True
+        if not reminder_engine.reschedule(chat_id, 'eod', 0, [eod_time], user_tz):
+            return False
+        print(f"✅ EOD Summary scheduled for user {chat_id} at {eod_time} {user_tz.zone}")
+        return True
     except Exception as e:
         print(f"❌ Error scheduling EOD: {e}")
         return False
 
 # ===== DYNAMIC REMINDER SCHEDULING =====
-def schedule_single_goal_reminder(application, chat_id, goal):
-    """Schedule reminders for a single goal immediately"""
-    user_tz = get_user_tz_object(chat_id)
-    
-    for reminder_time in goal.get('reminder_times', ['09:00']):
-        try:
-            parts = reminder_time.split(':')
-            if len(parts) == 2:
-                h = int(parts[0])
-                m = int(parts[1])
-                
-                reminder_time_obj = time(hour=h, minute=m, tzinfo=user_tz)
-                
-                application.job_queue.run_daily(
-                    send_goal_reminder,
-                    time=reminder_time_obj,
-                    data={'chat_id': chat_id, 'goal': goal},
-                    name=f"{chat_id}_goal_{goal['id']}_{h:02d}:{m:02d}"
-                )
-                print(f"✅ AUTO-SCHEDULED: Goal #{goal['id']} reminder at {h:02d}:{m:02d} {user_tz.zone}")
-        except Exception as e:
-            print(f"❌ Error auto-scheduling goal reminder: {e}")
-
-def schedule_single_habit_reminder(application, chat_id, habit):
-    """Schedule reminders for a single habit immediately"""
-    user_tz = get_user_tz_object(chat_id)
-    
-    for reminder_time in habit.get('reminder_times', ['09:00']):
-        try:
-            parts = reminder_time.split(':')
-            if len(parts) == 2:
-                h = int(parts[0])
-                m = int(parts[1])
-                
-                reminder_time_obj = time(hour=h, minute=m, tzinfo=user_tz)
-                
-                application.job_queue.run_daily(
-                    send_habit_reminder,
-                    time=reminder_time_obj,
-                    data={'chat_id': chat_id, 'habit': habit},
-                    name=f"{chat_id}_habit_{habit['id']}_{h:02d}:{m:02d}"
-                )
-                print(f"✅ AUTO-SCHEDULED: Habit #{habit['id']} reminder at {h:02d}:{m:02d} {user_tz.zone}")
-        except Exception as e:
-            print(f"❌ Error auto-scheduling habit reminder: {e}")
+async def schedule_single_goal_reminder(application, chat_id, goal):
+    """Schedule reminders for a single goal immediately (replaces old times)"""
+    user_tz = await get_user_tz_object_async(chat_id)
+    count = reminder_engine.add(chat_id, 'goal', goal['id'], goal.get('reminder_times', ['09:00']), user_tz)
+    print(f"✅ AUTO-SCHEDULED: Goal #{goal['id']} - {count} reminder(s) {user_tz.zone}")
+
+async def schedule_single_habit_reminder(application, chat_id, habit):
+    """Schedule reminders for a single habit immediately (replaces old times)"""
+    user_tz = await get_user_tz_object_async(chat_id)
+    count = reminder_engine.add(chat_id, 'habit', habit['id'], habit.get('reminder_times', ['09:00']), user_tz)
+    print(f"✅ AUTO-SCHEDULED: Habit #{habit['id']} - {count} reminder(s) {user_tz.zone}")
+
+# ===== AUTOMATED JOBS =====
+WEEKDAYS = ('sun', 'mon', 'tue', 'wed', 'thu', 'fri', 'sat')   # PTB 20: 0 = Sunday
+
+def schedule_job(job_queue, job_config):
+    """Register one get_scheduled_jobs() entry on the job queue"""
+    callback, name = job_config['callback'], job_config['name']
+    if job_config['trigger'] == 'daily':
+        job_queue.run_daily(callback, time=job_config['time'], name=name)
+    elif job_config['trigger'] == 'cron':
+        job_queue.run_daily(
+            callback,
+            time=time(hour=job_config['hour'], minute=job_config['minute'], tzinfo=job_config['timezone']),
+            days=(WEEKDAYS.index(job_config['day_of_week']),),
+            name=name
+        )
+    elif job_config['trigger'] == 'hourly':
+        now = datetime.datetime.now(pytz.UTC)
+        first = now.replace(minute=job_config['minute'], second=0, microsecond=0)
+        if first <= now:
+            first += datetime.timedelta(hours=1)
+        job_queue.run_repeating(callback, interval=3600, first=first, name=name)
+    else:
+        raise ValueError(f"Unknown trigger {job_config['trigger']!r} for job {name}")
 
 # ===== INITIAL REMINDER SCHEDULING (ON STARTUP) =====
 def schedule_custom_reminders(application):
     """Schedule reminders for each user in their timezone on bot startup"""
-    data = load_data()
-    
     print("\n" + "=" * 70)
     print("⏰ SCHEDULING REMINDERS (MULTI-TIMEZONE SUPPORT)")
     print("=" * 70)
     
     total_reminders = 0
     
-    for chat_id_str, user in data.items():
+    users = (item for chunk in load_data_chunks() for item in chunk.items())
+    
+    for chat_id_str, user in users:
         chat_id = int(chat_id_str)
         
+        # The bulk load primed the user cache - no per-user query
         user_tz = get_user_tz_object(chat_id)
         user_now = datetime.datetime.now(user_tz)
         
@@ -235,74 +273,34 @@ def schedule_custom_reminders(application):
         
         for goal in user.get('goals', []):
             if isinstance(goal, dict) and goal.get('status') == 'active':
-                for reminder_time in goal.get('reminder_times', ['09:00']):
-                    try:
-                        parts = reminder_time.split(':')
-                        if len(parts) == 2:
-                            h = int(parts[0])
-                            m = int(parts[1])
-                            
-                            reminder_time_obj = time(hour=h, minute=m, tzinfo=user_tz)
-                            
-                            application.job_queue.run_daily(
-                                send_goal_reminder,
-                                time=reminder_time_obj,
-                                data={'chat_id': chat_id, 'goal': goal},
-                                name=f"{chat_id}_goal_{goal['id']}_{h:02d}:{m:02d}"
-                            )
-                            
-                            print(f"   ✅ Goal #{goal['id']} at {h:02d}:{m:02d}")
-                            total_reminders += 1
-                    except Exception as e:
-                        print(f"   ❌ Error scheduling goal {goal.get('id')}: {e}")
+                count = reminder_engine.add(
+                    chat_id, 'goal', goal['id'], goal.get('reminder_times', ['09:00']), user_tz
+                )
+                print(f"   ✅ Goal #{goal['id']}: {count} reminder(s)")
+                total_reminders += count
         
         for habit in user.get('habits', []):
             if isinstance(habit, dict) and habit.get('status') == 'active':
-                for reminder_time in habit.get('reminder_times', ['09:00']):
-                    try:
-                        parts = reminder_time.split(':')
-                        if len(parts) == 2:
-                            h = int(parts[0])
-                            m = int(parts[1])
-                            
-                            reminder_time_obj = time(hour=h, minute=m, tzinfo=user_tz)
-                            
-                            application.job_queue.run_daily(
-                                send_habit_reminder,
-                                time=reminder_time_obj,
-                                data={'chat_id': chat_id, 'habit': habit},
-                                name=f"{chat_id}_habit_{habit['id']}_{h:02d}:{m:02d}"
-                            )
-                            
-                            print(f"   ✅ Habit #{habit['id']} at {h:02d}:{m:02d}")
-                            total_reminders += 1
-                    except Exception as e:
-                        print(f"   ❌ Error scheduling habit {habit.get('id')}: {e}")
+                count = reminder_engine.add(
+                    chat_id, 'habit', habit['id'], habit.get('reminder_times', ['09:00']), user_tz
+                )
+                print(f"   ✅ Habit #{habit['id']}: {count} reminder(s)")
+                total_reminders += count
         
         eod_time = user.get('eod_time', None)
         if eod_time:
-            try:
-                parts = eod_time.split(':')
-                if len(parts) == 2:
-                    h = int(parts[0])
-                    m = int(parts[1])
-                    
-                    eod_time_obj = time(hour=h, minute=m, tzinfo=user_tz)
-                    
-                    application.job_queue.run_daily(
-                        send_eod_summary,
-                        time=eod_time_obj,
-                        data={'chat_id': chat_id},
-                        name=f"{chat_id}_eod"
-                    )
-                    
-                    print(f"   📊 EOD Summary at {h:02d}:{m:02d}")
-                    total_reminders += 1
-            except Exception as e:
-                print(f"   ❌ Error scheduling EOD: {e}")
+            if reminder_engine.add(chat_id, 'eod', 0, [eod_time], user_tz):
+                print(f"   📊 EOD Summary at {eod_time}")
+                total_reminders += 1
+            else:
+                print(f"   ❌ Invalid EOD time: {eod_time}")
+    
+    # One ticking job drives every reminder and EOD summary
+    reminder_engine.start(application.job_queue, reminder_tick)
     
     print("\n" + "=" * 70)
     print(f"✅ Total reminders scheduled: {total_reminders}")
+    print(f"📇 Reminder index: {reminder_engine.stats()}")
     print("=" * 70 + "\n")
 
 # ===== EOD COMMANDS =====
@@ -338,14 +336,14 @@ async def set_eod_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     chat_id = update.effective_chat.id
     
     # Save to MySQL database
-    user = get_user(chat_id)
+    user = await async_db.get_user(chat_id)
     user['eod_time'] = eod_time
-    save_user(chat_id, user)
+    await async_db.save_user(chat_id, user)
     
-    success = schedule_eod_summary(context.application, chat_id, eod_time)
+    success = await schedule_eod_summary(context.application, chat_id, eod_time)
     
     if success:
-        user_tz = get_user_tz_object(chat_id)
+        user_tz = await get_user_tz_object_async(chat_id)
         await update.message.reply_text(
             f"✅ **End of Day Summary Set!**\n\n"
             f"⏰ Time: {eod_time}\n"
@@ -361,11 +359,11 @@ async def show_eod_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     chat_id = update.effective_chat.id
     
     # Load from MySQL database
-    user = get_user(chat_id)
+    user = await async_db.get_user(chat_id)
     eod_time = user.get('eod_time', None)
     
     if eod_time:
-        user_tz = get_user_tz_object(chat_id)
+        user_tz = await get_user_tz_object_async(chat_id)
         await update.message.reply_text(
             f"⏰ **Your End of Day Summary**\n\n"
             f"📊 Time: {eod_time}\n"
@@ -387,7 +385,7 @@ async def test_eod_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     chat_id = update.effective_chat.id
     
     async def send_test_eod(context):
-        await send_eod_summary(context)
+        await send_eod_summary(context.bot, context.job.data['chat_id'])
     
     context.application.job_queue.run_once(
         send_test_eod,
@@ -407,7 +405,7 @@ async def test_reminder_now(update: Update, context: ContextTypes.DEFAULT_TYPE):
     chat_id = update.effective_chat.id
     
     async def send_test_notification(context):
-        user_tz = get_user_tz_object(context.job.chat_id)
+        user_tz = await get_user_tz_object_async(context.job.chat_id)
         user_now = datetime.datetime.now(user_tz)
         await context.bot.send_message(
             chat_id=context.job.chat_id,
@@ -426,7 +424,7 @@ async def test_reminder_now(update: Update, context: ContextTypes.DEFAULT_TYPE):
         chat_id=chat_id
     )
     
-    user_tz = get_user_tz_object(chat_id)
+    user_tz = await get_user_tz_object_async(chat_id)
     user_now = datetime.datetime.now(user_tz)
     await update.message.reply_text(
         f"⏰ **Test Reminder Scheduled!**\n\n"
@@ -439,8 +437,10 @@ async def test_reminder_now(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def check_scheduled_reminders(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Check scheduled reminders"""
     chat_id = update.effective_chat.id
-    all_jobs = context.application.job_queue.jobs()
-    my_jobs = [job for job in all_jobs if job.name and str(chat_id) in str(job.name)]
+    my_jobs = [
+        f"EOD summary at {at}" if kind == 'eod' else f"{kind} #{item_id} at {at}"
+        for _, kind, item_id, at in sorted(reminder_engine.reminders_for(chat_id))
+    ]
     
     if not my_jobs:
         await update.message.reply_text(
@@ -450,21 +450,21 @@ async def check_scheduled_reminders(update: Update, context: ContextTypes.DEFAUL
         )
         return
     
-    user_tz = get_user_tz_object(chat_id)
+    user_tz = await get_user_tz_object_async(chat_id)
     message = f"⏰ **Your Scheduled Reminders ({len(my_jobs)}):**\n\n"
     message += f"🌍 Timezone: {user_tz.zone}\n\n"
     for job in my_jobs:
-        message += f"• {job.name}\n"
+        message += f"• {job}\n"
     
     await update.message.reply_text(message, parse_mode='Markdown')
 
 async def show_my_reminder_times(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show reminder times"""
     chat_id = update.effective_chat.id
-    goals_list = get_all_goals(chat_id)
-    habits_list = get_all_habits(chat_id)
+    goals_list = await async_db.get_all_goals(chat_id)
+    habits_list = await async_db.get_all_habits(chat_id)
     
-    user_tz = get_user_tz_object(chat_id)
+    user_tz = await get_user_tz_object_async(chat_id)
     user_now = datetime.datetime.now(user_tz)
     
     message = f"⏰ **Your Reminder Times**\n\n"
@@ -491,7 +491,7 @@ async def show_my_reminder_times(update: Update, context: ContextTypes.DEFAULT_T
 async def show_timezone(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show timezone information"""
     chat_id = update.effective_chat.id
-    user_tz = get_user_tz_object(chat_id)
+    user_tz = await get_user_tz_object_async(chat_id)
     user_now = datetime.datetime.now(user_tz)
     utc_now = datetime.datetime.now(pytz.UTC)
     
@@ -521,18 +521,15 @@ async def delete_goal_command(update: Update, context: ContextTypes.DEFAULT_TYPE
     try:
         goal_id = int(context.args[0])
         chat_id = update.effective_chat.id
-        goal = get_goal_by_id(chat_id, goal_id)
+        goal = await async_db.get_goal_by_id(chat_id, goal_id)
         
         if not goal:
             await update.message.reply_text(f"❌ Goal #{goal_id} not found!")
             return
         
-        current_jobs = context.application.job_queue.jobs()
-        for job in current_jobs:
-            if job.name and job.name.startswith(f"{chat_id}_goal_{goal_id}_"):
-                job.schedule_removal()
+        reminder_engine.remove(chat_id, 'goal', goal_id)
         
-        delete_goal(chat_id, goal_id)
+        await async_db.delete_goal(chat_id, goal_id)
         
         await update.message.reply_text(
             f"🗑️ **Goal Deleted!**\n\n"
@@ -558,18 +555,15 @@ async def delete_habit_command(update: Update, context: ContextTypes.DEFAULT_TYP
     try:
         habit_id = int(context.args[0])
         chat_id = update.effective_chat.id
-        habit = get_habit_by_id(chat_id, habit_id)
+        habit = await async_db.get_habit_by_id(chat_id, habit_id)
         
         if not habit:
             await update.message.reply_text(f"❌ Habit #{habit_id} not found!")
             return
         
-        current_jobs = context.application.job_queue.jobs()
-        for job in current_jobs:
-            if job.name and job.name.startswith(f"{chat_id}_habit_{habit_id}_"):
-                job.schedule_removal()
+        reminder_engine.remove(chat_id, 'habit', habit_id)
         
-        delete_habit(chat_id, habit_id)
+        await async_db.delete_habit(chat_id, habit_id)
         
         await update.message.reply_text(
             f"🗑️ **Habit Deleted!**\n\n"
@@ -601,10 +595,48 @@ async def set_bot_commands(application):
     await application.bot.set_my_commands(commands)
     print("📱 Bot commands registered!")
 
+async def resume_broadcasts_job(context):
+    """Pick up broadcasts a restart interrupted"""
+    await resume_broadcasts(context.application)
+
+async def refresh_content_pool_job(context):
+    """Off-peak: regenerate the motivation/congratulation pool"""
+    fresh, total = await refresh_content_pool()
+    print(f"📝 Content pool: {fresh}/{total} pools regenerated")
+
+async def on_startup(application):
+    """post_init: command menu and content pool, then resume broadcasts once the bot is running (chart workers start on the first chart)"""
+    await set_bot_commands(application)
+    await async_db.run_sync(content_pool.load)
+    application.job_queue.run_once(resume_broadcasts_job, when=5, name='resume_broadcasts')
+    application.job_queue.run_daily(refresh_content_pool_job, time=time(hour=CONTENT_POOL_HOUR, tzinfo=pytz.UTC),
+                                    name='content_pool')
+    if content_pool.is_stale():
+        # First run or missed nights: fill the pool now instead of waiting for the next off-peak slot
+        application.job_queue.run_once(refresh_content_pool_job, when=60, name='content_pool_now')
+
+async def release_resources(application):
+    """Flush queued writes, then release database executor and pooled connections"""
+    write_behind.stop_all()
+    chart_service.shutdown(wait=False)
+    if content_pool.pools:
+        await async_db.run_sync(content_pool.save)     # keep per-user rotation across restarts
+    await ai_gateway.close()
+    async_db.shutdown(wait=True)
+    close_pool()
+    print("🔌 Database resources released")
+
 # ===== MAIN FUNCTION =====
 def main():
     """Initialize and run the bot"""
-    app = ApplicationBuilder().token(BOT_TOKEN).build()
+    # Handlers await AI/DB calls; let other users' updates run meanwhile (1 = strictly sequential)
+    app = (
+        ApplicationBuilder()
+        .token(BOT_TOKEN)
+        .rate_limiter(outbound)
+        .concurrent_updates(UPDATE_CONCURRENCY)
+        .build()
+    )
     
     print("\n" + "=" * 60)
     print("🤖 REGISTERING HANDLERS...")
@@ -652,6 +684,9 @@ def main():
         filters.TEXT & ~filters.COMMAND,
         handle_menu_buttons
     ), group=2)
+    
+    # Free chat: runs before the conversations so it can see whether one of them owns the message
+    app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, free_chat), group=-2)
 
   
     
@@ -671,35 +706,22 @@ def main():
     app.add_handler(CommandHandler('admin', admin_stats_command))
     app.add_handler(CommandHandler('adminusers', admin_users_command))
     app.add_handler(CommandHandler('adminbroadcast', admin_broadcast_command))
+    app.add_handler(CommandHandler('adminbroadcaststop', admin_broadcast_stop_command))
 
     
     # Menu buttons
     print("5️⃣ Registering menu buttons...")
     
     
-    # 🆕 Schedule jobs (clean import)
+    # Reports, pattern alerts and daily tracking (handlers/jobs/scheduled_jobs.py)
     print("6️⃣ Scheduling automated jobs...")
-    jobs = get_scheduled_jobs()
-    for job_config in jobs:
-        if job_config['trigger'] == 'daily':
-            app.job_queue.run_daily(
-                job_config['callback'],
-                time=job_config['time'],
-                name=job_config['name']
-            )
-            print(f"   ✅ Scheduled: {job_config['name']}")
-        elif job_config['trigger'] == 'cron':
-            app.job_queue.run_daily(
-                job_config['callback'],
-                time=time(hour=job_config['hour'], minute=job_config['minute'], 
-                         tzinfo=job_config['timezone']),
-                days=(6,),  # Sunday
-                name=job_config['name']
-            )
-            print(f"   ✅ Scheduled: {job_config['name']}")
+    for job_config in get_scheduled_jobs():
+        schedule_job(app.job_queue, job_config)
+        print(f"   ✅ Scheduled: {job_config['name']} ({job_config['trigger']})")
     
     # Set commands and run
-    app.post_init = set_bot_commands
+    app.post_init = on_startup
+    app.post_shutdown = release_resources
     schedule_custom_reminders(app)  # Your existing reminder scheduling
     
     print("=" * 60)
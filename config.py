@@ -5,3 +5,4 @@ load_dotenv()
 
 BOT_TOKEN = os.environ["BOT_TOKEN"]
 OPENROUTER_API_KEY = os.environ.get("OPENROUTER_API_KEY")
+UPDATE_CONCURRENCY = int(os.getenv("UPDATE_CONCURRENCY", 64))
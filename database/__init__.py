@@ -3,39 +3,60 @@ Database Package
 Import everything from here
 """
 
-from .connection import get_db_connection, test_connection
+from .connection import get_db_connection, test_connection, get_pool_stats, close_pool
 from .tables import init_all_tables
 # Mood operations
 from .mood_db import save_mood, get_weekly_moods, save_conversation, get_weekly_conversations
+from .write_behind import get_write_behind_stats
 
 
 
 # User operations
 from .user_db import (
     get_user, save_user, get_user_profile, set_user_profile,
-    is_user_onboarded, get_user_timezone, set_user_timezone
+    is_user_onboarded, get_user_timezone, set_user_timezone,
+    get_user_tzinfo, peek_user_tzinfo, invalidate_user_cache, get_user_cache_stats
 )
 
 # Goal operations
 from .goal_db import (
     add_goal, get_all_goals, get_goal_by_id, complete_goal_today,
     update_goal_name, update_goal_days, update_goal_reminders,
-    delete_goal, mark_goal_complete
+    delete_goal, mark_goal_complete, get_goals_by_keys
 )
 
 # Habit operations
 from .habit_db import (
     add_habit, get_all_habits, get_habit_by_id, complete_habit_today,
     update_habit_name, update_habit_streak, update_habit_reminders,
-    delete_habit, mark_habit_complete
+    delete_habit, mark_habit_complete, get_habits_by_keys
+)
+
+# Today's completions (hot cache for reminders)
+from .completion_cache import (
+    is_done, mark_done, invalidate_completion_cache, get_completion_cache_stats
+)
+
+# Completion history (day bitmaps)
+from .history_db import (
+    was_done, count_done_on, get_histories, get_item_history, history_to_list,
+    streak_from_bits, recompute_streak, get_completion_rollup
 )
 
 # Utility
-from .user_db import load_data
+from .user_db import load_data, load_data_chunks, iter_users
+
+# Batch job checkpoints
+from .job_db import (
+    get_job_checkpoint, save_job_checkpoint, clear_job_checkpoint,
+    iter_users_checkpointed
+)
 
 from .premium_db import (
     is_premium_user, activate_premium, track_daily_progress,
-    get_weekly_stats, award_badge, get_user_badges
+    track_all_daily_progress, get_weekly_stats, award_badge, get_user_badges,
+    get_active_premium_ids, invalidate_premium_cache, get_premium_cache_stats,
+    cancel_premium
 )
 
 
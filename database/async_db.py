@@ -0,0 +1,104 @@
+"""
+Async Database Access
+Awaitable versions of the database package functions.
+
+Each call runs the blocking mysql.connector function on a bounded thread
+pool (sized to the connection pool), so handlers can `await` queries
+without stalling the python-telegram-bot event loop.
+"""
+
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from .connection import POOL_SIZE
+from . import user_db, goal_db, habit_db, mood_db, premium_db, history_db
+
+# More workers than pooled connections would only queue inside the pool
+DB_WORKERS = int(os.getenv('DB_ASYNC_WORKERS', POOL_SIZE))
+
+_executor = ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix='db')
+
+
+async def run_sync(func, *args, **kwargs):
+    """Run any blocking function on the database executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+def _make_async(func):
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await run_sync(func, *args, **kwargs)
+    return wrapper
+
+
+def shutdown(wait=True):
+    """Stop the executor (call on bot shutdown)"""
+    _executor.shutdown(wait=wait)
+
+
+# User operations
+get_user = _make_async(user_db.get_user)
+save_user = _make_async(user_db.save_user)
+get_user_profile = _make_async(user_db.get_user_profile)
+set_user_profile = _make_async(user_db.set_user_profile)
+is_user_onboarded = _make_async(user_db.is_user_onboarded)
+get_user_timezone = _make_async(user_db.get_user_timezone)
+set_user_timezone = _make_async(user_db.set_user_timezone)
+get_user_tzinfo = _make_async(user_db.get_user_tzinfo)
+load_data = _make_async(user_db.load_data)
+
+# Goal operations
+add_goal = _make_async(goal_db.add_goal)
+get_all_goals = _make_async(goal_db.get_all_goals)
+get_goal_by_id = _make_async(goal_db.get_goal_by_id)
+get_goals_by_keys = _make_async(goal_db.get_goals_by_keys)
+complete_goal_today = _make_async(goal_db.complete_goal_today)
+update_goal_name = _make_async(goal_db.update_goal_name)
+update_goal_days = _make_async(goal_db.update_goal_days)
+update_goal_reminders = _make_async(goal_db.update_goal_reminders)
+delete_goal = _make_async(goal_db.delete_goal)
+mark_goal_complete = _make_async(goal_db.mark_goal_complete)
+
+# Habit operations
+add_habit = _make_async(habit_db.add_habit)
+get_all_habits = _make_async(habit_db.get_all_habits)
+get_habit_by_id = _make_async(habit_db.get_habit_by_id)
+get_habits_by_keys = _make_async(habit_db.get_habits_by_keys)
+complete_habit_today = _make_async(habit_db.complete_habit_today)
+update_habit_name = _make_async(habit_db.update_habit_name)
+update_habit_streak = _make_async(habit_db.update_habit_streak)
+update_habit_reminders = _make_async(habit_db.update_habit_reminders)
+delete_habit = _make_async(habit_db.delete_habit)
+mark_habit_complete = _make_async(habit_db.mark_habit_complete)
+
+# Completion history
+was_done = _make_async(history_db.was_done)
+count_done_on = _make_async(history_db.count_done_on)
+get_histories = _make_async(history_db.get_histories)
+get_item_history = _make_async(history_db.get_item_history)
+recompute_streak = _make_async(history_db.recompute_streak)
+get_completion_rollup = _make_async(history_db.get_completion_rollup)
+
+# Mood operations (saves only enqueue on the write-behind buffer - no executor hop)
+async def save_mood(*args, **kwargs):
+    return mood_db.save_mood(*args, **kwargs)
+
+async def save_conversation(*args, **kwargs):
+    return mood_db.save_conversation(*args, **kwargs)
+
+get_weekly_moods = _make_async(mood_db.get_weekly_moods)
+get_weekly_conversations = _make_async(mood_db.get_weekly_conversations)
+
+# Premium operations
+is_premium_user = _make_async(premium_db.is_premium_user)
+activate_premium = _make_async(premium_db.activate_premium)
+cancel_premium = _make_async(premium_db.cancel_premium)
+get_active_premium_ids = _make_async(premium_db.get_active_premium_ids)
+track_daily_progress = _make_async(premium_db.track_daily_progress)
+track_all_daily_progress = _make_async(premium_db.track_all_daily_progress)
+get_weekly_stats = _make_async(premium_db.get_weekly_stats)
+award_badge = _make_async(premium_db.award_badge)
+get_user_badges = _make_async(premium_db.get_user_badges)
@@ -0,0 +1,103 @@
+"""
+Broadcast Job Database Operations
+Persistent record of admin broadcasts so a restart resumes where it stopped
+"""
+
+from .connection import get_db_connection
+
+BROADCAST_FIELDS = "id, created_by, message, status, total, last_chat_id, sent, failed, blocked, created_at"
+
+
+def create_broadcast(created_by, message):
+    """Start a broadcast job (total = current user count). Returns the job id."""
+    connection = get_db_connection()
+    if not connection:
+        return None
+    
+    cursor = connection.cursor()
+    try:
+        cursor.execute("""
+            INSERT INTO broadcast_jobs (created_by, message, total)
+            SELECT %s, %s, COUNT(*) FROM users
+        """, (created_by, message))
+        
+        connection.commit()
+        return cursor.lastrowid
+        
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def get_broadcast(broadcast_id):
+    """One broadcast job as a dict, or None"""
+    connection = get_db_connection()
+    if not connection:
+        return None
+    
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute(f"SELECT {BROADCAST_FIELDS} FROM broadcast_jobs WHERE id = %s", (broadcast_id,))
+        return cursor.fetchone()
+        
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def get_unfinished_broadcasts():
+    """Broadcasts still marked running (interrupted by a restart)"""
+    connection = get_db_connection()
+    if not connection:
+        return []
+    
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute(f"""
+            SELECT {BROADCAST_FIELDS} FROM broadcast_jobs
+            WHERE status = 'running' ORDER BY id
+        """)
+        return cursor.fetchall()
+        
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def save_broadcast_progress(broadcast_id, last_chat_id, sent, failed, blocked, status='running'):
+    """Checkpoint a broadcast after a chunk of users was handled"""
+    connection = get_db_connection()
+    if not connection:
+        return False
+    
+    cursor = connection.cursor()
+    try:
+        cursor.execute("""
+            UPDATE broadcast_jobs
+            SET last_chat_id = %s, sent = %s, failed = %s, blocked = %s, status = %s
+            WHERE id = %s
+        """, (last_chat_id, sent, failed, blocked, status, broadcast_id))
+        
+        connection.commit()
+        return cursor.rowcount > 0
+        
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def set_broadcast_status(broadcast_id, status):
+    """Mark a broadcast 'running', 'cancelled' or 'done'"""
+    connection = get_db_connection()
+    if not connection:
+        return False
+    
+    cursor = connection.cursor()
+    try:
+        cursor.execute("UPDATE broadcast_jobs SET status = %s WHERE id = %s", (status, broadcast_id))
+        connection.commit()
+        return cursor.rowcount > 0
+        
+    finally:
+        cursor.close()
+        connection.close()
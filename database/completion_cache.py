@@ -0,0 +1,63 @@
+"""
+Completion Cache
+Hot in-process record of which goals/habits each user finished today.
+
+complete_goal_today / complete_habit_today write through here and the
+reminder tick reads it first, so reminders for items already done skip the
+database entirely. Only positive facts are cached ("done on <date>"); a miss
+means "ask the database".
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+COMPLETION_CACHE_SIZE = int(os.getenv('COMPLETION_CACHE_SIZE', 50000))  # users
+
+# chat_id -> (date ISO string, {'goal': bits, 'habit': bits}); bit n = item_id n
+_done = OrderedDict()
+_done_lock = threading.Lock()
+_done_stats = {'hits': 0, 'misses': 0}
+
+
+def mark_done(chat_id, kind, item_id, day):
+    """Record that an item was completed on day ('YYYY-MM-DD')"""
+    with _done_lock:
+        entry = _done.get(chat_id)
+        if entry is None or entry[0] != day:
+            if entry is not None and entry[0] > day:
+                return   # stale completion from an earlier day
+            entry = (day, {'goal': 0, 'habit': 0})
+        entry[1][kind] |= 1 << item_id
+        _done[chat_id] = entry
+        _done.move_to_end(chat_id)
+        while len(_done) > COMPLETION_CACHE_SIZE:
+            _done.popitem(last=False)
+
+
+def is_done(chat_id, kind, item_id, day):
+    """True if the item is known to be done on day, False if unknown"""
+    with _done_lock:
+        entry = _done.get(chat_id)
+        if entry is not None and entry[0] == day and entry[1][kind] >> item_id & 1:
+            _done_stats['hits'] += 1
+            return True
+        _done_stats['misses'] += 1
+        return False
+
+
+def invalidate_completion_cache(chat_id=None):
+    """Forget one user's completions, or everything"""
+    with _done_lock:
+        if chat_id is None:
+            _done.clear()
+        else:
+            _done.pop(chat_id, None)
+
+
+def get_completion_cache_stats():
+    """Hit/miss counters and size"""
+    with _done_lock:
+        stats = dict(_done_stats)
+        stats['users'] = len(_done)
+    return stats
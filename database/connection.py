@@ -1,24 +1,54 @@
 """
 Database Connection - Railway Compatible
+Connections come from a shared pool; conn.close() returns them
 """
 import mysql.connector
 import os
+import threading
+from .pool import ConnectionPool
+
+# Pool settings (override via environment)
+POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 5))          # seconds to wait for a free connection
+POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 3600))         # max connection lifetime in seconds
+POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() != 'false'
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_db_config():
+    """Railway MySQL connection settings"""
+    return {
+        'host': os.getenv('MYSQLHOST', 'localhost'),
+        'user': os.getenv('MYSQLUSER', 'root'),
+        'password': os.getenv('MYSQLPASSWORD', ''),
+        'database': os.getenv('MYSQL_DATABASE', 'railway'),
+        'port': int(os.getenv('MYSQLPORT', 3306))
+    }
+
+
+def get_pool():
+    """Create the shared pool on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    get_db_config(),
+                    size=POOL_SIZE,
+                    timeout=POOL_TIMEOUT,
+                    recycle=POOL_RECYCLE,
+                    pre_ping=POOL_PRE_PING
+                )
+    return _pool
+
 
 def get_db_connection():
-    """Connect to Railway MySQL"""
+    """Borrow a pooled connection to Railway MySQL"""
     try:
-        # Railway MySQL connection
-        config = {
-            'host': os.getenv('MYSQLHOST', 'localhost'),
-            'user': os.getenv('MYSQLUSER', 'root'),
-            'password': os.getenv('MYSQLPASSWORD', ''),
-            'database': os.getenv('MYSQL_DATABASE', 'railway'),
-            'port': int(os.getenv('MYSQLPORT', 3306))
-        }
-        
-        conn = mysql.connector.connect(**config)
-        return conn
-        
+        return get_pool().get_connection()
+
     except mysql.connector.Error as e:
         print(f"❌ DB Connection Error: {e}")
         return None
@@ -27,6 +57,15 @@ def get_connection():
     """Alias for compatibility"""
     return get_db_connection()
 
+def get_pool_stats():
+    """Pool metrics: checkouts, wait times, recycles, ping failures"""
+    return get_pool().stats()
+
+def close_pool():
+    """Close pooled connections; ones still borrowed close when returned (call on shutdown)"""
+    if _pool is not None:
+        _pool.close_all()
+
 def test_connection():
     """Test database connection"""
     try:
@@ -4,8 +4,11 @@ All functions related to goals
 """
 
 from .connection import get_db_connection
+from .user_db import allocate_item_id
+from .completion_cache import mark_done
+from .history_db import record_completion, delete_history
 import json
-from datetime import date
+from datetime import date, timedelta
 
 def add_goal(chat_id, goal_text, target_days=30, motivation_line="", reminder_times=None):
     """Add new goal"""
@@ -15,12 +18,8 @@ def add_goal(chat_id, goal_text, target_days=30, motivation_line="", reminder_ti
     
     cursor = connection.cursor()
     try:
-        # Get next goal_id for this user
-        cursor.execute(
-            "SELECT COALESCE(MAX(goal_id), 0) + 1 FROM goals WHERE chat_id = %s",
-            (chat_id,)
-        )
-        goal_id = cursor.fetchone()[0]
+        # Get next goal_id for this user (atomic per-user counter)
+        goal_id = allocate_item_id(cursor, chat_id, 'goal_seq')
         
         # Insert new goal
         cursor.execute("""
@@ -112,8 +111,60 @@ def get_goal_by_id(chat_id, goal_id):
         connection.close()
 
 
+# Row-constructor IN lists are kept to a sane size per statement
+KEYS_PER_QUERY = 1000
+
+def get_goals_by_keys(keys):
+    """
+    Batch version of get_goal_by_id for many users at once.
+    keys: iterable of (chat_id, goal_id). Returns {(chat_id, goal_id): goal}.
+    """
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return {}
+    
+    connection = get_db_connection()
+    if not connection:
+        return {}
+    
+    cursor = connection.cursor(dictionary=True)
+    try:
+        found = {}
+        for start in range(0, len(keys), KEYS_PER_QUERY):
+            chunk = keys[start:start + KEYS_PER_QUERY]
+            placeholders = ', '.join(['(%s, %s)'] * len(chunk))
+            cursor.execute(f"""
+                SELECT chat_id, goal_id as id, goal, target_days, streak, start_date, motivation,
+                   last_checkin, status, reminder_times, completed_date
+                FROM goals 
+                WHERE (chat_id, goal_id) IN ({placeholders})
+            """, [value for key in chunk for value in key])
+            
+            for goal in cursor.fetchall():
+                if goal['reminder_times']:
+                    goal['reminder_times'] = json.loads(goal['reminder_times'])
+                
+                for field in ['start_date', 'last_checkin', 'completed_date']:
+                    if goal[field]:
+                        goal[field] = goal[field].isoformat()
+                
+                found[(goal.pop('chat_id'), goal['id'])] = goal
+        
+        return found
+        
+    finally:
+        cursor.close()
+        connection.close()
+
+
 def complete_goal_today(chat_id, goal_id):
-    """Mark goal as done for today"""
+    """
+    Mark goal as done for today.
+    
+    Single conditional UPDATE (same as complete_habit_today): already
+    checked in, streak continued or streak broken are decided atomically
+    and the new streak is read back via LAST_INSERT_ID(expr).
+    """
     connection = get_db_connection()
     if not connection:
         return False, "Database connection error"
@@ -121,35 +172,40 @@ def complete_goal_today(chat_id, goal_id):
     cursor = connection.cursor(dictionary=True)
     try:
         today = date.today()
+        yesterday = today - timedelta(days=1)
         
-        # Get current goal
         cursor.execute("""
-            SELECT goal_id as id, goal, target_days, streak, last_checkin
-            FROM goals 
+            UPDATE goals 
+            SET streak = LAST_INSERT_ID(IF(last_checkin = %s, streak + 1, 1)),
+                status = IF(streak >= target_days, 'completed', status),
+                completed_date = IF(streak >= target_days, %s, completed_date),
+                last_checkin = %s
             WHERE chat_id = %s AND goal_id = %s
-        """, (chat_id, goal_id))
+              AND (last_checkin IS NULL OR last_checkin <> %s)
+        """, (yesterday, today, today, chat_id, goal_id, today))
+        updated = cursor.rowcount
+        new_streak = cursor.lastrowid
+        if updated:
+            record_completion(cursor, chat_id, 'goal', goal_id, today)
+        connection.commit()
+        if updated:
+            mark_done(chat_id, 'goal', goal_id, today.isoformat())
         
+        cursor.execute("""
+            SELECT goal, target_days FROM goals 
+            WHERE chat_id = %s AND goal_id = %s
+        """, (chat_id, goal_id))
         goal = cursor.fetchone()
         
         if not goal:
             return False, "Goal not found!"
         
-        # Check if already completed today
-        if goal['last_checkin'] and goal['last_checkin'] == today:
+        if not updated:
+            mark_done(chat_id, 'goal', goal_id, today.isoformat())
             return False, "Already checked in today! ✅"
         
-        # Increment streak
-        new_streak = goal['streak'] + 1
-        
         # Check if goal is now completed
         if new_streak >= goal['target_days']:
-            cursor.execute("""
-                UPDATE goals 
-                SET streak = %s, last_checkin = %s, status = 'completed', completed_date = %s
-                WHERE chat_id = %s AND goal_id = %s
-            """, (new_streak, today, today, chat_id, goal_id))
-            connection.commit()
-            
             return True, (
                 f"🎉🎉🎉 **GOAL COMPLETED!** 🎉🎉🎉\n\n"
                 f"You've reached your {goal['target_days']}-day target for:\n"
@@ -158,17 +214,9 @@ def complete_goal_today(chat_id, goal_id):
                 f"🏆 This goal is now complete!\n\n"
                 f"View all achievements: /completedgoals"
             )
-        else:
-            # Just update streak
-            cursor.execute("""
-                UPDATE goals 
-                SET streak = %s, last_checkin = %s
-                WHERE chat_id = %s AND goal_id = %s
-            """, (new_streak, today, chat_id, goal_id))
-            connection.commit()
-            
-            days_left = goal['target_days'] - new_streak
-            return True, f"Great! {new_streak} day streak on '{goal['goal']}'! 🔥\n\nOnly {days_left} days to go!"
+        
+        days_left = goal['target_days'] - new_streak
+        return True, f"Great! {new_streak} day streak on '{goal['goal']}'! 🔥\n\nOnly {days_left} days to go!"
         
     finally:
         cursor.close()
@@ -275,6 +323,7 @@ def delete_goal(chat_id, goal_id):
             DELETE FROM goals 
             WHERE chat_id = %s AND goal_id = %s
         """, (chat_id, goal_id))
+        delete_history(cursor, chat_id, 'goal', goal_id)
         
         connection.commit()
         
@@ -4,8 +4,11 @@ All functions related to habits
 """
 
 from .connection import get_db_connection
+from .user_db import allocate_item_id
+from .completion_cache import mark_done
+from .history_db import record_completion, delete_history
 import json
-from datetime import date
+from datetime import date, timedelta
 
 def add_habit(chat_id, habit_text, reminder_times=None):
     """Add new habit"""
@@ -15,12 +18,8 @@ def add_habit(chat_id, habit_text, reminder_times=None):
     
     cursor = connection.cursor()
     try:
-        # Get next habit_id for this user
-        cursor.execute(
-            "SELECT COALESCE(MAX(habit_id), 0) + 1 FROM habits WHERE chat_id = %s",
-            (chat_id,)
-        )
-        habit_id = cursor.fetchone()[0]
+        # Get next habit_id for this user (atomic per-user counter)
+        habit_id = allocate_item_id(cursor, chat_id, 'habit_seq')
         
         # Insert new habit
         cursor.execute("""
@@ -110,8 +109,61 @@ def get_habit_by_id(chat_id, habit_id):
         connection.close()
 
 
+# Row-constructor IN lists are kept to a sane size per statement
+KEYS_PER_QUERY = 1000
+
+def get_habits_by_keys(keys):
+    """
+    Batch version of get_habit_by_id for many users at once.
+    keys: iterable of (chat_id, habit_id). Returns {(chat_id, habit_id): habit}.
+    """
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return {}
+    
+    connection = get_db_connection()
+    if not connection:
+        return {}
+    
+    cursor = connection.cursor(dictionary=True)
+    try:
+        found = {}
+        for start in range(0, len(keys), KEYS_PER_QUERY):
+            chunk = keys[start:start + KEYS_PER_QUERY]
+            placeholders = ', '.join(['(%s, %s)'] * len(chunk))
+            cursor.execute(f"""
+                SELECT chat_id, habit_id as id, habit, days_target, streak, start_date,
+                   reminder_times, last_completed, status, completed_date
+                FROM habits 
+                WHERE (chat_id, habit_id) IN ({placeholders})
+            """, [value for key in chunk for value in key])
+            
+            for habit in cursor.fetchall():
+                if habit['reminder_times']:
+                    habit['reminder_times'] = json.loads(habit['reminder_times'])
+                
+                for field in ['start_date', 'last_completed', 'completed_date']:
+                    if habit[field]:
+                        habit[field] = habit[field].isoformat()
+                
+                found[(habit.pop('chat_id'), habit['id'])] = habit
+        
+        return found
+        
+    finally:
+        cursor.close()
+        connection.close()
+
+
 def complete_habit_today(chat_id, habit_id):
-    """Mark habit as done for today"""
+    """
+    Mark habit as done for today.
+    
+    One conditional UPDATE handles the whole transition atomically:
+    already done today (no row matched), streak continued from yesterday
+    (+1) or streak broken (back to 1). The new streak comes back through
+    LAST_INSERT_ID(expr), so double taps can never count twice.
+    """
     connection = get_db_connection()
     if not connection:
         return False, "Database connection error"
@@ -119,35 +171,42 @@ def complete_habit_today(chat_id, habit_id):
     cursor = connection.cursor(dictionary=True)
     try:
         today = date.today()
+        yesterday = today - timedelta(days=1)
         
-        # Get current habit
+        # MySQL applies SET left to right: status/completed_date see the new
+        # streak, and last_completed is overwritten last
         cursor.execute("""
-            SELECT habit_id as id, habit, streak, last_completed
-            FROM habits 
+            UPDATE habits 
+            SET streak = LAST_INSERT_ID(IF(last_completed = %s, streak + 1, 1)),
+                status = IF(streak >= 21, 'completed', status),
+                completed_date = IF(streak >= 21, %s, completed_date),
+                last_completed = %s
             WHERE chat_id = %s AND habit_id = %s
-        """, (chat_id, habit_id))
+              AND (last_completed IS NULL OR last_completed <> %s)
+        """, (yesterday, today, today, chat_id, habit_id, today))
+        updated = cursor.rowcount
+        new_streak = cursor.lastrowid
+        if updated:
+            record_completion(cursor, chat_id, 'habit', habit_id, today)
+        connection.commit()
+        if updated:
+            mark_done(chat_id, 'habit', habit_id, today.isoformat())
         
+        cursor.execute("""
+            SELECT habit FROM habits 
+            WHERE chat_id = %s AND habit_id = %s
+        """, (chat_id, habit_id))
         habit = cursor.fetchone()
         
         if not habit:
             return False, "Habit not found!"
         
-        # Check if already completed today
-        if habit['last_completed'] and habit['last_completed'] == today:
+        if not updated:
+            mark_done(chat_id, 'habit', habit_id, today.isoformat())
             return False, "Already completed today! ✅"
         
-        # Increment streak
-        new_streak = habit['streak'] + 1
-        
         # Check if 21-day challenge is complete
         if new_streak >= 21:
-            cursor.execute("""
-                UPDATE habits 
-                SET streak = %s, last_completed = %s, status = 'completed', completed_date = %s
-                WHERE chat_id = %s AND habit_id = %s
-            """, (new_streak, today, today, chat_id, habit_id))
-            connection.commit()
-            
             return True, (
                 f"🎉🎉🎉 **21-DAY CHALLENGE COMPLETE!** 🎉🎉🎉\n\n"
                 f"You've mastered: **{habit['habit']}**\n\n"
@@ -155,17 +214,9 @@ def complete_habit_today(chat_id, habit_id):
                 f"🔥 Final streak: 21 days\n\n"
                 f"View all achievements: /completedhabits"
             )
-        else:
-            # Just update streak
-            cursor.execute("""
-                UPDATE habits 
-                SET streak = %s, last_completed = %s
-                WHERE chat_id = %s AND habit_id = %s
-            """, (new_streak, today, chat_id, habit_id))
-            connection.commit()
-            
-            days_left = 21 - new_streak
-            return True, f"Awesome! {new_streak} day streak on '{habit['habit']}'! 💪\n\n{days_left} days to go!"
+        
+        days_left = 21 - new_streak
+        return True, f"Awesome! {new_streak} day streak on '{habit['habit']}'! 💪\n\n{days_left} days to go!"
         
     finally:
         cursor.close()
@@ -260,6 +311,7 @@ def delete_habit(chat_id, habit_id):
             DELETE FROM habits 
             WHERE chat_id = %s AND habit_id = %s
         """, (chat_id, habit_id))
+        delete_history(cursor, chat_id, 'habit', habit_id)
         
         connection.commit()
         
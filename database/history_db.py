@@ -0,0 +1,237 @@
+"""
+Completion History Database Operations
+Per-item day bitmaps: bit n of an item's history = done on day n.
+
+Days are numbered by date.toordinal() and stored as 64-day words
+(word = day // 64, bit = day % 64), one row per item per word - about six
+rows a year. Setting a day is an atomic OR, "done on day D" is a primary
+key lookup, and streaks/rollups are plain integer bit operations.
+"""
+
+from .connection import get_db_connection
+from datetime import date, timedelta
+
+WORD_BITS = 64
+STREAK_LOOKBACK_DAYS = 128   # first window tried by recompute_streak (doubles as needed)
+
+
+def _day_index(day):
+    return day.toordinal()
+
+
+def day_bit(day):
+    """(word, mask) for one day"""
+    index = _day_index(day)
+    return index // WORD_BITS, 1 << (index % WORD_BITS)
+
+
+def record_completion(cursor, chat_id, kind, item_id, day):
+    """Set the bit for day - runs on the caller's cursor, inside its transaction"""
+    word, mask = day_bit(day)
+    cursor.execute("""
+        INSERT INTO completion_history (chat_id, kind, item_id, word, bits)
+        VALUES (%s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE bits = bits | VALUES(bits)
+    """, (chat_id, kind, item_id, word, mask))
+
+
+def delete_history(cursor, chat_id, kind, item_id):
+    """Drop an item's history (caller's cursor/transaction)"""
+    cursor.execute("""
+        DELETE FROM completion_history
+        WHERE chat_id = %s AND kind = %s AND item_id = %s
+    """, (chat_id, kind, item_id))
+
+
+def was_done(chat_id, kind, item_id, day):
+    """True if the item was completed on day"""
+    connection = get_db_connection()
+    if not connection:
+        return False
+
+    cursor = connection.cursor()
+    try:
+        word, mask = day_bit(day)
+        cursor.execute("""
+            SELECT bits FROM completion_history
+            WHERE chat_id = %s AND kind = %s AND item_id = %s AND word = %s
+        """, (chat_id, kind, item_id, word))
+        row = cursor.fetchone()
+        return bool(row and row[0] & mask)
+
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def count_done_on(chat_id, day):
+    """How many goals/habits the user completed on day: {'goal': n, 'habit': n}"""
+    counts = {'goal': 0, 'habit': 0}
+    connection = get_db_connection()
+    if not connection:
+        return counts
+
+    cursor = connection.cursor()
+    try:
+        word, mask = day_bit(day)
+        cursor.execute("""
+            SELECT kind, COUNT(*) FROM completion_history
+            WHERE chat_id = %s AND word = %s AND (bits & %s) <> 0
+            GROUP BY kind
+        """, (chat_id, word, mask))
+        for kind, count in cursor.fetchall():
+            counts[kind] = count
+        return counts
+
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def _load_bits(cursor, chat_ids, start, end, kind=None, item_id=None):
+    """{(chat_id, kind, item_id): bits} where bit n = done on start + n days"""
+    first, last = _day_index(start), _day_index(end)
+
+    sql = f"""
+        SELECT chat_id, kind, item_id, word, bits FROM completion_history
+        WHERE chat_id IN ({', '.join(['%s'] * len(chat_ids))})
+          AND word BETWEEN %s AND %s
+    """
+    params = list(chat_ids) + [first // WORD_BITS, last // WORD_BITS]
+    if kind is not None:
+        sql += " AND kind = %s AND item_id = %s"
+        params += [kind, item_id]
+    cursor.execute(sql, params)
+
+    histories = {}
+    for chat_id, row_kind, row_item_id, word, bits in cursor.fetchall():
+        shift = word * WORD_BITS - first
+        bits = bits << shift if shift >= 0 else bits >> -shift
+        key = (chat_id, row_kind, row_item_id)
+        histories[key] = histories.get(key, 0) | bits
+
+    window = (1 << (last - first + 1)) - 1
+    return {key: bits & window for key, bits in histories.items()}
+
+
+def get_histories(chat_ids, start, end):
+    """
+    Batch history for many users: {(chat_id, kind, item_id): bits} with
+    bit n = done on start + n days. Items with no completions are absent.
+    """
+    chat_ids = list(chat_ids)
+    if not chat_ids:
+        return {}
+
+    connection = get_db_connection()
+    if not connection:
+        return {}
+
+    cursor = connection.cursor()
+    try:
+        return _load_bits(cursor, chat_ids, start, end)
+
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def get_item_history(chat_id, kind, item_id, start, end):
+    """One item's days from start to end as a list of booleans"""
+    connection = get_db_connection()
+    if not connection:
+        return []
+
+    cursor = connection.cursor()
+    try:
+        bits = _load_bits(cursor, [chat_id], start, end, kind, item_id).get((chat_id, kind, item_id), 0)
+        return history_to_list(bits, (end - start).days + 1)
+
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def history_to_list(bits, days):
+    """Bitmap -> [done_on_day_0, done_on_day_1, ...]"""
+    return [bool(bits >> n & 1) for n in range(days)]
+
+
+def streak_from_bits(bits, days):
+    """
+    Length of the run of completed days ending on the last day of the
+    window - or on the day before, if the last day isn't done yet.
+    """
+    if not bits >> (days - 1) & 1:
+        bits, days = bits & ((1 << (days - 1)) - 1), days - 1
+        if days == 0:
+            return 0
+    missed = ~bits & ((1 << days) - 1)
+    return days - missed.bit_length()
+
+
+def recompute_streak(chat_id, kind, item_id, today=None):
+    """Current streak rebuilt from history (today or yesterday counts as alive)"""
+    today = today or date.today()
+
+    connection = get_db_connection()
+    if not connection:
+        return 0
+
+    cursor = connection.cursor()
+    try:
+        lookback = STREAK_LOOKBACK_DAYS
+        while True:
+            start = today - timedelta(days=lookback - 1)
+            bits = _load_bits(cursor, [chat_id], start, today, kind, item_id).get((chat_id, kind, item_id), 0)
+            streak = streak_from_bits(bits, lookback)
+            # A streak shorter than the window (minus a possible open today) is complete
+            if streak < lookback - 1:
+                return streak
+            lookback *= 2
+
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def _periods(start, end, period):
+    """[(period start date, first bit, length)] covering start..end"""
+    periods = []
+    current = start
+    while current <= end:
+        if period == 'month':
+            following = (current.replace(day=1) + timedelta(days=32)).replace(day=1)
+        else:
+            following = current + timedelta(days=7 - current.weekday())
+        last = min(following - timedelta(days=1), end)
+        periods.append((current, (current - start).days, (last - current).days + 1))
+        current = following
+    return periods
+
+
+def get_completion_rollup(chat_id, start, end, period='week'):
+    """
+    Completed item-days per week (Monday-based) or calendar month:
+    [{'start': 'YYYY-MM-DD', 'days': n, 'goal': done, 'habit': done}, ...]
+    """
+    connection = get_db_connection()
+    if not connection:
+        return []
+
+    cursor = connection.cursor()
+    try:
+        histories = _load_bits(cursor, [chat_id], start, end)
+
+    finally:
+        cursor.close()
+        connection.close()
+
+    rollup = []
+    for period_start, offset, length in _periods(start, end, period):
+        mask = ((1 << length) - 1) << offset
+        row = {'start': period_start.isoformat(), 'days': length, 'goal': 0, 'habit': 0}
+        for (_, kind, _), bits in histories.items():
+            row[kind] += (bits & mask).bit_count()
+        rollup.append(row)
+    return rollup
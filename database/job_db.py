@@ -0,0 +1,100 @@
+"""
+Job Checkpoint Database Operations
+Lets batch jobs resume after a crash mid-run
+"""
+
+from .connection import get_db_connection
+from .user_db import iter_users
+
+
+def get_job_checkpoint(job_name, run_key):
+    """
+    Checkpoint for this run of a job, or None if the run hasn't started.
+    A checkpoint from an older run_key is ignored.
+    """
+    connection = get_db_connection()
+    if not connection:
+        return None
+    
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute("""
+            SELECT last_chat_id, processed, finished
+            FROM job_checkpoints
+            WHERE job_name = %s AND run_key = %s
+        """, (job_name, run_key))
+        return cursor.fetchone()
+        
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def save_job_checkpoint(job_name, run_key, last_chat_id, processed, finished=False):
+    """Record progress (last chat_id handled) for this run of a job"""
+    connection = get_db_connection()
+    if not connection:
+        return False
+    
+    cursor = connection.cursor()
+    try:
+        cursor.execute("""
+            INSERT INTO job_checkpoints (job_name, run_key, last_chat_id, processed, finished)
+            VALUES (%s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                run_key = VALUES(run_key),
+                last_chat_id = VALUES(last_chat_id),
+                processed = VALUES(processed),
+                finished = VALUES(finished)
+        """, (job_name, run_key, last_chat_id, processed, finished))
+        
+        connection.commit()
+        return True
+        
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def clear_job_checkpoint(job_name):
+    """Forget a job's checkpoint so the next run starts from the beginning"""
+    connection = get_db_connection()
+    if not connection:
+        return
+    
+    cursor = connection.cursor()
+    try:
+        cursor.execute("DELETE FROM job_checkpoints WHERE job_name = %s", (job_name,))
+        connection.commit()
+        
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def iter_users_checkpointed(job_name, run_key, chunk_size=500, **filters):
+    """
+    iter_users() that resumes from the job's checkpoint.
+    
+    The checkpoint moves forward only after the caller has finished with a
+    chunk, so a crash repeats at most one chunk. A run that already finished
+    yields nothing.
+    """
+    checkpoint = get_job_checkpoint(job_name, run_key)
+    if checkpoint and checkpoint['finished']:
+        print(f"⏭️ {job_name} already finished for {run_key}")
+        return
+    
+    after_chat_id = checkpoint['last_chat_id'] if checkpoint else None
+    processed = checkpoint['processed'] if checkpoint else 0
+    if after_chat_id is not None:
+        print(f"↩️ Resuming {job_name} ({run_key}) after chat_id {after_chat_id}")
+    
+    for users in iter_users(chunk_size, after_chat_id=after_chat_id, **filters):
+        yield users
+        
+        after_chat_id = users[-1]['chat_id']
+        processed += len(users)
+        save_job_checkpoint(job_name, run_key, after_chat_id, processed)
+    
+    save_job_checkpoint(job_name, run_key, after_chat_id, processed, finished=True)
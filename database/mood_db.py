@@ -2,27 +2,25 @@
 Mood & Conversation Tracking Database Operations
 """
 from .connection import get_db_connection
-from datetime import date, timedelta
+from .write_behind import WriteBehindBuffer
+from datetime import date, datetime, timedelta
+# Both inserts are fire-and-forget, so they go through write-behind buffers
+_mood_buffer = WriteBehindBuffer('mood_tracking', """
+    INSERT INTO mood_tracking (chat_id, track_date, mood, feeling_notes, energy_level)
+    VALUES (%s, %s, %s, %s, %s)
+""")
+_conversation_buffer = WriteBehindBuffer('conversation_history', """
+    INSERT INTO conversation_history 
+    (chat_id, message_date, user_message, context, message_time)
+    VALUES (%s, %s, %s, %s, %s)
+""")
 def save_mood(chat_id, mood, feeling_notes=None, energy_level=5):
-    """Save user's daily mood to database"""
-    connection = get_db_connection()
-    if not connection:
-        return False
-    cursor = connection.cursor(buffered=True)
-    try:
-        today = date.today()
-        cursor.execute("""
-            INSERT INTO mood_tracking (chat_id, track_date, mood, feeling_notes, energy_level)
-            VALUES (%s, %s, %s, %s, %s)
-        """, (chat_id, today, mood, feeling_notes, energy_level))
-        connection.commit()
-        return True
-    except Exception as e:
-        print(f"Error: {e}")
-        return False
-    finally:
-        cursor.close()
-        connection.close()
+    """
+    Queue user's daily mood for the next batched INSERT. True means queued
+    (written within WRITE_BEHIND_INTERVAL), not written; False if the queue is full.
+    """
+    today = date.today()
+    return _mood_buffer.add((chat_id, today, mood, feeling_notes, energy_level))
 def get_weekly_moods(chat_id):
     """Get user's moods from last 7 days"""
     connection = get_db_connection()
@@ -43,30 +41,9 @@ def get_weekly_moods(chat_id):
         cursor.close()
         connection.close()
 def save_conversation(chat_id, message, context='general'):
-    """Save conversation message (allows multiple per day)"""
-    connection = get_db_connection()
-    if not connection:
-        return False
-    cursor = connection.cursor(buffered=True)
-    try:
-        from datetime import datetime
-        today = date.today()
-        now = datetime.now()
-        
-        # Save with timestamp to allow multiple messages per day
-        cursor.execute("""
-            INSERT INTO conversation_history 
-            (chat_id, message_date, user_message, context, message_time)
-            VALUES (%s, %s, %s, %s, %s)
-        """, (chat_id, today, message[:500] if message else "", context, now))
-        connection.commit()
-        return True
-    except Exception as e:
-        print(f"Error saving conversation: {e}")
-        return False
-    finally:
-        cursor.close()
-        connection.close()
+    """Queue conversation message (allows multiple per day). True means queued, not written."""
+    now = datetime.now()
+    return _conversation_buffer.add((chat_id, now.date(), message[:500] if message else "", context, now))
 def get_weekly_conversations(chat_id):
     """Get conversations from last 7 days"""
     connection = get_db_connection()
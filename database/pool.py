@@ -0,0 +1,177 @@
+"""
+MySQL Connection Pool
+Reuses connections instead of opening one per query
+"""
+
+import threading
+import time
+from collections import deque
+
+import mysql.connector
+
+
+class PooledConnection:
+    """Connection wrapper - close() hands the connection back to the pool"""
+
+    def __init__(self, pool, raw, created_at):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+        self._returned = False
+
+    def close(self):
+        """Return connection to the pool (safe to call twice)"""
+        if self._returned:
+            return
+        self._returned = True
+        self._pool._release(self._raw, self._created_at)
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ConnectionPool:
+    """Bounded pool with pre-ping, max-lifetime recycling and wait metrics"""
+
+    def __init__(self, config, size=10, timeout=5.0, recycle=3600, pre_ping=True):
+        self.config = config
+        self.size = size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+
+        self._idle = deque()  # (raw_connection, created_at)
+        self._in_use = 0
+        self._closed = False
+        self._lock = threading.Condition()
+
+        self._stats = {
+            'checkouts': 0,
+            'created': 0,
+            'recycled': 0,
+            'ping_failures': 0,
+            'timeouts': 0,
+            'wait_total': 0.0,
+            'wait_max': 0.0,
+        }
+
+    # ===== CHECKOUT / RETURN =====
+    def get_connection(self):
+        """Borrow a connection, waiting up to `timeout` seconds for a free slot"""
+        started = time.monotonic()
+        deadline = started + self.timeout
+
+        with self._lock:
+            while not self._idle and self._in_use >= self.size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise mysql.connector.errors.PoolError(
+                        f"No free connection after {self.timeout:.1f}s (pool size {self.size})"
+                    )
+                self._lock.wait(remaining)
+
+            entry = self._idle.pop() if self._idle else None
+            self._in_use += 1
+
+        try:
+            raw, created_at = self._validate(entry)
+        except Exception:
+            with self._lock:
+                self._in_use -= 1
+                self._lock.notify()
+            raise
+
+        waited = time.monotonic() - started
+        with self._lock:
+            self._stats['checkouts'] += 1
+            self._stats['wait_total'] += waited
+            self._stats['wait_max'] = max(self._stats['wait_max'], waited)
+
+        return PooledConnection(self, raw, created_at)
+
+    def _validate(self, entry):
+        """Reuse an idle connection if it's young and alive, otherwise open a new one"""
+        if entry is not None:
+            raw, created_at = entry
+
+            if self.recycle and time.monotonic() - created_at > self.recycle:
+                self._count('recycled')
+                self._discard(raw)
+            elif self.pre_ping and not self._ping(raw):
+                self._count('ping_failures')
+                self._discard(raw)
+            else:
+                return raw, created_at
+
+        raw = mysql.connector.connect(**self.config)
+        self._count('created')
+        return raw, time.monotonic()
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def _ping(self, raw):
+        try:
+            raw.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _release(self, raw, created_at):
+        """Called by PooledConnection.close()"""
+        keep = True
+        try:
+            # Drop leftovers before the next borrower sees them
+            if raw.unread_result:
+                raw.consume_results()
+            if raw.in_transaction:
+                raw.rollback()
+        except Exception:
+            keep = False
+
+        with self._lock:
+            self._in_use -= 1
+            keep = keep and not self._closed
+            if keep:
+                self._idle.append((raw, created_at))
+            self._lock.notify()
+
+        if not keep:
+            self._discard(raw)
+
+    def _discard(self, raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    # ===== MAINTENANCE =====
+    def stats(self):
+        """Snapshot of pool counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = self.size
+            stats['idle'] = len(self._idle)
+            stats['in_use'] = self._in_use
+        stats['wait_avg'] = stats['wait_total'] / stats['checkouts'] if stats['checkouts'] else 0.0
+        return stats
+
+    def close_all(self):
+        """
+        Close idle connections. From now on returned connections are closed
+        instead of pooled (late borrowers still get a fresh, unpooled one)
+        """
+        with self._lock:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+        for raw, _ in idle:
+            self._discard(raw)
@@ -3,24 +3,111 @@ Premium & Analytics Database Operations
 """
 
 from .connection import get_db_connection
-from datetime import date, timedelta
+from .history_db import day_bit, get_completion_rollup
+from datetime import date, datetime, timedelta
+import os
+import threading
+import time
+import pytz
+
+# ===== PREMIUM STATUS CACHE =====
+# chat_id -> (is_premium, expires_at epoch seconds)
+PREMIUM_CACHE_TTL = int(os.getenv('PREMIUM_CACHE_TTL', 300))
+
+_premium_cache = {}
+_premium_lock = threading.Lock()
+_premium_stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+
+# end_date >= CURRENT_DATE holds until the MySQL server's midnight after
+# end_date; the server computes how far away that is, so the cache lapses
+# on the same clock and timezone as the query
+SECONDS_LEFT_SQL = "TIMESTAMPDIFF(SECOND, NOW(), MAX(end_date) + INTERVAL 1 DAY)"
+
+
+def _premium_expiry(seconds_left, now):
+    """Cache entry lifetime: TTL, but never past the end of the subscription"""
+    if seconds_left is None:
+        return now + PREMIUM_CACHE_TTL
+    return now + max(0, min(PREMIUM_CACHE_TTL, seconds_left))
+
+
+def _cache_premium(chat_id, is_premium, seconds_left=None):
+    now = time.time()
+    with _premium_lock:
+        _premium_cache[chat_id] = (is_premium, _premium_expiry(seconds_left, now))
+
+
+def invalidate_premium_cache(chat_id=None):
+    """Drop one user's cached premium status (or everyone's)"""
+    with _premium_lock:
+        if chat_id is None:
+            _premium_cache.clear()
+        else:
+            _premium_cache.pop(chat_id, None)
+        _premium_stats['invalidations'] += 1
+
+
+def get_premium_cache_stats():
+    """Cache counters: hits, misses, invalidations, size"""
+    with _premium_lock:
+        stats = dict(_premium_stats)
+        stats['size'] = len(_premium_cache)
+    return stats
+
 
 def is_premium_user(chat_id):
-    """Check if user has active premium subscription"""
+    """Check if user has active premium subscription (cached)"""
+    with _premium_lock:
+        entry = _premium_cache.get(chat_id)
+        if entry and entry[1] > time.time():
+            _premium_stats['hits'] += 1
+            return entry[0]
+        _premium_stats['misses'] += 1
+    
     connection = get_db_connection()
     if not connection:
         return False
     cursor = connection.cursor(dictionary=True, buffered=True)  # 🔥 Added buffered=True
     try:
-        cursor.execute("""
-            SELECT * FROM premium_users 
+        cursor.execute(f"""
+            SELECT {SECONDS_LEFT_SQL} AS seconds_left FROM premium_users 
             WHERE chat_id = %s AND is_active = TRUE AND end_date >= CURRENT_DATE
         """, (chat_id,))
-        result = cursor.fetchone()
-        return result is not None
+        seconds_left = cursor.fetchone()['seconds_left']
+        is_premium = seconds_left is not None
+        _cache_premium(chat_id, is_premium, seconds_left)
+        return is_premium
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def get_active_premium_ids():
+    """
+    All chat_ids with active premium, in one query.
+    Jobs can filter with a set membership check; also warms the cache.
+    """
+    connection = get_db_connection()
+    if not connection:
+        return set()
+    cursor = connection.cursor(buffered=True)
+    try:
+        cursor.execute(f"""
+            SELECT chat_id, {SECONDS_LEFT_SQL} FROM premium_users
+            WHERE is_active = TRUE AND end_date >= CURRENT_DATE
+            GROUP BY chat_id
+        """)
+        rows = cursor.fetchall()
     finally:
         cursor.close()
         connection.close()
+    
+    now = time.time()
+    with _premium_lock:
+        for chat_id, seconds_left in rows:
+            _premium_cache[chat_id] = (True, _premium_expiry(seconds_left, now))
+    return {chat_id for chat_id, _ in rows}
 
 def activate_premium(chat_id, subscription_type='monthly', payment_id=None):
     """Activate premium subscription"""
@@ -40,6 +127,7 @@ def activate_premium(chat_id, subscription_type='monthly', payment_id=None):
             ON DUPLICATE KEY UPDATE end_date = VALUES(end_date), is_active = TRUE
         """, (chat_id, subscription_type, start, end, payment_id))
         connection.commit()
+        invalidate_premium_cache(chat_id)
         return True
     finally:
         cursor.close()
@@ -69,6 +157,101 @@ def track_daily_progress(chat_id):
         cursor.close()
         connection.close()
 
+SNAPSHOT_WINDOW = timedelta(hours=1)   # track_all_users_daily runs hourly
+
+
+def _local_day_start(tz_name, now_utc):
+    """(local date, UTC instant its day began) for a timezone name (unknown names count as UTC)"""
+    try:
+        tz = pytz.timezone(tz_name)
+    except pytz.UnknownTimeZoneError:
+        tz = pytz.UTC
+    local_date = now_utc.astimezone(tz).date()
+    # is_dst=False: a midnight skipped by DST starts the day at the jump
+    midnight = tz.localize(datetime.combine(local_date, datetime.min.time()), is_dst=False)
+    return local_date, midnight.astimezone(pytz.UTC)
+
+
+def track_all_daily_progress(now_utc=None):
+    """
+    Snapshot the local day that just ended, for users whose local midnight
+    fell within the last SNAPSHOT_WINDOW (the hourly job therefore reaches
+    every timezone once a day, DST included).
+    
+    track_date is the user's local calendar day. Completions are counted
+    from completion_history bits for that date - the date check-ins stamp
+    (server date, UTC in production) - not from last_checkin, so check-ins
+    made after the day ended do not leak into it. Totals are the active
+    goals/habits at snapshot time.
+    
+    One INSERT ... SELECT per finished date (usually one).
+    Returns {'rows': users snapshotted, 'statements': n, 'elapsed': seconds}.
+    """
+    started = time.monotonic()
+    result = {'rows': 0, 'statements': 0, 'elapsed': 0.0}
+    now_utc = now_utc or datetime.now(pytz.UTC)
+    
+    connection = get_db_connection()
+    if not connection:
+        return result
+    cursor = connection.cursor(buffered=True)
+    try:
+        cursor.execute("""
+            SELECT COALESCE(timezone, 'UTC') AS tz, COUNT(*)
+            FROM users GROUP BY tz
+        """)
+        
+        # Timezones whose day rolled over since the last run, by the day that ended
+        by_date = {}
+        for tz_name, user_count in cursor.fetchall():
+            local_date, day_start = _local_day_start(tz_name, now_utc)
+            if not timedelta(0) <= now_utc - day_start < SNAPSHOT_WINDOW:
+                continue
+            group = by_date.setdefault(local_date - timedelta(days=1), {'timezones': [], 'users': 0})
+            group['timezones'].append(tz_name)
+            group['users'] += user_count
+        
+        for track_date, group in by_date.items():
+            word, mask = day_bit(track_date)
+            placeholders = ", ".join(["%s"] * len(group['timezones']))
+            cursor.execute(f"""
+                INSERT INTO daily_tracking (chat_id, track_date, goals_completed, habits_completed, total_goals, total_habits)
+                SELECT u.chat_id, %s,
+                       COALESCE(g.done, 0), COALESCE(h.done, 0),
+                       COALESCE(g.total, 0), COALESCE(h.total, 0)
+                FROM users u
+                LEFT JOIN (
+                    SELECT g.chat_id, COUNT(*) AS total, SUM(COALESCE(ch.bits & %s, 0) <> 0) AS done
+                    FROM goals g
+                    LEFT JOIN completion_history ch
+                      ON ch.chat_id = g.chat_id AND ch.kind = 'goal' AND ch.item_id = g.goal_id AND ch.word = %s
+                    WHERE g.status = 'active' GROUP BY g.chat_id
+                ) g ON g.chat_id = u.chat_id
+                LEFT JOIN (
+                    SELECT h.chat_id, COUNT(*) AS total, SUM(COALESCE(ch.bits & %s, 0) <> 0) AS done
+                    FROM habits h
+                    LEFT JOIN completion_history ch
+                      ON ch.chat_id = h.chat_id AND ch.kind = 'habit' AND ch.item_id = h.habit_id AND ch.word = %s
+                    WHERE h.status = 'active' GROUP BY h.chat_id
+                ) h ON h.chat_id = u.chat_id
+                WHERE COALESCE(u.timezone, 'UTC') IN ({placeholders})
+                ON DUPLICATE KEY UPDATE goals_completed = VALUES(goals_completed), habits_completed = VALUES(habits_completed), total_goals = VALUES(total_goals), total_habits = VALUES(total_habits)
+            """, (track_date, mask, word, mask, word, *group['timezones']))
+            
+            result['rows'] += group['users']
+            result['statements'] += 1
+        
+        connection.commit()
+    finally:
+        cursor.close()
+        connection.close()
+    
+    result['elapsed'] = time.monotonic() - started
+    return result
+
+
+BADGE_NAMES = {'soul_silver': '🥈 Soul Silver', 'soul_gold': '🥇 Soul Gold', 'soul_diamond': '💎 Soul Diamond', 'pure_soul': '👑 Pure Soul'}
+
 def get_weekly_stats(chat_id, week_offset=0):
     """Get weekly statistics"""
     connection = get_db_connection()
@@ -79,17 +262,94 @@ def get_weekly_stats(chat_id, week_offset=0):
         today = date.today()
         start_of_week = today - timedelta(days=today.weekday() + (week_offset * 7))
         end_of_week = start_of_week + timedelta(days=6)
+        # Item counts per day only exist in the daily snapshots; completions come from the history
         cursor.execute("""
-            SELECT SUM(goals_completed) as goals_completed, SUM(habits_completed) as habits_completed,
-                   SUM(total_goals) as total_goals, SUM(total_habits) as total_habits
+            SELECT SUM(total_goals) as total_goals, SUM(total_habits) as total_habits
             FROM daily_tracking WHERE chat_id = %s AND track_date BETWEEN %s AND %s
         """, (chat_id, start_of_week, end_of_week))
         result = cursor.fetchone()
+        rollup = get_completion_rollup(chat_id, start_of_week, end_of_week)
+        result['goals_completed'] = sum(period['goal'] for period in rollup)
+        result['habits_completed'] = sum(period['habit'] for period in rollup)
         return result
     finally:
         cursor.close()
         connection.close()
 
+def get_weekly_stats_bulk(chat_ids, week_offset=0):
+    """get_weekly_stats for many users in one query: {chat_id: stats}"""
+    chat_ids = list(chat_ids)
+    if not chat_ids:
+        return {}
+    connection = get_db_connection()
+    if not connection:
+        return {}
+    cursor = connection.cursor(dictionary=True, buffered=True)
+    try:
+        today = date.today()
+        start_of_week = today - timedelta(days=today.weekday() + (week_offset * 7))
+        end_of_week = start_of_week + timedelta(days=6)
+        cursor.execute(f"""
+            SELECT chat_id, SUM(goals_completed) as goals_completed, SUM(habits_completed) as habits_completed,
+                   SUM(total_goals) as total_goals, SUM(total_habits) as total_habits
+            FROM daily_tracking
+            WHERE chat_id IN ({', '.join(['%s'] * len(chat_ids))}) AND track_date BETWEEN %s AND %s
+            GROUP BY chat_id
+        """, chat_ids + [start_of_week, end_of_week])
+        return {row.pop('chat_id'): row for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+        connection.close()
+
+def get_daily_completions_bulk(chat_ids, start, end):
+    """Tasks completed per day from daily_tracking: {chat_id: {date: total}}"""
+    chat_ids = list(chat_ids)
+    if not chat_ids:
+        return {}
+    connection = get_db_connection()
+    if not connection:
+        return {}
+    cursor = connection.cursor(buffered=True)
+    try:
+        cursor.execute(f"""
+            SELECT chat_id, track_date, goals_completed + habits_completed
+            FROM daily_tracking
+            WHERE chat_id IN ({', '.join(['%s'] * len(chat_ids))}) AND track_date BETWEEN %s AND %s
+        """, chat_ids + [start, end])
+        series = {}
+        for chat_id, track_date, total in cursor.fetchall():
+            series.setdefault(chat_id, {})[track_date] = total
+        return series
+    finally:
+        cursor.close()
+        connection.close()
+
+def award_badges_bulk(awards):
+    """award_badge for many users in one statement: awards = [(chat_id, badge_type, completion_rate)]"""
+    if not awards:
+        return 0
+    connection = get_db_connection()
+    if not connection:
+        return 0
+    cursor = connection.cursor(buffered=True)
+    try:
+        today = date.today()
+        week_num = today.isocalendar()[1]
+        year = today.year
+        cursor.executemany("""
+            INSERT INTO achievements (chat_id, badge_type, badge_name, earned_date, week_number, year, completion_rate)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE completion_rate = VALUES(completion_rate)
+        """, [
+            (chat_id, badge_type, BADGE_NAMES.get(badge_type), today, week_num, year, completion_rate)
+            for chat_id, badge_type, completion_rate in awards
+        ])
+        connection.commit()
+        return len(awards)
+    finally:
+        cursor.close()
+        connection.close()
+
 def award_badge(chat_id, badge_type, completion_rate):
     """Award badge to user"""
     connection = get_db_connection()
@@ -100,12 +360,11 @@ def award_badge(chat_id, badge_type, completion_rate):
         today = date.today()
         week_num = today.isocalendar()[1]
         year = today.year
-        badge_names = {'soul_silver': '🥈 Soul Silver', 'soul_gold': '🥇 Soul Gold', 'soul_diamond': '💎 Soul Diamond', 'pure_soul': '👑 Pure Soul'}
         cursor.execute("""
             INSERT INTO achievements (chat_id, badge_type, badge_name, earned_date, week_number, year, completion_rate)
             VALUES (%s, %s, %s, %s, %s, %s, %s)
             ON DUPLICATE KEY UPDATE completion_rate = VALUES(completion_rate)
-        """, (chat_id, badge_type, badge_names.get(badge_type), today, week_num, year, completion_rate))
+        """, (chat_id, badge_type, BADGE_NAMES.get(badge_type), today, week_num, year, completion_rate))
         connection.commit()
         return True
     finally:
@@ -176,6 +435,7 @@ def activate_demo_trial(chat_id):
         """, (chat_id, 'trial', start_date, end_date))
         
         connection.commit()
+        invalidate_premium_cache(chat_id)
         
         return True, (
             "🎉 **Free Trial Activated!**\n\n"
@@ -196,3 +456,20 @@ def activate_demo_trial(chat_id):
     finally:
         cursor.close()
         connection.close()
+
+
+def cancel_premium(chat_id):
+    """Remove a user's premium subscription (used by /cancelpremium)"""
+    connection = get_db_connection()
+    if not connection:
+        return False
+    cursor = connection.cursor(buffered=True)
+    try:
+        cursor.execute('DELETE FROM premium_users WHERE chat_id = %s', (chat_id,))
+        cursor.execute('DELETE FROM premium_subscriptions WHERE chat_id = %s', (chat_id,))
+        connection.commit()
+        return True
+    finally:
+        cursor.close()
+        connection.close()
+        invalidate_premium_cache(chat_id)
@@ -72,6 +72,8 @@ def init_all_tables():
                 timezone VARCHAR(50) DEFAULT 'UTC',
                 onboarded BOOLEAN DEFAULT FALSE,
                 eod_time VARCHAR(10),
+                goal_seq INT NOT NULL DEFAULT 0,
+                habit_seq INT NOT NULL DEFAULT 0,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
             )
@@ -214,6 +216,52 @@ def init_all_tables():
             )
         """)
         
+        # Completion history table (64-day bitmap words per goal/habit)
+        print("📋 Creating completion_history table...")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS completion_history (
+                chat_id BIGINT NOT NULL,
+                kind ENUM('goal', 'habit') NOT NULL,
+                item_id INT NOT NULL,
+                word INT NOT NULL,
+                bits BIGINT UNSIGNED NOT NULL DEFAULT 0,
+                PRIMARY KEY (chat_id, kind, item_id, word),
+                FOREIGN KEY (chat_id) REFERENCES users(chat_id) ON DELETE CASCADE
+            )
+        """)
+        
+        # Job checkpoints table (resumable batch jobs)
+        print("📋 Creating job_checkpoints table...")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS job_checkpoints (
+                job_name VARCHAR(64) PRIMARY KEY,
+                run_key VARCHAR(32) NOT NULL,
+                last_chat_id BIGINT,
+                processed INT DEFAULT 0,
+                finished BOOLEAN DEFAULT FALSE,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Broadcast jobs table (resumable admin broadcasts)
+        print("📋 Creating broadcast_jobs table...")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS broadcast_jobs (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                created_by BIGINT NOT NULL,
+                message TEXT NOT NULL,
+                status VARCHAR(20) DEFAULT 'running',
+                total INT DEFAULT 0,
+                last_chat_id BIGINT,
+                sent INT DEFAULT 0,
+                failed INT DEFAULT 0,
+                blocked INT DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                INDEX idx_status (status)
+            )
+        """)
+        
         connection.commit()
         print("\n" + "=" * 70)
         print("✅ DATABASE INITIALIZATION COMPLETE!")
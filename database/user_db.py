@@ -4,10 +4,96 @@ All functions related to users
 """
 
 from .connection import get_db_connection
+from collections import OrderedDict
 import json
+import os
+import threading
+import pytz
+
+# ===== USER CACHE =====
+# Bounded LRU: chat_id -> {'user': full row or None, 'timezone': name, 'tzinfo': tz or None}
+# Kept coherent by save_user / set_user_profile / set_user_timezone;
+# other writers to the users table must call invalidate_user_cache().
+USER_CACHE_SIZE = int(os.getenv('USER_CACHE_SIZE', 50000))
+
+_user_cache = OrderedDict()
+_user_cache_lock = threading.Lock()
+_user_cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+
+def _cache_entry(chat_id):
+    """Cached entry (marked recently used) or None - caller holds the lock"""
+    entry = _user_cache.get(chat_id)
+    if entry is not None:
+        _user_cache.move_to_end(chat_id)
+    return entry
+
+
+def _cache_store(chat_id, user=None, timezone=None):
+    """Insert/refresh an entry - caller holds the lock"""
+    entry = _user_cache.get(chat_id)
+    if entry is None:
+        entry = {'user': None, 'timezone': None, 'tzinfo': None}
+        _user_cache[chat_id] = entry
+        if len(_user_cache) > USER_CACHE_SIZE:
+            _user_cache.popitem(last=False)
+            _user_cache_stats['evictions'] += 1
+    else:
+        _user_cache.move_to_end(chat_id)
+    
+    if user is not None:
+        entry['user'] = dict(user)
+        timezone = user.get('timezone')
+    if timezone is not None or user is not None:
+        timezone = timezone or 'UTC'
+        if timezone != entry['timezone']:
+            entry['tzinfo'] = None
+        entry['timezone'] = timezone
+        if entry['user'] is not None:
+            entry['user']['timezone'] = timezone
+
+
+def _resolve_tz(tz_name):
+    """pytz timezone for a name, falling back to UTC"""
+    try:
+        return pytz.timezone(tz_name)
+    except pytz.UnknownTimeZoneError:
+        return pytz.UTC
+
+
+def prime_user_timezones(users):
+    """Warm timezone entries from bulk-loaded rows (dicts with chat_id and timezone)"""
+    with _user_cache_lock:
+        for user in users:
+            _cache_store(user['chat_id'], timezone=user.get('timezone'))
+
+
+def invalidate_user_cache(chat_id=None):
+    """Forget one user's cached row (or everyone's) after a direct users-table write"""
+    with _user_cache_lock:
+        if chat_id is None:
+            _user_cache.clear()
+        else:
+            _user_cache.pop(chat_id, None)
+
+
+def get_user_cache_stats():
+    """Cache counters: hits, misses, evictions, size"""
+    with _user_cache_lock:
+        stats = dict(_user_cache_stats)
+        stats['size'] = len(_user_cache)
+    return stats
+
 
 def get_user(chat_id):
-    """Get user by chat_id"""
+    """Get user by chat_id (returns a copy of the cached row)"""
+    with _user_cache_lock:
+        entry = _cache_entry(chat_id)
+        if entry and entry['user'] is not None:
+            _user_cache_stats['hits'] += 1
+            return dict(entry['user'])
+        _user_cache_stats['misses'] += 1
+    
     connection = get_db_connection()
     if not connection:
         return {'chat_id': chat_id, 'timezone': 'UTC', 'onboarded': False}
@@ -21,7 +107,7 @@ def get_user(chat_id):
             # Create new user
             cursor.execute("INSERT INTO users (chat_id) VALUES (%s)", (chat_id,))
             connection.commit()
-            return {
+            user = {
                 'chat_id': chat_id,
                 'name': None,
                 'country': None,
@@ -30,7 +116,9 @@ def get_user(chat_id):
                 'eod_time': None
             }
         
-        return user
+        with _user_cache_lock:
+            _cache_store(chat_id, user=user)
+        return dict(user)
         
     finally:
         cursor.close()
@@ -43,6 +131,14 @@ def save_user(chat_id, user_data):
     if not connection:
         return False
     
+    saved = {
+        'name': user_data.get('name'),
+        'country': user_data.get('country'),
+        'timezone': user_data.get('timezone', 'UTC'),
+        'onboarded': user_data.get('onboarded', False),
+        'eod_time': user_data.get('eod_time')
+    }
+    
     cursor = connection.cursor()
     try:
         cursor.execute("""
@@ -56,14 +152,24 @@ def save_user(chat_id, user_data):
                 eod_time = VALUES(eod_time)
         """, (
             chat_id,
-            user_data.get('name'),
-            user_data.get('country'),
-            user_data.get('timezone', 'UTC'),
-            user_data.get('onboarded', False),
-            user_data.get('eod_time')
+            saved['name'],
+            saved['country'],
+            saved['timezone'],
+            saved['onboarded'],
+            saved['eod_time']
         ))
         
         connection.commit()
+        
+        # Write-through: patch the cached row, or just remember the timezone
+        with _user_cache_lock:
+            entry = _user_cache.get(chat_id)
+            if entry and entry['user'] is not None:
+                user = dict(entry['user'])
+                user.update(saved)
+                _cache_store(chat_id, user=user)
+            else:
+                _cache_store(chat_id, timezone=saved['timezone'])
         return True
         
     finally:
@@ -100,76 +206,260 @@ def is_user_onboarded(chat_id):
 
 def get_user_timezone(chat_id):
     """Get user timezone"""
+    with _user_cache_lock:
+        entry = _cache_entry(chat_id)
+        if entry and entry['timezone']:
+            _user_cache_stats['hits'] += 1
+            return entry['timezone']
+    
     user = get_user(chat_id)
     return user.get('timezone', 'UTC')
 
 
+def peek_user_tzinfo(chat_id):
+    """Cached tzinfo for a user, or None if not cached (never touches the DB)"""
+    with _user_cache_lock:
+        entry = _cache_entry(chat_id)
+        if not entry or not entry['timezone']:
+            return None
+        if entry['tzinfo'] is None:
+            entry['tzinfo'] = _resolve_tz(entry['timezone'])
+        _user_cache_stats['hits'] += 1
+        return entry['tzinfo']
+
+
+def get_user_tzinfo(chat_id):
+    """Resolved pytz timezone for a user (cached, UTC if unknown)"""
+    tzinfo = peek_user_tzinfo(chat_id)
+    if tzinfo is None:
+        get_user_timezone(chat_id)
+        tzinfo = peek_user_tzinfo(chat_id) or pytz.UTC
+    return tzinfo
+
+
 def set_user_timezone(chat_id, timezone_name):
     """Set user timezone"""
-    user = get_user(chat_id)
-    user['timezone'] = timezone_name
-    return save_user(chat_id, user)
+    connection = get_db_connection()
+    if not connection:
+        return False
+    
+    cursor = connection.cursor()
+    try:
+        cursor.execute("""
+            INSERT INTO users (chat_id, timezone) VALUES (%s, %s)
+            ON DUPLICATE KEY UPDATE timezone = VALUES(timezone)
+        """, (chat_id, timezone_name))
+        
+        connection.commit()
+        
+        with _user_cache_lock:
+            _cache_store(chat_id, timezone=timezone_name)
+        return True
+        
+    finally:
+        cursor.close()
+        connection.close()
+
+
+ID_COUNTERS = ('goal_seq', 'habit_seq')
+
+
+def allocate_item_id(cursor, chat_id, counter):
+    """
+    Next per-user goal/habit ID from a counter column on users.
+    One atomic upsert - the row lock serializes concurrent adds for the same
+    user and nothing scans goals/habits. Runs on the caller's cursor so the
+    allocation commits with the INSERT that uses it.
+    """
+    if counter not in ID_COUNTERS:
+        raise ValueError(f"Unknown ID counter: {counter}")
+    
+    cursor.execute(f"""
+        INSERT INTO users (chat_id, {counter}) VALUES (%s, LAST_INSERT_ID(1))
+        ON DUPLICATE KEY UPDATE {counter} = LAST_INSERT_ID({counter} + 1)
+    """, (chat_id,))
+    return cursor.lastrowid
+
+
+GOAL_COLUMNS = """
+    goal_id as id, goal, target_days, streak, start_date, motivation,
+    last_checkin, status, reminder_times, completed_date
+"""
+HABIT_COLUMNS = """
+    habit_id as id, habit, days_target, streak, start_date,
+    reminder_times, last_completed, status, completed_date
+"""
+GOAL_DATE_FIELDS = ('start_date', 'last_checkin', 'completed_date')
+HABIT_DATE_FIELDS = ('start_date', 'last_completed', 'completed_date')
+
+
+def _parse_item(item, date_fields):
+    """Parse reminder JSON and convert dates to ISO strings (in place)"""
+    if item['reminder_times']:
+        item['reminder_times'] = json.loads(item['reminder_times'])
+    for field in date_fields:
+        if item[field]:
+            item[field] = item[field].isoformat()
+    return item
+
+
+def _group_by_chat(rows, date_fields):
+    """Group goal/habit rows by chat_id in one pass"""
+    grouped = {}
+    for row in rows:
+        chat_id = row.pop('chat_id')
+        grouped.setdefault(chat_id, []).append(_parse_item(row, date_fields))
+    return grouped
+
+
+def _assemble(users, goals_by_chat, habits_by_chat):
+    """Build the load_data() dict from users and grouped items"""
+    data = {}
+    for user in users:
+        data[str(user['chat_id'])] = {
+            'name': user['name'],
+            'country': user['country'],
+            'timezone': user['timezone'],
+            'onboarded': user['onboarded'],
+            'eod_time': user['eod_time'],
+            'goals': goals_by_chat.get(user['chat_id'], []),
+            'habits': habits_by_chat.get(user['chat_id'], [])
+        }
+    return data
+
+
+def _fetch_items(cursor, where="", params=()):
+    """Fetch goals and habits for many users - two queries total"""
+    cursor.execute(f"""
+        SELECT chat_id, {GOAL_COLUMNS}
+        FROM goals {where}
+        ORDER BY chat_id, goal_id
+    """, params)
+    goals_by_chat = _group_by_chat(cursor.fetchall(), GOAL_DATE_FIELDS)
+
+    cursor.execute(f"""
+        SELECT chat_id, {HABIT_COLUMNS}
+        FROM habits {where}
+        ORDER BY chat_id, habit_id
+    """, params)
+    habits_by_chat = _group_by_chat(cursor.fetchall(), HABIT_DATE_FIELDS)
+
+    return goals_by_chat, habits_by_chat
 
 
 def load_data():
-    """Load all user data for reminder scheduling"""
+    """Load all user data for reminder scheduling (3 queries, any user count)"""
     connection = get_db_connection()
     if not connection:
         return {}
     
     cursor = connection.cursor(dictionary=True)
     try:
-        cursor.execute("SELECT * FROM users")
+        cursor.execute("""
+            SELECT chat_id, name, country, timezone, onboarded, eod_time
+            FROM users
+        """)
         users = cursor.fetchall()
+        prime_user_timezones(users)
         
-        data = {}
-        for user in users:
-            chat_id = str(user['chat_id'])
-            
-            # Get goals
-            cursor.execute("""
-                SELECT goal_id as id, goal, target_days, streak, start_date, motivation,
-                       last_checkin, status, reminder_times, completed_date
-                FROM goals WHERE chat_id = %s
-            """, (user['chat_id'],))
-            goals = cursor.fetchall()
-            
-            # Parse JSON and dates for goals
-            for goal in goals:
-                if goal['reminder_times']:
-                    goal['reminder_times'] = json.loads(goal['reminder_times'])
-                for field in ['start_date', 'last_checkin', 'completed_date']:
-                    if goal[field]:
-                        goal[field] = goal[field].isoformat()
-            
-            # Get habits
-            cursor.execute("""
-                SELECT habit_id as id, habit, days_target, streak, start_date,
-                       reminder_times, last_completed, status, completed_date
-                FROM habits WHERE chat_id = %s
-            """, (user['chat_id'],))
-            habits = cursor.fetchall()
-            
-            # Parse JSON and dates for habits
-            for habit in habits:
-                if habit['reminder_times']:
-                    habit['reminder_times'] = json.loads(habit['reminder_times'])
-                for field in ['start_date', 'last_completed', 'completed_date']:
-                    if habit[field]:
-                        habit[field] = habit[field].isoformat()
-            
-            data[chat_id] = {
-                'name': user['name'],
-                'country': user['country'],
-                'timezone': user['timezone'],
-                'onboarded': user['onboarded'],
-                'eod_time': user['eod_time'],
-                'goals': goals,
-                'habits': habits
-            }
-        
-        return data
+        goals_by_chat, habits_by_chat = _fetch_items(cursor)
+        return _assemble(users, goals_by_chat, habits_by_chat)
         
     finally:
         cursor.close()
         connection.close()
+
+
+def _fetch_user_page(cursor, after_chat_id, chunk_size, premium_only=False, has_active_items=False):
+    """One keyset page of users ordered by chat_id"""
+    conditions = []
+    params = []
+    
+    if after_chat_id is not None:
+        conditions.append("u.chat_id > %s")
+        params.append(after_chat_id)
+    
+    if premium_only:
+        conditions.append("""EXISTS (
+            SELECT 1 FROM premium_users p
+            WHERE p.chat_id = u.chat_id AND p.is_active = TRUE AND p.end_date >= CURRENT_DATE
+        )""")
+    
+    if has_active_items:
+        conditions.append("""(
+            EXISTS (SELECT 1 FROM goals g WHERE g.chat_id = u.chat_id AND g.status = 'active')
+            OR EXISTS (SELECT 1 FROM habits h WHERE h.chat_id = u.chat_id AND h.status = 'active')
+        )""")
+    
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    cursor.execute(f"""
+        SELECT u.chat_id, u.name, u.country, u.timezone, u.onboarded, u.eod_time
+        FROM users u {where}
+        ORDER BY u.chat_id
+        LIMIT %s
+    """, (*params, chunk_size))
+    return cursor.fetchall()
+
+
+def iter_users(chunk_size=500, premium_only=False, has_active_items=False,
+               with_items=False, item_status='active', after_chat_id=None):
+    """
+    Yield lists of user dicts in keyset-paginated chunks by chat_id.
+    
+    premium_only      - only users with an active premium subscription
+    has_active_items  - only users with at least one active goal or habit
+    with_items        - attach 'goals' and 'habits' (filtered by item_status,
+                        None = all statuses)
+    after_chat_id     - resume after this chat_id (checkpoint)
+    
+    A pooled connection is held only while a chunk is fetched.
+    """
+    while True:
+        connection = get_db_connection()
+        if not connection:
+            return
+        
+        cursor = connection.cursor(dictionary=True)
+        try:
+            users = _fetch_user_page(cursor, after_chat_id, chunk_size, premium_only, has_active_items)
+            if not users:
+                return
+            
+            if with_items:
+                chat_ids = [user['chat_id'] for user in users]
+                placeholders = ", ".join(["%s"] * len(chat_ids))
+                where = f"WHERE chat_id IN ({placeholders})"
+                params = tuple(chat_ids)
+                if item_status:
+                    where += " AND status = %s"
+                    params += (item_status,)
+                
+                goals_by_chat, habits_by_chat = _fetch_items(cursor, where, params)
+                for user in users:
+                    user['goals'] = goals_by_chat.get(user['chat_id'], [])
+                    user['habits'] = habits_by_chat.get(user['chat_id'], [])
+            
+        finally:
+            cursor.close()
+            connection.close()
+        
+        prime_user_timezones(users)
+        # Read the cursor before yielding: consumers may reshape the user dicts
+        after_chat_id = users[-1]['chat_id']
+        last_page = len(users) < chunk_size
+        yield users
+        
+        if last_page:
+            return
+
+
+def load_data_chunks(chunk_size=1000):
+    """
+    Stream load_data() in chunks of users, ordered by chat_id.
+    Yields dicts shaped like load_data(); memory stays at one chunk.
+    """
+    for users in iter_users(chunk_size, with_items=True, item_status=None):
+        yield {
+            str(user['chat_id']): {key: value for key, value in user.items() if key != 'chat_id'}
+            for user in users
+        }
@@ -0,0 +1,194 @@
+"""
+Write-Behind Buffers
+Coalesce fire-and-forget INSERTs (mood logs, conversation history) into
+multi-row INSERTs, flushed by batch size or time on a background thread.
+Call flush_all() / stop_all() on shutdown so nothing queued is lost.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+import mysql.connector
+
+from .connection import get_db_connection
+
+WRITE_BEHIND_BATCH = int(os.getenv('WRITE_BEHIND_BATCH', 200))           # rows per INSERT
+WRITE_BEHIND_INTERVAL = float(os.getenv('WRITE_BEHIND_INTERVAL', 2.0))   # max seconds a row waits
+WRITE_BEHIND_MAX_QUEUE = int(os.getenv('WRITE_BEHIND_MAX_QUEUE', 10000)) # drop beyond this
+
+# Errors worth retrying - anything else means a row in the batch is bad
+RETRYABLE_ERRORS = (mysql.connector.errors.OperationalError, mysql.connector.errors.InterfaceError)
+
+_buffers = []
+
+
+class WriteBehindBuffer:
+    """Bounded queue of rows for one INSERT statement"""
+
+    def __init__(self, name, sql, max_batch=WRITE_BEHIND_BATCH,
+                 interval=WRITE_BEHIND_INTERVAL, max_queue=WRITE_BEHIND_MAX_QUEUE):
+        self.name = name
+        self.sql = sql
+        self.max_batch = max_batch
+        self.interval = interval
+        self.max_queue = max_queue
+
+        self._rows = deque()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._stopping = False
+
+        self._stats = {
+            'enqueued': 0,
+            'written': 0,
+            'dropped': 0,
+            'flushes': 0,
+            'failures': 0,
+            'flush_total_ms': 0.0,
+            'flush_max_ms': 0.0,
+            'last_flush_ms': 0.0,
+        }
+        _buffers.append(self)
+
+    # ===== PRODUCERS =====
+    def add(self, row):
+        """Queue one row (never blocks on the DB). False if the queue is full."""
+        with self._cond:
+            if len(self._rows) >= self.max_queue:
+                self._stats['dropped'] += 1
+                return False
+
+            self._rows.append(row)
+            self._stats['enqueued'] += 1
+
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f'write-behind-{self.name}', daemon=True
+                )
+                self._thread.start()
+            if len(self._rows) >= self.max_batch:
+                self._cond.notify()
+        return True
+
+    # ===== FLUSHING =====
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._stopping and len(self._rows) < self.max_batch:
+                    self._cond.wait(self.interval)
+                if self._stopping:
+                    return
+            self.flush()
+
+    def flush(self):
+        """Write everything queued right now. Returns rows written."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._cond:
+                    count = min(self.max_batch, len(self._rows))
+                    batch = [self._rows.popleft() for _ in range(count)]
+                if not batch:
+                    break
+
+                batch_written = self._write(batch)
+                if batch_written is None:
+                    break
+                written += batch_written
+        return written
+
+    def _write(self, batch):
+        """
+        Multi-row INSERT. Returns rows written, or None on a transient failure
+        (unwritten rows go back in front). A bad row is found by bisecting
+        the batch, so only that row is dropped.
+        """
+        started = time.monotonic()
+
+        connection = get_db_connection()
+        if not connection:
+            self._requeue(batch)
+            return None
+
+        cursor = connection.cursor()
+        pending = [batch]     # stack of slices still to write, next one last
+        written = 0
+        try:
+            while pending:
+                rows = pending.pop()
+                try:
+                    cursor.executemany(self.sql, rows)
+                    connection.commit()
+                    written += len(rows)
+                except RETRYABLE_ERRORS:
+                    pending.append(rows)
+                    raise
+                except mysql.connector.Error as e:
+                    if len(rows) > 1:
+                        middle = len(rows) // 2
+                        pending += [rows[middle:], rows[:middle]]
+                    else:
+                        print(f"❌ Write-behind dropped 1 row ({self.name}): {e}")
+                        with self._cond:
+                            self._stats['failures'] += 1
+                            self._stats['dropped'] += 1
+                    connection.rollback()
+        except RETRYABLE_ERRORS as e:
+            print(f"❌ Write-behind flush failed ({self.name}), will retry: {e}")
+            self._requeue([row for rows in reversed(pending) for row in rows])
+            return None
+        finally:
+            cursor.close()
+            connection.close()
+
+        elapsed_ms = (time.monotonic() - started) * 1000
+        with self._cond:
+            self._stats['flushes'] += 1
+            self._stats['written'] += written
+            self._stats['flush_total_ms'] += elapsed_ms
+            self._stats['flush_max_ms'] = max(self._stats['flush_max_ms'], elapsed_ms)
+            self._stats['last_flush_ms'] = elapsed_ms
+        return written
+
+    def _requeue(self, batch):
+        with self._cond:
+            self._stats['failures'] += 1
+            self._rows.extendleft(reversed(batch))
+
+    def stop(self, flush=True, timeout=5.0):
+        """Stop the background thread, then write what's left"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if flush:
+            self.flush()
+
+    # ===== METRICS =====
+    def stats(self):
+        """Queue depth plus flush counters and latency"""
+        with self._cond:
+            stats = dict(self._stats)
+            stats['queue_depth'] = len(self._rows)
+        stats['flush_avg_ms'] = stats['flush_total_ms'] / stats['flushes'] if stats['flushes'] else 0.0
+        return stats
+
+
+def flush_all():
+    """Flush every buffer now. Returns total rows written."""
+    return sum(buffer.flush() for buffer in _buffers)
+
+
+def stop_all():
+    """Graceful shutdown: stop background threads and flush remaining rows"""
+    for buffer in _buffers:
+        buffer.stop(flush=True)
+
+
+def get_write_behind_stats():
+    """Metrics for every buffer, keyed by name"""
+    return {buffer.name: buffer.stats() for buffer in _buffers}
@@ -98,9 +98,52 @@ async def admin_stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE
             f"• Active Now: **{active_habits}**\n\n"
             f"💭 **MOOD TRACKING**\n"
             f"• Check-ins Today: **{mood_today}**\n\n"
-            f"Use /adminusers to see user list"
         )
         
+        # Runtime metrics since start: outbound classes, charts, AI
+        from services.outbound import outbound
+        from services.chart_service import chart_service
+        from services.chart_cache import chart_cache
+        from services.ai_gateway import ai_gateway
+        from services.ai_cache import ai_cache
+        from services.content_pool import content_pool
+        message += "📤 **OUTBOUND**\n"
+        for name, stats in outbound.get_stats().items():
+            message += (
+                f"• {name.title()}: {stats['sent']} sent, {stats['retry_after']} × 429, "
+                f"avg wait {stats['avg_wait_ms']:.0f}ms\n"
+            )
+        charts = chart_service.get_stats()
+        message += (
+            f"\n🖼️ **CHARTS**\n"
+            f"• {charts['rendered']} rendered, avg {charts['avg_render_s']:.2f}s, "
+            f"{charts['queued']} queued, {charts['rejected']} rejected, {charts['timeouts']} timeouts\n"
+        )
+        cache = chart_cache.get_stats()
+        message += (
+            f"• Cache: {cache['entries']} charts, {cache['size_mb']:.1f} MB, {cache['hit_rate']:.0f}% hits, "
+            f"{cache['file_id_hits']} file ID reuses\n"
+        )
+        ai = ai_gateway.get_stats()
+        message += (
+            f"\n🤖 **AI**\n"
+            f"• {ai['ok']} ok, {ai['fallbacks']} fallbacks ({ai['timeouts']} timeouts), "
+            f"{ai['cancelled']} cancelled, {ai['in_flight']} in flight, avg {ai['avg_latency_s']:.1f}s\n"
+            f"• Streamed: {ai['streams']}, first token after {ai['avg_first_token_s']:.1f}s, {ai['truncated']} cut short\n"
+        )
+        replies = ai_cache.get_stats()
+        message += (
+            f"• Reply cache: {replies['hit_rate']:.0f}% hits ({replies['hits']}/{replies['hits'] + replies['misses']}), "
+            f"{replies['keys']} prompts, {replies['variants']} variants\n"
+        )
+        pool = content_pool.get_stats()
+        age = f"{pool['age_h']:.0f}h old" if pool['age_h'] is not None else "not generated yet"
+        message += (
+            f"• Content pool: {pool['messages']} messages in {pool['pools']} pools ({age}), "
+            f"{pool['hit_rate']:.0f}% served from pool\n"
+        )
+        message += "\nUse /adminusers to see user list"
+        
         await update.message.reply_text(message, parse_mode='Markdown')
     
     finally:
@@ -177,35 +220,53 @@ async def admin_broadcast_command(update: Update, context: ContextTypes.DEFAULT_
     
     message_text = ' '.join(context.args)
     
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
+    from telegram.error import BadRequest
+    from database.async_db import run_sync
+    from database.broadcast_db import create_broadcast
+    from services.broadcast import format_announcement, progress_reporter, start_broadcast
     
+    # Preview to the admin first - a Markdown error fails here, not for every user
     try:
-        # Get all user chat_ids
-        cursor.execute("SELECT DISTINCT chat_id FROM users")
-        users = cursor.fetchall()
-        
-        sent = 0
-        failed = 0
-        
-        for user in users:
-            try:
-                await context.bot.send_message(
-                    chat_id=user['chat_id'],
-                    text=f"📢 **Announcement**\n\n{message_text}",
-                    parse_mode='Markdown'
-                )
-                sent += 1
-            except:
-                failed += 1
-        
-        await update.message.reply_text(
-            f"✅ **Broadcast Complete**\n\n"
-            f"Sent: {sent}\n"
-            f"Failed: {failed}",
-            parse_mode='Markdown'
-        )
+        await update.message.reply_text(format_announcement(message_text), parse_mode='Markdown')
+    except BadRequest as e:
+        await update.message.reply_text(f"❌ Message can't be sent: {e}")
+        return
     
-    finally:
-        cursor.close()
-        conn.close()
+    broadcast_id = await run_sync(create_broadcast, chat_id, message_text)
+    if not broadcast_id:
+        await update.message.reply_text("❌ Database connection error.")
+        return
+    
+    status = await update.message.reply_text(
+        f"📢 **Broadcast #{broadcast_id} started**\n\n"
+        f"Progress updates will appear here.\n"
+        f"Stop with /adminbroadcaststop {broadcast_id}",
+        parse_mode='Markdown'
+    )
+    
+    # Runs in the background - the handler returns right away
+    start_broadcast(
+        context.application, broadcast_id,
+        on_progress=progress_reporter(context.bot, chat_id, status.message_id)
+    )
+
+
+async def admin_broadcast_stop_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Stop a running broadcast - Admin only"""
+    chat_id = update.effective_chat.id
+    
+    if not is_admin(chat_id):
+        await update.message.reply_text("❌ Unauthorized. Admin only.")
+        return
+    
+    if not context.args or not context.args[0].isdigit():
+        await update.message.reply_text("Usage: `/adminbroadcaststop <id>`", parse_mode='Markdown')
+        return
+    
+    from services.broadcast import stop_broadcast
+    
+    broadcast_id = int(context.args[0])
+    if await stop_broadcast(broadcast_id):
+        await update.message.reply_text(f"🛑 Broadcast #{broadcast_id} stopped.")
+    else:
+        await update.message.reply_text(f"❌ Broadcast #{broadcast_id} not found.")
@@ -13,7 +13,7 @@ async def advice(update: Update, context: ContextTypes.DEFAULT_TYPE):
     else:
         prompt = f"I need advice about {topic}. Give me thoughtful, practical guidance."
     
-    response = chat_with_ai(prompt, chat_id)
+    response = await chat_with_ai(prompt, chat_id)
     
     await update.message.reply_text(response, reply_markup=get_main_keyboard())
 
@@ -14,7 +14,7 @@ async def checkin(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not mood_text:
         # AI asks for daily check-in
         prompt = "Ask me how I'm doing today and about my progress on goals/habits. Be caring and specific."
-        response = chat_with_ai(prompt, chat_id)
+        response = await chat_with_ai(prompt, chat_id)
     else:
         # Save mood and get AI response
         user["last_mood"] = mood_text
@@ -22,7 +22,7 @@ async def checkin(update: Update, context: ContextTypes.DEFAULT_TYPE):
         save_user(chat_id, user)
         
         prompt = f"I'm checking in - here's how I'm feeling: {mood_text}. Respond supportively and ask follow-up questions."
-        response = chat_with_ai(prompt, chat_id)
+        response = await chat_with_ai(prompt, chat_id)
     
     await update.message.reply_text(response, reply_markup=get_main_keyboard())
 
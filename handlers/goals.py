@@ -4,14 +4,16 @@ from telegram.ext import (
     ContextTypes, ConversationHandler, MessageHandler,
     filters, CommandHandler, CallbackQueryHandler
 )
-from database import (
-    get_user, add_goal, get_all_goals, get_goal_by_id,
+from database.async_db import (
+    run_sync, add_goal, get_all_goals, get_goal_by_id,
     complete_goal_today, delete_goal, mark_goal_complete,
     update_goal_name, update_goal_days, update_goal_reminders
 )
 
-from services.ai_response import chat_with_ai
+from services.ai_response import pooled_reply
+from services.content_pool import streak_category
 from services.ui_service import get_main_menu_keyboard
+from services.reminder_engine import reminder_engine
 import re
 
 # Conversation states
@@ -23,7 +25,7 @@ async def add_goal_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     # CRITICAL: Check limit FIRST
     from services.limit_checker import can_add_goal
-    allowed, error_msg = can_add_goal(chat_id)
+    allowed, error_msg = await run_sync(can_add_goal, chat_id)
     
     print(f"🔍 Goal limit check: allowed={allowed}, chat_id={chat_id}")
     
@@ -86,7 +88,7 @@ def get_edit_goal_keyboard(goal_id):
 
 async def goals_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     chat_id = update.effective_chat.id
-    goals = get_all_goals(chat_id, status='active')  # Only active goals
+    goals = await get_all_goals(chat_id, status='active')  # Only active goals
     
     if not goals:
         await update.message.reply_text(
@@ -122,7 +124,7 @@ async def goals_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def completed_goals_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """View completed goals"""
     chat_id = update.effective_chat.id
-    completed = get_all_goals(chat_id, status='completed')
+    completed = await get_all_goals(chat_id, status='completed')
     
     if not completed:
         await update.message.reply_text(
@@ -162,7 +164,7 @@ async def goal_info_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     chat_id = update.effective_chat.id
-    goal = get_goal_by_id(chat_id, goal_id)
+    goal = await get_goal_by_id(chat_id, goal_id)
     
     if not goal:
         await update.message.reply_text("❌ Goal not found!")
@@ -197,22 +199,23 @@ async def goal_done_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     try:
         goal_id = int(context.args[0])
         chat_id = update.effective_chat.id
-        success, message = complete_goal_today(chat_id, goal_id)
+        success, message = await complete_goal_today(chat_id, goal_id)
         
         if success:
-            goal = get_goal_by_id(chat_id, goal_id)
+            goal = await get_goal_by_id(chat_id, goal_id)
             ai_prompt = f"Celebrate my progress! Goal: {goal['goal']}, Streak: {goal['streak']} days. Short and enthusiastic!"
-            ai_response = chat_with_ai(ai_prompt, chat_id)
+            ai_response = await pooled_reply('goal_done', ai_prompt, chat_id, slots={'goal': goal['goal']},
+                                             category=streak_category(goal['streak']))
             await update.message.reply_text(f"🎉 {message}\n\n💬 {ai_response}")
         # 🔥 Check for badge awarding (Premium users only)
-        from database.premium_db import is_premium_user, track_daily_progress, get_weekly_stats, award_badge
+        from database.async_db import is_premium_user, track_daily_progress, get_weekly_stats, award_badge
         
-        if is_premium_user(chat_id):
+        if await is_premium_user(chat_id):
             # Track progress
-            track_daily_progress(chat_id)
+            await track_daily_progress(chat_id)
             
             # Get weekly stats
-            stats = get_weekly_stats(chat_id)
+            stats = await get_weekly_stats(chat_id)
             if stats:
                 total_completed = (stats.get('goals_completed') or 0) + (stats.get('habits_completed') or 0)
                 total_tasks = (stats.get('total_goals') or 0) + (stats.get('total_habits') or 0)
@@ -221,13 +224,13 @@ async def goal_done_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 # Award badge if earned
                 badge_msg = ""
                 if completion_rate >= 90:
-                    award_badge(chat_id, 'soul_diamond', completion_rate)
+                    await award_badge(chat_id, 'soul_diamond', completion_rate)
                     badge_msg = "💎 **Soul Diamond Badge Earned!**You hit 90%+ this week! 🎉"
                 elif completion_rate >= 80:
-                    award_badge(chat_id, 'soul_gold', completion_rate)
+                    await award_badge(chat_id, 'soul_gold', completion_rate)
                     badge_msg = "🥇 **Soul Gold Badge Earned!**You hit 80%+ this week! 🎉You hit 80%+ this week! 🎉"
                 elif completion_rate >= 50:
-                    award_badge(chat_id, 'soul_silver', completion_rate)
+                    await award_badge(chat_id, 'soul_silver', completion_rate)
                     badge_msg = "🥈 **Soul Silver Badge Earned!**You hit 50%+ this week! 🎉"
                 
                 if badge_msg:
@@ -294,7 +297,7 @@ async def goal_reminders_received(update: Update, context: ContextTypes.DEFAULT_
         return ConversationHandler.END
     
     chat_id = update.effective_chat.id
-    goal_id = add_goal(
+    goal_id = await add_goal(
         chat_id,
         context.user_data['goal_name'],
         context.user_data['goal_days'],
@@ -303,16 +306,16 @@ async def goal_reminders_received(update: Update, context: ContextTypes.DEFAULT_
     )
     
     # 🔥 NEW: Schedule reminder immediately (no restart needed!)
-    goal = get_goal_by_id(chat_id, goal_id)
+    goal = await get_goal_by_id(chat_id, goal_id)
     if goal:
         try:
             from bot import schedule_single_goal_reminder
-            schedule_single_goal_reminder(context.application, chat_id, goal)
+            await schedule_single_goal_reminder(context.application, chat_id, goal)
         except Exception as e:
             print(f"⚠️ Could not auto-schedule reminder: {e}")
     
     ai_prompt = f"Celebrate that I just set this goal: {context.user_data['goal_name']} for {context.user_data['goal_days']} days. Be excited and encouraging! Short message."
-    ai_response = chat_with_ai(ai_prompt, chat_id)
+    ai_response = await pooled_reply('goal_set', ai_prompt, chat_id, slots={'goal': context.user_data['goal_name']})
     
     await update.message.reply_text(
         f"🎉 **Goal #{goal_id} Created!**\n\n"
@@ -340,7 +343,7 @@ async def start_edit_goal(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     goal_id = int(query.data.split("_")[2])
     chat_id = query.from_user.id
-    goal = get_goal_by_id(chat_id, goal_id)
+    goal = await get_goal_by_id(chat_id, goal_id)
     
     if not goal:
         await query.message.reply_text("❌ Goal not found!")
@@ -364,7 +367,7 @@ async def edit_goal_name_start(update: Update, context: ContextTypes.DEFAULT_TYP
     context.user_data['editing_goal_id'] = goal_id
     
     chat_id = query.from_user.id
-    goal = get_goal_by_id(chat_id, goal_id)
+    goal = await get_goal_by_id(chat_id, goal_id)
     
     await query.edit_message_text(
         f"✏️ **Current goal:** {goal['goal']}\n\n"
@@ -383,7 +386,7 @@ async def edit_goal_name_received(update: Update, context: ContextTypes.DEFAULT_
         return ConversationHandler.END
     
     chat_id = update.effective_chat.id
-    success = update_goal_name(chat_id, goal_id, new_name)
+    success = await update_goal_name(chat_id, goal_id, new_name)
     
     if success:
         await update.message.reply_text(
@@ -405,7 +408,7 @@ async def edit_goal_days_start(update: Update, context: ContextTypes.DEFAULT_TYP
     context.user_data['editing_goal_id'] = goal_id
     
     chat_id = query.from_user.id
-    goal = get_goal_by_id(chat_id, goal_id)
+    goal = await get_goal_by_id(chat_id, goal_id)
     
     await query.edit_message_text(
         f"📅 **Current target:** {goal['target_days']} days\n\n"
@@ -426,16 +429,16 @@ async def edit_goal_days_received(update: Update, context: ContextTypes.DEFAULT_
         chat_id = update.effective_chat.id
         
         # Get current goal status BEFORE update
-        goal = get_goal_by_id(chat_id, goal_id)
+        goal = await get_goal_by_id(chat_id, goal_id)
         old_status = goal.get('status', 'active')
         current_streak = goal.get('streak', 0)
         
         # Update the days
-        success = update_goal_days(chat_id, goal_id, new_days)
+        success = await update_goal_days(chat_id, goal_id, new_days)
         
         if success:
             # Get updated goal status AFTER update
-            goal = get_goal_by_id(chat_id, goal_id)
+            goal = await get_goal_by_id(chat_id, goal_id)
             new_status = goal.get('status', 'active')
             
             # Different messages based on status change
@@ -481,7 +484,7 @@ async def edit_goal_reminders_start(update: Update, context: ContextTypes.DEFAUL
     context.user_data['editing_goal_id'] = goal_id
     
     chat_id = query.from_user.id
-    goal = get_goal_by_id(chat_id, goal_id)
+    goal = await get_goal_by_id(chat_id, goal_id)
     current_reminders = ", ".join(goal.get('reminder_times', ["09:00"]))
     
     await query.edit_message_text(
@@ -512,21 +515,18 @@ async def edit_goal_reminders_received(update: Update, context: ContextTypes.DEF
     chat_id = update.effective_chat.id
     
     # Remove old reminders
-    current_jobs = context.application.job_queue.jobs()
-    for job in current_jobs:
-        if job.name and job.name.startswith(f"{chat_id}_goal_{goal_id}_"):
-            job.schedule_removal()
-            print(f"🗑️ Removed old reminder: {job.name}")
+    removed = reminder_engine.remove(chat_id, 'goal', goal_id)
+    print(f"🗑️ Removed {removed} old reminder(s) for goal #{goal_id}")
     
-    success = update_goal_reminders(chat_id, goal_id, reminder_times)
+    success = await update_goal_reminders(chat_id, goal_id, reminder_times)
     
     if success:
         # 🔥 NEW: Schedule new reminders immediately
-        goal = get_goal_by_id(chat_id, goal_id)
+        goal = await get_goal_by_id(chat_id, goal_id)
         if goal:
             try:
                 from bot import schedule_single_goal_reminder
-                schedule_single_goal_reminder(context.application, chat_id, goal)
+                await schedule_single_goal_reminder(context.application, chat_id, goal)
             except Exception as e:
                 print(f"⚠️ Could not auto-schedule reminder: {e}")
         
@@ -549,7 +549,7 @@ async def back_to_goal_info(update: Update, context: ContextTypes.DEFAULT_TYPE):
     goal_id = int(query.data.split("_")[3])
     
     chat_id = query.from_user.id
-    goal = get_goal_by_id(chat_id, goal_id)
+    goal = await get_goal_by_id(chat_id, goal_id)
     
     if not goal:
         await query.message.reply_text("❌ Goal not found!")
@@ -596,27 +596,29 @@ async def handle_goal_actions(update: Update, context: ContextTypes.DEFAULT_TYPE
     
     if data.startswith("goal_done_"):
         goal_id = int(data.split("_")[2])
-        success, message = complete_goal_today(chat_id, goal_id)
+        success, message = await complete_goal_today(chat_id, goal_id)
         if success:
-            goal = get_goal_by_id(chat_id, goal_id)
+            goal = await get_goal_by_id(chat_id, goal_id)
             ai_prompt = f"Celebrate! Goal: {goal['goal']}, Streak: {goal['streak']}. Short!"
-            ai_response = chat_with_ai(ai_prompt, chat_id)
+            ai_response = await pooled_reply('goal_done', ai_prompt, chat_id, slots={'goal': goal['goal']},
+                                             category=streak_category(goal['streak']))
             await query.message.reply_text(f"🎉 {message}\n\n💬 {ai_response}")
         else:
             await query.message.reply_text(f"ℹ️ {message}")
     
     elif data.startswith("goal_finish_"):
         goal_id = int(data.split("_")[2])
-        success, message = mark_goal_complete(chat_id, goal_id)
+        success, message = await mark_goal_complete(chat_id, goal_id)
         await query.message.reply_text(message)
     
     elif data.startswith("goal_delete_"):
         goal_id = int(data.split("_")[2])
-        delete_goal(chat_id, goal_id)
+        reminder_engine.remove(chat_id, 'goal', goal_id)
+        await delete_goal(chat_id, goal_id)
         await query.message.reply_text(f"🗑️ Goal #{goal_id} deleted!")
     
     elif data == "view_goals":
-        goals = get_all_goals(chat_id)
+        goals = await get_all_goals(chat_id)
         if goals:
             message = f"🎯 **Your Active Goals ({len(goals)}):**\n\n"
             for goal in goals:
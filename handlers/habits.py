@@ -4,13 +4,15 @@ from telegram.ext import (
     ContextTypes, ConversationHandler, MessageHandler,
     filters, CommandHandler, CallbackQueryHandler
 )
-from database import (
-    get_user, add_habit, get_all_habits, get_habit_by_id,
+from database.async_db import (
+    run_sync, add_habit, get_all_habits, get_habit_by_id,
     complete_habit_today, delete_habit, mark_habit_complete,
     update_habit_name, update_habit_streak, update_habit_reminders
 )
-from services.ai_response import chat_with_ai
+from services.ai_response import pooled_reply
+from services.content_pool import streak_category
 from services.ui_service import get_main_menu_keyboard
+from services.reminder_engine import reminder_engine
 import re
 
 # Conversation states for habits
@@ -26,7 +28,7 @@ async def add_habit_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     # CRITICAL: Check limit FIRST
     from services.limit_checker import can_add_habit
-    allowed, error_msg = can_add_habit(chat_id)
+    allowed, error_msg = await run_sync(can_add_habit, chat_id)
     
     print(f"🔍 Limit check: allowed={allowed}, chat_id={chat_id}")
     
@@ -89,7 +91,7 @@ def get_edit_keyboard(habit_id):
 async def habits_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """View active habits only"""
     chat_id = update.effective_chat.id
-    habits = get_all_habits(chat_id, status='active')  # Only active habits
+    habits = await get_all_habits(chat_id, status='active')  # Only active habits
     
     if not habits:
         await update.message.reply_text(
@@ -126,7 +128,7 @@ async def habits_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def completed_habits_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """View completed habits"""
     chat_id = update.effective_chat.id
-    completed = get_all_habits(chat_id, status='completed')
+    completed = await get_all_habits(chat_id, status='completed')
     
     if not completed:
         await update.message.reply_text(
@@ -164,7 +166,7 @@ async def habit_info_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return
     
     chat_id = update.effective_chat.id
-    habit = get_habit_by_id(chat_id, habit_id)
+    habit = await get_habit_by_id(chat_id, habit_id)
     
     if not habit:
         await update.message.reply_text("❌ Habit not found!")
@@ -205,10 +207,10 @@ async def habit_done_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     try:
         habit_id = int(context.args[0])
         chat_id = update.effective_chat.id
-        success, message = complete_habit_today(chat_id, habit_id)
+        success, message = await complete_habit_today(chat_id, habit_id)
         
         if success:
-            habit = get_habit_by_id(chat_id, habit_id)
+            habit = await get_habit_by_id(chat_id, habit_id)
             if habit:
                 # Check if just completed 21 days
                 if habit.get('status') == 'completed' and habit['streak'] >= 21:
@@ -223,14 +225,15 @@ async def habit_done_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
                     )
                 else:
                     ai_prompt = f"Celebrate! Habit: {habit['habit']}, Streak: {habit['streak']}. Short!"
-                    ai_response = chat_with_ai(ai_prompt, chat_id)
+                    ai_response = await pooled_reply('habit_done', ai_prompt, chat_id, slots={'habit': habit['habit']},
+                                                     category=streak_category(habit['streak']))
                     await update.message.reply_text(f"🎉 {message}\n\n💬 {ai_response}")
         # 🔥 Check for badge awarding (Premium users only)
-        from database.premium_db import is_premium_user, track_daily_progress, get_weekly_stats, award_badge
+        from database.async_db import is_premium_user, track_daily_progress, get_weekly_stats, award_badge
         
-        if is_premium_user(chat_id):
-            track_daily_progress(chat_id)
-            stats = get_weekly_stats(chat_id)
+        if await is_premium_user(chat_id):
+            await track_daily_progress(chat_id)
+            stats = await get_weekly_stats(chat_id)
             if stats:
                 total_completed = (stats.get('goals_completed') or 0) + (stats.get('habits_completed') or 0)
                 total_tasks = (stats.get('total_goals') or 0) + (stats.get('total_habits') or 0)
@@ -238,13 +241,13 @@ async def habit_done_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
                 
                 badge_msg = ""
                 if completion_rate >= 90:
-                    award_badge(chat_id, 'soul_diamond', completion_rate)
+                    await award_badge(chat_id, 'soul_diamond', completion_rate)
                     badge_msg = "💎 **Soul Diamond Badge!** 90%+ this week! 🎉"
                 elif completion_rate >= 80:
-                    award_badge(chat_id, 'soul_gold', completion_rate)
+                    await award_badge(chat_id, 'soul_gold', completion_rate)
                     badge_msg = "🥇 **Soul Gold Badge!** 80%+ this week! 🎉"
                 elif completion_rate >= 50:
-                    award_badge(chat_id, 'soul_silver', completion_rate)
+                    await award_badge(chat_id, 'soul_silver', completion_rate)
                     badge_msg = "🥈 **Soul Silver Badge!** 50%+ this week! 🎉"
                 
                 if badge_msg:
@@ -289,19 +292,19 @@ async def habit_reminders_received(update: Update, context: ContextTypes.DEFAULT
         return ConversationHandler.END
     
     chat_id = update.effective_chat.id
-    habit_id = add_habit(chat_id, context.user_data['habit_name'], reminder_times)
+    habit_id = await add_habit(chat_id, context.user_data['habit_name'], reminder_times)
     
     # 🔥 Schedule reminder immediately (no restart needed!)
-    habit = get_habit_by_id(chat_id, habit_id)
+    habit = await get_habit_by_id(chat_id, habit_id)
     if habit:
         try:
             from bot import schedule_single_habit_reminder
-            schedule_single_habit_reminder(context.application, chat_id, habit)
+            await schedule_single_habit_reminder(context.application, chat_id, habit)
         except Exception as e:
             print(f"⚠️ Could not auto-schedule reminder: {e}")
     
     ai_prompt = f"Celebrate starting a 21-day habit: {context.user_data['habit_name']}. Short!"
-    ai_response = chat_with_ai(ai_prompt, chat_id)
+    ai_response = await pooled_reply('habit_set', ai_prompt, chat_id, slots={'habit': context.user_data['habit_name']})
     
     await update.message.reply_text(
         f"🎉 **Habit #{habit_id} Created!**\n\n"
@@ -329,7 +332,7 @@ async def start_edit_habit(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     habit_id = int(query.data.split("_")[2])
     chat_id = query.from_user.id
-    habit = get_habit_by_id(chat_id, habit_id)
+    habit = await get_habit_by_id(chat_id, habit_id)
     
     if not habit:
         await query.message.reply_text("❌ Habit not found!")
@@ -353,7 +356,7 @@ async def edit_name_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     context.user_data['editing_habit_id'] = habit_id
     
     chat_id = query.from_user.id
-    habit = get_habit_by_id(chat_id, habit_id)
+    habit = await get_habit_by_id(chat_id, habit_id)
     
     await query.edit_message_text(
         f"✏️ **Current name:** {habit['habit']}\n\n"
@@ -372,7 +375,7 @@ async def edit_name_received(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return ConversationHandler.END
     
     chat_id = update.effective_chat.id
-    success = update_habit_name(chat_id, habit_id, new_name)
+    success = await update_habit_name(chat_id, habit_id, new_name)
     
     if success:
         await update.message.reply_text(
@@ -395,7 +398,7 @@ async def edit_days_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     context.user_data['editing_habit_id'] = habit_id
     
     chat_id = query.from_user.id
-    habit = get_habit_by_id(chat_id, habit_id)
+    habit = await get_habit_by_id(chat_id, habit_id)
     
     await query.edit_message_text(
         f"📅 **Current streak:** {habit['streak']} days\n\n"
@@ -415,10 +418,10 @@ async def edit_days_received(update: Update, context: ContextTypes.DEFAULT_TYPE)
         habit_id = context.user_data['editing_habit_id']
         chat_id = update.effective_chat.id
         
-        success = update_habit_streak(chat_id, habit_id, new_days)
+        success = await update_habit_streak(chat_id, habit_id, new_days)
         
         if success:
-            habit = get_habit_by_id(chat_id, habit_id)
+            habit = await get_habit_by_id(chat_id, habit_id)
             status_msg = " 🏆 Habit marked as completed!" if new_days >= 21 else ""
             await update.message.reply_text(
                 f"✅ Streak updated to **{new_days} days**{status_msg}",
@@ -443,7 +446,7 @@ async def edit_reminders_start(update: Update, context: ContextTypes.DEFAULT_TYP
     context.user_data['editing_habit_id'] = habit_id
     
     chat_id = query.from_user.id
-    habit = get_habit_by_id(chat_id, habit_id)
+    habit = await get_habit_by_id(chat_id, habit_id)
     current_reminders = ", ".join(habit.get('reminder_times', ["09:00"]))
     
     await query.edit_message_text(
@@ -474,21 +477,18 @@ async def edit_reminders_received(update: Update, context: ContextTypes.DEFAULT_
     chat_id = update.effective_chat.id
     
     # Remove old reminders
-    current_jobs = context.application.job_queue.jobs()
-    for job in current_jobs:
-        if job.name and job.name.startswith(f"{chat_id}_habit_{habit_id}_"):
-            job.schedule_removal()
-            print(f"🗑️ Removed old reminder: {job.name}")
+    removed = reminder_engine.remove(chat_id, 'habit', habit_id)
+    print(f"🗑️ Removed {removed} old reminder(s) for habit #{habit_id}")
     
-    success = update_habit_reminders(chat_id, habit_id, reminder_times)
+    success = await update_habit_reminders(chat_id, habit_id, reminder_times)
     
     if success:
         # 🔥 Schedule new reminders immediately
-        habit = get_habit_by_id(chat_id, habit_id)
+        habit = await get_habit_by_id(chat_id, habit_id)
         if habit:
             try:
                 from bot import schedule_single_habit_reminder
-                schedule_single_habit_reminder(context.application, chat_id, habit)
+                await schedule_single_habit_reminder(context.application, chat_id, habit)
             except Exception as e:
                 print(f"⚠️ Could not auto-schedule reminder: {e}")
         
@@ -511,7 +511,7 @@ async def back_to_habit_info(update: Update, context: ContextTypes.DEFAULT_TYPE)
     habit_id = int(query.data.split("_")[3])
     
     chat_id = query.from_user.id
-    habit = get_habit_by_id(chat_id, habit_id)
+    habit = await get_habit_by_id(chat_id, habit_id)
     
     if not habit:
         await query.message.reply_text("❌ Habit not found!")
@@ -561,9 +561,9 @@ async def handle_habit_actions(update: Update, context: ContextTypes.DEFAULT_TYP
     
     if data.startswith("habit_done_"):
         habit_id = int(data.split("_")[2])
-        success, message = complete_habit_today(chat_id, habit_id)
+        success, message = await complete_habit_today(chat_id, habit_id)
         if success:
-            habit = get_habit_by_id(chat_id, habit_id)
+            habit = await get_habit_by_id(chat_id, habit_id)
             if habit:
                 # Check if just completed 21 days
                 if habit.get('status') == 'completed' and habit['streak'] >= 21:
@@ -577,23 +577,25 @@ async def handle_habit_actions(update: Update, context: ContextTypes.DEFAULT_TYP
                     )
                 else:
                     ai_prompt = f"Celebrate! Habit: {habit['habit']}, Streak: {habit['streak']}. Short!"
-                    ai_response = chat_with_ai(ai_prompt, chat_id)
+                    ai_response = await pooled_reply('habit_done', ai_prompt, chat_id, slots={'habit': habit['habit']},
+                                                     category=streak_category(habit['streak']))
                     await query.message.reply_text(f"🔥 {message}\n\n💬 {ai_response}")
         else:
             await query.message.reply_text(f"ℹ️ {message}")
     
     elif data.startswith("habit_finish_"):
         habit_id = int(data.split("_")[2])
-        success, message = mark_habit_complete(chat_id, habit_id)
+        success, message = await mark_habit_complete(chat_id, habit_id)
         await query.message.reply_text(message)
     
     elif data.startswith("habit_delete_"):
         habit_id = int(data.split("_")[2])
-        delete_habit(chat_id, habit_id)
+        reminder_engine.remove(chat_id, 'habit', habit_id)
+        await delete_habit(chat_id, habit_id)
         await query.message.reply_text(f"🗑️ Habit #{habit_id} deleted!")
     
     elif data == "view_habits":
-        habits = get_all_habits(chat_id, status='active')
+        habits = await get_all_habits(chat_id, status='active')
         if habits:
             message = f"🔄 **Your Active Habits ({len(habits)}):**\n\n"
             for habit in habits:
@@ -634,7 +636,7 @@ async def receive_habit_reminders(update: Update, context: ContextTypes.DEFAULT_
 
     # CRITICAL: Check limit before saving (in case button bypassed entry point)
     from services.limit_checker import can_add_habit
-    allowed, error_msg = can_add_habit(chat_id)
+    allowed, error_msg = await run_sync(can_add_habit, chat_id)
     
     if not allowed:
         # BLOCKED - Show premium message and end conversation
@@ -648,10 +650,10 @@ async def receive_habit_reminders(update: Update, context: ContextTypes.DEFAULT_
         return ConversationHandler.END
     
     # Allowed - continue saving
-        habit_id = add_habithabit_id = add_habit(chat_id, context.user_data['habit_name'], reminder_times)
+        habit_id = add_habithabit_id = await add_habit(chat_id, context.user_data['habit_name'], reminder_times)
     
     ai_prompt = f"Celebrate starting a 21-day habit: {context.user_data['habit_name']}. Short!"
-    ai_response = chat_with_ai(ai_prompt, chat_id)
+    ai_response = await pooled_reply('habit_set', ai_prompt, chat_id, slots={'habit': context.user_data['habit_name']})
     
     await update.message.reply_text(
         f"🎉 **Habit #{habit_id} Created!**\n\n"
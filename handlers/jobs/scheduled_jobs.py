@@ -4,149 +4,76 @@ All background tasks and automated reports
 """
 
 from datetime import datetime, timedelta, date
-from database.premium_db import (
-    is_premium_user, track_daily_progress, get_weekly_stats, award_badge
-)
-from database import load_data, get_user_profile, get_all_goals, get_all_habits
-from services.chart_generator import create_3day_feedback_chart, create_weekly_progress_chart
-from services.ai_analytics import generate_weekly_analysis, generate_3day_feedback
+from database.premium_db import track_all_daily_progress
+from database.job_db import iter_users_checkpointed
+from database.history_db import get_histories, history_to_list
+from database.async_db import run_sync
+from services.chart_cache import send_chart
+from services.ai_analytics import generate_3day_feedback_async
+from services.weekly_report_pipeline import run_weekly_reports
 
 # ===== JOB: Weekly Reports =====
 async def send_weekly_reports(context):
     """Send weekly progress reports to all premium users (Every Sunday 8 PM)"""
     print("📊 Sending weekly reports to premium users...")
     
-    data = load_data()
-    report_count = 0
+    # Resumable per ISO week; stages run concurrently (services/weekly_report_pipeline.py)
+    year, week, _ = date.today().isocalendar()
+    summary = await run_weekly_reports(context.bot, f"{year}-W{week:02d}")
     
-    for chat_id_str, user in data.items():
-        chat_id = int(chat_id_str)
-        
-        if not is_premium_user(chat_id):
-            continue
-        
-        try:
-            profile = get_user_profile(chat_id)
-            user_name = profile.get('name', 'friend')
-            
-            # Get stats
-            stats = get_weekly_stats(chat_id)
-            
-            if not stats or stats.get('total_goals', 0) + stats.get('total_habits', 0) == 0:
-                continue
-            
-            # Generate chart
-            chart_buf = create_weekly_progress_chart(chat_id, stats, user_name)
-            
-            # Calculate completion
-            goals_completed = stats.get('goals_completed', 0)
-            habits_completed = stats.get('habits_completed', 0)
-            total_goals = stats.get('total_goals', 1)
-            total_habits = stats.get('total_habits', 1)
-            
-            completion_rate = ((goals_completed + habits_completed) / 
-                              (total_goals + total_habits) * 100) if (total_goals + total_habits) > 0 else 0
-            
-            # Award badge
-            badge = None
-            badge_emoji = None
-            badge_type = None
-            
-            if completion_rate >= 90:
-                badge = "Soul Diamond"
-                badge_emoji = "💎"
-                badge_type = 'soul_diamond'
-            elif completion_rate >= 80:
-                badge = "Soul Gold"
-                badge_emoji = "🥇"
-                badge_type = 'soul_gold'
-            elif completion_rate >= 50:
-                badge = "Soul Silver"
-                badge_emoji = "🥈"
-                badge_type = 'soul_silver'
-            
-            if badge_type:
-                award_badge(chat_id, badge_type, completion_rate)
-            
-            # AI insights
-            ai_insights = generate_weekly_analysis(chat_id, stats, user_name)
-            
-            # Create report
-            report = f"""
-╔═══════════════════════════════╗
-║  📊 **WEEKLY PROGRESS REPORT** ║
-╚═══════════════════════════════╝
-
-**Hey {user_name}!** Your week is complete!
-
-📈 **Performance:**
-• Completion Rate: **{completion_rate:.1f}%**
-• Goals: {goals_completed}/{total_goals} ✅
-• Habits: {habits_completed}/{total_habits} ✅
-
-{f'🏆 **New Achievement!**\\n{badge_emoji} **{badge}** badge earned!' if badge else ''}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-🧠 **AI Insights:**
-
-{ai_insights}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-Have an amazing week ahead! 💪
-"""
-            
-            # Send
-            await context.bot.send_photo(
-                chat_id=chat_id,
-                photo=chart_buf,
-                caption=report,
-                parse_mode='Markdown'
-            )
-            
-            report_count += 1
-            print(f"✅ Report sent to user {chat_id}")
-            
-        except Exception as e:
-            print(f"❌ Error sending report to {chat_id}: {e}")
-    
-    print(f"📊 Weekly reports sent: {report_count}")
+    print(f"📊 Weekly reports sent: {summary['sent']} "
+          f"(skipped {summary['skipped']}, failed {summary['failed']}, {summary['elapsed_s']:.1f}s)")
+    print(f"   AI: {summary['ai_requests']} requests, {summary['ai_fallbacks']} rule-based fallbacks")
+    for stage in ('fetch', 'chart', 'ai', 'send'):
+        timing = summary[stage]
+        print(f"   {stage}: {timing['calls']} calls, avg {timing['avg_s']:.2f}s, max {timing['max_s']:.2f}s")
 
 # ===== JOB: 3-Day Pattern Detection =====
+HISTORY_DAYS = 7   # days of completion history shown on the feedback chart
+
 async def check_3day_patterns(context):
     """Detect 3-day inactivity patterns (Premium only, Daily at 6 PM)"""
     print("💭 Checking 3-day patterns...")
     
-    data = load_data()
     today = date.today()
     three_days_ago = today - timedelta(days=3)
+    history_start = today - timedelta(days=HISTORY_DAYS - 1)
+    history_days = [(history_start + timedelta(days=n)).strftime('%a') for n in range(HISTORY_DAYS)]
     alert_count = 0
     
-    for chat_id_str, user in data.items():
-        chat_id = int(chat_id_str)
+    chunks = iter_users_checkpointed(
+        '3day_patterns', today.isoformat(),
+        premium_only=True, has_active_items=True, with_items=True
+    )
+    while True:
+        # Each chunk (and its checkpoint) is a DB round trip - keep it off the loop
+        users = await run_sync(next, chunks, None)
+        if users is None:
+            break
         
-        if not is_premium_user(chat_id):
-            continue
+        # Last week's completion bitmaps for the whole chunk in one query
+        histories = await run_sync(get_histories, [user['chat_id'] for user in users], history_start, today)
         
-        try:
-            goals = get_all_goals(chat_id, status='active')
-            habits = get_all_habits(chat_id, status='active')
+        for user in users:
+            chat_id = user['chat_id']
             
-            # Check goals
-            for goal in goals:
-                last_checkin = goal.get('last_checkin')
-                if last_checkin:
-                    last_date = datetime.strptime(last_checkin, '%Y-%m-%d').date()
-                    if last_date <= three_days_ago:
-                        # Generate chart (simplified history)
-                        history = []  # Can be enhanced with actual DB query
-                        chart_buf = create_3day_feedback_chart(chat_id, goal, history, type='goal')
-                        
-                        # AI feedback
-                        ai_feedback = generate_3day_feedback(goal, type='goal')
-                        
-                        caption = f"""
+            try:
+                goals = user['goals']
+                habits = user['habits']
+                
+                # Check goals
+                for goal in goals:
+                    last_checkin = goal.get('last_checkin')
+                    if last_checkin:
+                        last_date = datetime.strptime(last_checkin, '%Y-%m-%d').date()
+                        if last_date <= three_days_ago:
+                            history = history_to_list(histories.get((chat_id, 'goal', goal['id']), 0), HISTORY_DAYS)
+                            chart_args = (goal['goal'], history_days, history, 'goal')
+                            
+                            # AI feedback
+                            ai_feedback = await generate_3day_feedback_async(goal, type='goal')
+                            
+                            caption = f"""
 💭 **3-Day Pattern Alert**
 
 **Goal:** {goal['goal']}
@@ -155,26 +82,26 @@ async def check_3day_patterns(context):
 
 Let's get back on track! 🎯
 """
-                        
-                        await context.bot.send_photo(
-                            chat_id=chat_id,
-                            photo=chart_buf,
-                            caption=caption,
-                            parse_mode='Markdown'
-                        )
-                        alert_count += 1
-            
-            # Check habits (similar)
-            for habit in habits:
-                last_completed = habit.get('last_completed')
-                if last_completed:
-                    last_date = datetime.strptime(last_completed, '%Y-%m-%d').date()
-                    if last_date <= three_days_ago:
-                        history = []
-                        chart_buf = create_3day_feedback_chart(chat_id, habit, history, type='habit')
-                        ai_feedback = generate_3day_feedback(habit, type='habit')
-                        
-                        caption = f"""
+                            
+                            await send_chart(
+                                context.bot, chat_id, 'three_day', chart_args,
+                                caption=caption,
+                                parse_mode='Markdown',
+                                rate_limit_args={'priority': 'report'}
+                            )
+                            alert_count += 1
+                
+                # Check habits (similar)
+                for habit in habits:
+                    last_completed = habit.get('last_completed')
+                    if last_completed:
+                        last_date = datetime.strptime(last_completed, '%Y-%m-%d').date()
+                        if last_date <= three_days_ago:
+                            history = history_to_list(histories.get((chat_id, 'habit', habit['id']), 0), HISTORY_DAYS)
+                            chart_args = (habit['habit'], history_days, history, 'habit')
+                            ai_feedback = await generate_3day_feedback_async(habit, type='habit')
+                            
+                            caption = f"""
 💭 **3-Day Pattern Alert**
 
 **Habit:** {habit['habit']}
@@ -183,37 +110,34 @@ Let's get back on track! 🎯
 
 Small steps matter! 💪
 """
-                        
-                        await context.bot.send_photo(
-                            chat_id=chat_id,
-                            photo=chart_buf,
-                            caption=caption,
-                            parse_mode='Markdown'
-                        )
-                        alert_count += 1
-                        
-        except Exception as e:
-            print(f"❌ Error checking patterns for {chat_id}: {e}")
+                            
+                            await send_chart(
+                                context.bot, chat_id, 'three_day', chart_args,
+                                caption=caption,
+                                parse_mode='Markdown',
+                                rate_limit_args={'priority': 'report'}
+                            )
+                            alert_count += 1
+                            
+            except Exception as e:
+                print(f"❌ Error checking patterns for {chat_id}: {e}")
     
     print(f"💭 Pattern alerts sent: {alert_count}")
 
 # ===== JOB: Daily Tracking =====
 async def track_all_users_daily(context):
-    """Track daily progress for all users (Daily at 11:59 PM)"""
-    print("📊 Tracking daily progress for all users...")
+    """Snapshot the day that just ended for users past local midnight (hourly)"""
     
-    data = load_data()
-    count = 0
-    
-    for chat_id_str in data.keys():
-        chat_id = int(chat_id_str)
-        try:
-            track_daily_progress(chat_id)
-            count += 1
-        except Exception as e:
-            print(f"❌ Error tracking {chat_id}: {e}")
-    
-    print(f"📊 Daily tracking complete: {count} users")
+    try:
+        result = await run_sync(track_all_daily_progress)
+        if not result['statements']:
+            return
+        print(
+            f"📊 Daily tracking complete: {result['rows']} users "
+            f"({result['statements']} statements, {result['elapsed']:.2f}s)"
+        )
+    except Exception as e:
+        print(f"❌ Error tracking daily progress: {e}")
 
 # Export all job functions
 def get_scheduled_jobs():
@@ -239,11 +163,11 @@ def get_scheduled_jobs():
             'time': time(hour=18, minute=0, tzinfo=pytz.UTC),
             'name': '3day_patterns'
         },
-        # Daily tracking at 11:59 PM UTC
+        # Daily tracking every hour at :05, for the timezones whose day just ended
         {
             'callback': track_all_users_daily,
-            'trigger': 'daily',
-            'time': time(hour=23, minute=59, tzinfo=pytz.UTC),
+            'trigger': 'hourly',
+            'minute': 5,
             'name': 'daily_tracking'
         }
     ]
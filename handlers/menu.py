@@ -7,7 +7,7 @@ async def menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     # AI generates menu description
     menu_prompt = "Briefly explain the main features available: goals, habits, emotional support, focus help, advice, and check-ins. Keep it concise."
-    ai_description = chat_with_ai(menu_prompt, chat_id)
+    ai_description = await chat_with_ai(menu_prompt, chat_id, cache=True)
     
     keyboard = [
         [InlineKeyboardButton("🎯 Goals", callback_data="goals"),
@@ -174,3 +174,51 @@ async def show_progress(update: Update, context: ContextTypes.DEFAULT_TYPE):
         parse_mode='Markdown',
         reply_markup=get_main_menu_keyboard()
     )
+
+
+# ========== FREE CHAT ==========
+
+def _button_labels():
+    from services.ui_service import (
+        get_main_menu_keyboard, get_goals_menu_keyboard, get_habits_menu_keyboard, get_settings_menu_keyboard
+    )
+    keyboards = (get_main_menu_keyboard(), get_goals_menu_keyboard(), get_habits_menu_keyboard(), get_settings_menu_keyboard())
+    return frozenset(button.text for keyboard in keyboards for row in keyboard.keyboard for button in row)
+
+# Every reply-keyboard label - button presses are never free chat
+MENU_BUTTONS = _button_labels()
+
+_conversations = None   # ConversationHandlers, collected on the first message (all are registered by then)
+
+def _in_conversation(update, application):
+    """True if a ConversationHandler (onboarding, add goal, mood, ...) will take this message"""
+    global _conversations
+    if _conversations is None:
+        from telegram.ext import ConversationHandler
+        _conversations = [handler for handlers in application.handlers.values()
+                          for handler in handlers if isinstance(handler, ConversationHandler)]
+    return any(conversation.check_update(update) for conversation in _conversations)
+
+async def free_chat(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Typed messages that aren't buttons or conversation steps: AI reply, streamed in"""
+    text = update.message.text
+    # Cheap label check first; the conversation check only for text that isn't a button
+    if text in MENU_BUTTONS or _in_conversation(update, context.application):
+        return
+    
+    from services.ai_response import chat_with_ai
+    from services.live_message import LiveMessage, STREAM_REPLIES
+    from services.ui_service import get_main_menu_keyboard
+    chat_id = update.effective_chat.id
+    
+    if STREAM_REPLIES:
+        # Show the reply as it streams in instead of after the whole completion
+        live = LiveMessage(update.message, reply_markup=get_main_menu_keyboard())
+        response = await chat_with_ai(text, chat_id, supersede=True, on_text=live.update)
+        await live.finish(response)
+        return
+    
+    response = await chat_with_ai(text, chat_id, supersede=True)
+    if response is None:
+        return  # user already moved on to a newer message
+    await update.message.reply_text(response, reply_markup=get_main_menu_keyboard())
@@ -63,7 +63,7 @@ async def receive_feeling(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_name = user.get('name', 'friend') if user else 'friend'
     
     prompt = f"User {user_name} is feeling {mood}. {feeling if feeling else 'No details.'} Give short empathetic response (1-2 sentences)."
-    ai_response = chat_with_ai(prompt, chat_id)
+    ai_response = await chat_with_ai(prompt, chat_id)
     
     await update.message.reply_text(
         f"💚 **Mood logged!**\n\n"
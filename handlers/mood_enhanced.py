@@ -7,7 +7,7 @@ from telegram.ext import (
     MessageHandler,
     filters
 )
-from database.mood_db import save_mood  # Use your existing function!
+from database.async_db import run_sync, save_mood  # Use your existing function!
 from services.limit_checker import can_check_mood, increment_mood_check
 from services.ui_service import get_main_menu_keyboard
 
@@ -29,7 +29,7 @@ async def check_mood_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     chat_id = update.effective_chat.id
     
     # Check limit FIRST
-    allowed, error_msg = can_check_mood(chat_id)
+    allowed, error_msg = await run_sync(can_check_mood, chat_id)
     
     if not allowed:
         # BLOCKED - Show premium message
@@ -73,7 +73,7 @@ async def receive_mood_rating(update: Update, context: ContextTypes.DEFAULT_TYPE
     mood_info = MOOD_OPTIONS[rating_text]
     
     # Save to database using YOUR existing function
-    success = save_mood(
+    success = await save_mood(
         chat_id=chat_id,
         mood=mood_info['mood_type'],
         feeling_notes=mood_info['name'],
@@ -82,7 +82,7 @@ async def receive_mood_rating(update: Update, context: ContextTypes.DEFAULT_TYPE
     
     if success:
         # Increment mood check counter for free users
-        increment_mood_check(chat_id)
+        await run_sync(increment_mood_check, chat_id)
         
         # Personalized response based on mood
         responses = {
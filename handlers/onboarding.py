@@ -260,7 +260,7 @@ async def finish_onboarding(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if eod_time:
         try:
             from bot import schedule_eod_summary
-            schedule_eod_summary(context.application, chat_id, eod_time)
+            await schedule_eod_summary(context.application, chat_id, eod_time)
             print(f"✅ EOD scheduled for {name} at {eod_time}")
         except Exception as e:
             print(f"⚠️ Could not schedule EOD: {e}")
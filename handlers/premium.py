@@ -1,7 +1,7 @@
 
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes, CallbackQueryHandler, CommandHandler
-from database.premium_db import is_premium_user, activate_demo_trial
+from database.premium_db import is_premium_user, activate_demo_trial, cancel_premium
 
 async def premium_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show premium features and free trial"""
@@ -75,28 +75,20 @@ async def cancel_premium_command(update: Update, context: ContextTypes.DEFAULT_T
     """Cancel premium (for testing)"""
     chat_id = update.effective_chat.id
     
-    from database.premium_db import get_db_connection
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    if not cancel_premium(chat_id):
+        await update.message.reply_text("❌ Database connection failed. Please try again.")
+        return
     
-    try:
-        cursor.execute('DELETE FROM premium_users WHERE chat_id = %s', (chat_id,))
-        cursor.execute('DELETE FROM premium_subscriptions WHERE chat_id = %s', (chat_id,))
-        conn.commit()
-        
-        await update.message.reply_text(
-            "✅ **Premium Cancelled**\n\n"
-            "You're now a FREE user.\n\n"
-            "Free limits:\n"
-            "• 3 goals max\n"
-            "• 3 habits max\n"
-            "• 2 mood checks/day\n\n"
-            "To try premium: /premium",
-            parse_mode='Markdown'
-        )
-    finally:
-        cursor.close()
-        conn.close()
+    await update.message.reply_text(
+        "✅ **Premium Cancelled**\n\n"
+        "You're now a FREE user.\n\n"
+        "Free limits:\n"
+        "• 3 goals max\n"
+        "• 3 habits max\n"
+        "• 2 mood checks/day\n\n"
+        "To try premium: /premium",
+        parse_mode='Markdown'
+    )
 
 
 def get_premium_handlers():
@@ -12,7 +12,7 @@ from services.ui_service import (
     get_settings_menu_keyboard,
     render_main_menu
 )
-from services.ai_response import chat_with_ai
+from services.ai_response import pooled_reply
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Start command - show main menu"""
@@ -97,7 +97,7 @@ async def boost_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_name = user.get('name', 'friend') if user else 'friend'
     
     prompt = f"Give {user_name} a powerful, motivational message to boost their day. Be energetic and inspiring. 2-3 sentences."
-    motivation = chat_with_ai(prompt, chat_id)
+    motivation = await pooled_reply('boost', prompt, chat_id, slots={'name': user_name})
     
     await update.message.reply_text(
         f"💪 **Daily Boost**\n\n{motivation}",
@@ -52,43 +52,38 @@ async def handle_timezone_selection(update: Update, context: ContextTypes.DEFAUL
     timezone = query.data.replace('tz_', '')
     chat_id = update.effective_chat.id
     
-    # Update in database
-    from database.connection import get_db_connection
-    connection = get_db_connection()
-    if connection:
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""
-                UPDATE users SET timezone = %s WHERE chat_id = %s
-            """, (timezone, chat_id))
-            connection.commit()
-            
-            timezone_name = TIMEZONES.get(timezone, timezone)
-            
-            from services.ui_service import get_main_menu_keyboard
-            
-            await query.edit_message_text(
-                f"✅ **Timezone Updated!**\n\n"
-                f"Your timezone: {timezone_name}\n\n"
-                f"Daily summaries and reminders will be sent according to this timezone.",
-                parse_mode='Markdown'
-            )
-            
-            # Send menu
-            await context.bot.send_message(
-                chat_id=chat_id,
-                text="⚙️ Settings updated!",
-                reply_markup=get_main_menu_keyboard()
-            )
-            
-        except Exception as e:
-            print(f"Error updating timezone: {e}")
-            await query.edit_message_text("❌ Error updating timezone. Please try again.")
-        finally:
-            cursor.close()
-            connection.close()
-    else:
-        await query.edit_message_text("❌ Database connection error.")
+    # Update in database (keeps the user cache coherent)
+    from database.async_db import set_user_timezone, get_user_tzinfo
+    from services.reminder_engine import reminder_engine
+    try:
+        if not await set_user_timezone(chat_id, timezone):
+            await query.edit_message_text("❌ Database connection error.")
+            return
+        
+        # Keep reminders at the same local times in the new timezone
+        reminder_engine.reschedule_chat(chat_id, await get_user_tzinfo(chat_id))
+        
+        timezone_name = TIMEZONES.get(timezone, timezone)
+        
+        from services.ui_service import get_main_menu_keyboard
+        
+        await query.edit_message_text(
+            f"✅ **Timezone Updated!**\n\n"
+            f"Your timezone: {timezone_name}\n\n"
+            f"Daily summaries and reminders will be sent according to this timezone.",
+            parse_mode='Markdown'
+        )
+        
+        # Send menu
+        await context.bot.send_message(
+            chat_id=chat_id,
+            text="⚙️ Settings updated!",
+            reply_markup=get_main_menu_keyboard()
+        )
+        
+    except Exception as e:
+        print(f"Error updating timezone: {e}")
+        await query.edit_message_text("❌ Error updating timezone. Please try again.")
 
 def get_timezone_handlers():
     """Return timezone handlers"""
@@ -1 +0,0 @@
-# Jobs module
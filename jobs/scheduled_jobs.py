@@ -1,8 +0,0 @@
-"""
-Scheduled Jobs Module
-Background tasks (empty for now - add later)
-"""
-
-def get_scheduled_jobs():
-    """Return empty list (no scheduled jobs yet)"""
-    return []
@@ -0,0 +1,80 @@
+"""
+Create completion_history and backfill it from existing goals/habits
+Each current streak becomes a run of completed days ending at the last
+check-in - safe to run more than once (bits are OR-ed in)
+"""
+import mysql.connector
+import os
+from datetime import timedelta
+
+config = {
+    'host': os.getenv('MYSQLHOST', 'localhost'),
+    'port': int(os.getenv('MYSQLPORT', 3306)),
+    'user': os.getenv('MYSQLUSER', 'root'),
+    'password': os.getenv('MYSQLPASSWORD', ''),
+    'database': os.getenv('MYSQL_DATABASE', 'railway')
+}
+
+WORD_BITS = 64
+
+SOURCES = [
+    # (kind, item table, item id column, last done column)
+    ('goal', 'goals', 'goal_id', 'last_checkin'),
+    ('habit', 'habits', 'habit_id', 'last_completed'),
+]
+
+def streak_words(last_done, streak):
+    """{word: bits} for `streak` consecutive days ending on last_done"""
+    words = {}
+    for offset in range(max(streak, 1)):
+        index = (last_done - timedelta(days=offset)).toordinal()
+        word = index // WORD_BITS
+        words[word] = words.get(word, 0) | (1 << (index % WORD_BITS))
+    return words
+
+try:
+    print("🔧 Connecting to MySQL...\n")
+    conn = mysql.connector.connect(**config)
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS completion_history (
+            chat_id BIGINT NOT NULL,
+            kind ENUM('goal', 'habit') NOT NULL,
+            item_id INT NOT NULL,
+            word INT NOT NULL,
+            bits BIGINT UNSIGNED NOT NULL DEFAULT 0,
+            PRIMARY KEY (chat_id, kind, item_id, word),
+            FOREIGN KEY (chat_id) REFERENCES users(chat_id) ON DELETE CASCADE
+        )
+    """)
+    conn.commit()
+    print("✅ completion_history table ready")
+
+    for kind, table, id_column, last_column in SOURCES:
+        print(f"🔧 Backfilling {kind} history from {table}...")
+        cursor.execute(f"""
+            SELECT chat_id, {id_column}, {last_column}, streak
+            FROM {table} WHERE {last_column} IS NOT NULL
+        """)
+
+        rows = []
+        for chat_id, item_id, last_done, streak in cursor.fetchall():
+            for word, bits in streak_words(last_done, streak or 0).items():
+                rows.append((chat_id, kind, item_id, word, bits))
+
+        for start in range(0, len(rows), 1000):
+            cursor.executemany("""
+                INSERT INTO completion_history (chat_id, kind, item_id, word, bits)
+                VALUES (%s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE bits = bits | VALUES(bits)
+            """, rows[start:start + 1000])
+            conn.commit()
+        print(f"✅ Wrote {len(rows)} {kind} history words")
+
+    cursor.close()
+    conn.close()
+    print("\n✅ Migration complete!")
+
+except Exception as e:
+    print(f"❌ Error: {e}")
@@ -0,0 +1,65 @@
+"""
+Add per-user goal/habit ID counters to users table
+Backfills them from existing goals/habits - safe to run more than once
+"""
+import mysql.connector
+import os
+
+config = {
+    'host': os.getenv('MYSQLHOST', 'localhost'),
+    'port': int(os.getenv('MYSQLPORT', 3306)),
+    'user': os.getenv('MYSQLUSER', 'root'),
+    'password': os.getenv('MYSQLPASSWORD', ''),
+    'database': os.getenv('MYSQL_DATABASE', 'railway')
+}
+
+COUNTERS = [
+    # (counter column, item table, item id column)
+    ('goal_seq', 'goals', 'goal_id'),
+    ('habit_seq', 'habits', 'habit_id'),
+]
+
+def column_exists(cursor, table, column):
+    """Check if column exists in table"""
+    cursor.execute("""
+        SELECT COUNT(*)
+        FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = %s
+        AND TABLE_NAME = %s
+        AND COLUMN_NAME = %s
+    """, (config['database'], table, column))
+    return cursor.fetchone()[0] > 0
+
+try:
+    print("🔧 Connecting to MySQL...\n")
+    conn = mysql.connector.connect(**config)
+    cursor = conn.cursor()
+
+    for counter, table, id_column in COUNTERS:
+        if column_exists(cursor, 'users', counter):
+            print(f"✅ users.{counter} already exists")
+        else:
+            print(f"🔧 Adding users.{counter}...")
+            cursor.execute(f"ALTER TABLE users ADD COLUMN {counter} INT NOT NULL DEFAULT 0")
+            conn.commit()
+            print(f"✅ Added users.{counter}")
+
+        # Backfill: counter = highest ID already used (never move it backwards)
+        print(f"🔧 Backfilling users.{counter} from {table}...")
+        cursor.execute(f"""
+            UPDATE users u
+            JOIN (
+                SELECT chat_id, MAX({id_column}) AS max_id
+                FROM {table} GROUP BY chat_id
+            ) t ON t.chat_id = u.chat_id
+            SET u.{counter} = GREATEST(u.{counter}, t.max_id)
+        """)
+        conn.commit()
+        print(f"✅ Backfilled {cursor.rowcount} users")
+
+    cursor.close()
+    conn.close()
+    print("\n✅ Migration complete!")
+
+except Exception as e:
+    print(f"❌ Error: {e}")
@@ -14,7 +14,7 @@ async def schedule_daily_reminders():
             for chat_id, user in data.items():
                 try:
                     if "goal" in user:
-                        mot = get_motivation(user['goal'])
+                        mot = await get_motivation(user['goal'], int(chat_id))
                         await bot.send_message(
                             chat_id, 
                             f"🎯 **Goal Reminder:**\n{user['goal']}\n\n💪 {mot}",
@@ -22,7 +22,7 @@ async def schedule_daily_reminders():
                         )
 
                     if "habit" in user and user.get("habit_days_left", 0) > 0:
-                        mot = get_motivation(user['habit'])
+                        mot = await get_motivation(user['habit'], int(chat_id), kind='habit')
                         streak = user.get("habit_streak", 0)
                         await bot.send_message(
                             chat_id, 
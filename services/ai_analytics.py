@@ -0,0 +1,126 @@
+"""
+AI Analytics
+Short AI write-ups for weekly reports and 3-day pattern alerts
+Uses OpenRouter; falls back to data-based text when the API is unavailable
+"""
+
+from openai import OpenAI
+from config import OPENROUTER_API_KEY
+from services.ai_batch import insight_batch
+
+client = OpenAI(
+    base_url="https://openrouter.ai/api/v1",
+    api_key=OPENROUTER_API_KEY,
+)
+
+SYSTEM_PROMPT = "You are a warm, practical coach. Reply in plain text, no markdown."
+
+
+def _completion_rate(stats):
+    """Percent of goal/habit check-ins completed in weekly stats"""
+    if not stats:
+        return 0
+    done = (stats.get('goals_completed') or 0) + (stats.get('habits_completed') or 0)
+    total = (stats.get('total_goals') or 0) + (stats.get('total_habits') or 0)
+    return done / total * 100 if total else 0
+
+
+def _ask(prompt, max_tokens=150, timeout=30):
+    response = client.chat.completions.create(
+        model="anthropic/claude-3.5-sonnet",
+        messages=[
+            {
+                "role": "system",
+                "content": SYSTEM_PROMPT
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        temperature=0.7,
+        max_tokens=max_tokens,
+        timeout=timeout,
+    )
+    return response.choices[0].message.content.strip().replace('**', '').replace('*', '')
+
+
+def generate_weekly_analysis(chat_id, stats, user_name):
+    """2-3 sentence insight on the user's week"""
+    rate = _completion_rate(stats)
+    prompt = f"""Write a 2-3 sentence weekly progress insight for {user_name}.
+
+Completion rate: {rate:.0f}%
+Goals completed: {stats.get('goals_completed') or 0}/{stats.get('total_goals') or 0}
+Habits completed: {stats.get('habits_completed') or 0}/{stats.get('total_habits') or 0}
+
+Acknowledge the result honestly, name one pattern, and give one concrete tip for next week."""
+
+    try:
+        return _ask(prompt)
+    except Exception as e:
+        print(f"AI Analytics Error: {e}")
+        return weekly_fallback(stats, user_name)
+
+
+WEEKLY_BATCH_INSTRUCTIONS = (
+    "For each user below, write a 2-3 sentence weekly progress insight addressed to them by name. "
+    "Acknowledge the result honestly, name one pattern, and give one concrete tip for next week."
+)
+
+
+def weekly_summary(stats, user_name):
+    """One-line stats for a batched weekly insight"""
+    return (f"{user_name} - completion {_completion_rate(stats):.0f}%, "
+            f"goals {stats.get('goals_completed') or 0}/{stats.get('total_goals') or 0}, "
+            f"habits {stats.get('habits_completed') or 0}/{stats.get('total_habits') or 0}")
+
+
+async def generate_weekly_analysis_batch(users, gateway=None):
+    """
+    Weekly insights for [(chat_id, stats, user_name)] in one AI call.
+    Returns {chat_id: insight}; users missing from it need weekly_fallback.
+    """
+    entries = [(chat_id, weekly_summary(stats, user_name)) for chat_id, stats, user_name in users]
+    return await insight_batch(entries, WEEKLY_BATCH_INSTRUCTIONS, SYSTEM_PROMPT, gateway=gateway)
+
+
+def weekly_fallback(stats, user_name):
+    """Data-based weekly insight when AI is unavailable"""
+    rate = _completion_rate(stats)
+    if rate >= 80:
+        return f"{user_name}, {rate:.0f}% this week is outstanding consistency. Keep the same routine and protect it."
+    if rate >= 50:
+        return f"{user_name}, {rate:.0f}% shows real momentum. Pick the task you skipped most and do it first next week."
+    return f"{user_name}, every week is a fresh start. Choose one small task and make it non-negotiable tomorrow."
+
+
+def _3day_prompt(item, type):
+    name = item.get('goal') if type == 'goal' else item.get('habit')
+    return f"""The user hasn't checked in on their {type} "{name}" for 3 days (streak was {item.get('streak', 0)}).
+Write 2 short, kind sentences: normalise the slip and suggest one tiny step to restart today."""
+
+
+def _3day_fallback(item, type):
+    name = item.get('goal') if type == 'goal' else item.get('habit')
+    return f"Three quiet days happen to everyone. Do just 5 minutes of \"{name}\" today to restart the chain."
+
+
+def generate_3day_feedback(item, type='goal'):
+    """Gentle nudge for a goal/habit untouched for 3+ days"""
+    try:
+        return _ask(_3day_prompt(item, type), max_tokens=100)
+    except Exception as e:
+        print(f"AI Analytics Error: {e}")
+        return _3day_fallback(item, type)
+
+
+async def generate_3day_feedback_async(item, type='goal'):
+    """generate_3day_feedback through the async AI gateway (for jobs on the event loop)"""
+    from services.ai_gateway import ai_gateway
+    text = await ai_gateway.ask(
+        [{"role": "system", "content": SYSTEM_PROMPT}, {"role": "user", "content": _3day_prompt(item, type)}],
+        _3day_fallback(item, type),
+        max_tokens=100,
+    )
+    return text.replace('**', '').replace('*', '')
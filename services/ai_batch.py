@@ -0,0 +1,137 @@
+"""
+AI Batch Insights
+Many users' short write-ups from one completion: each user goes in as a
+one-line stat summary under a short id (u1, u2, ...) and the model answers
+with a JSON object of id -> insight. Used by the weekly reports, which
+otherwise make one call per user, and by the (not yet scheduled)
+psychology insights.
+
+Parsing is forgiving - code fences, chatter around the JSON, a list
+instead of an object, or a reply cut off by max_tokens (complete
+"u3": "..." lines are still recovered). Users missing from the result are
+simply not in the returned dict; callers fill them with their rule-based
+fallback.
+"""
+
+import asyncio
+import json
+import os
+import re
+
+AI_BATCH_SIZE = int(os.getenv('AI_BATCH_SIZE', 10))
+AI_BATCH_CONCURRENCY = int(os.getenv('AI_BATCH_CONCURRENCY', 4))
+AI_BATCH_TIMEOUT = float(os.getenv('AI_BATCH_TIMEOUT', 90))
+AI_BATCH_TOKENS_PER_USER = int(os.getenv('AI_BATCH_TOKENS_PER_USER', 120))
+
+MIN_INSIGHT = 20
+MAX_INSIGHT = 800
+
+_LINE = re.compile(r'^\s*[\[{,]?\s*"?(u\d+)"?\s*[:=\-–]\s*"?(.*?)"?\s*,?\s*[\]}]?\s*$')
+
+
+def _one_line(text):
+    return ' '.join(str(text).split())
+
+
+def _clean(text):
+    if not isinstance(text, str):
+        return None
+    text = text.replace('**', '').replace('*', '').strip()
+    return text if MIN_INSIGHT <= len(text) <= MAX_INSIGHT else None
+
+
+def batch_prompt(summaries, instructions):
+    """summaries: [(id, one-line summary)]"""
+    lines = '\n'.join(f"{uid}: {_one_line(summary)}" for uid, summary in summaries)
+    return f"""{instructions}
+
+Users:
+{lines}
+
+Reply with only a JSON object mapping each id to its insight, e.g. {{"u1": "...", "u2": "..."}}.
+Plain text inside the strings, no markdown."""
+
+
+def parse_batch_reply(text, ids):
+    """{id: insight} for every id with a usable insight in the model's reply"""
+    text = re.sub(r'```(?:json)?', '', text or '')
+    data = None
+    # Outermost JSON value first: an object, or a list of objects
+    pairs = sorted((('{', '}'), ('[', ']')), key=lambda pair: (text.find(pair[0]) == -1, text.find(pair[0])))
+    for opener, closer in pairs:
+        start, end = text.find(opener), text.rfind(closer)
+        if start != -1 and end > start:
+            try:
+                data = json.loads(text[start:end + 1])
+                break
+            except ValueError:
+                continue
+
+    found = {}
+    if isinstance(data, dict) and isinstance(data.get('insights'), (dict, list)):
+        data = data['insights']
+    if isinstance(data, list):
+        # [{"id": "u1", "insight": "..."}]
+        for item in data:
+            if isinstance(item, dict):
+                found[str(item.get('id'))] = item.get('insight') or item.get('text')
+    elif isinstance(data, dict):
+        for uid, value in data.items():
+            found[uid] = (value.get('insight') or value.get('text')) if isinstance(value, dict) else value
+    else:
+        # Not valid JSON (e.g. cut off by max_tokens): take the complete "uN": "..." lines
+        for line in text.splitlines():
+            match = _LINE.match(line)
+            if match:
+                found[match.group(1)] = match.group(2).replace('\\"', '"')
+
+    results = {}
+    for uid in ids:
+        insight = _clean(found.get(uid))
+        if insight:
+            results[uid] = insight
+    return results
+
+
+async def insight_batch(entries, instructions, system_prompt, gateway=None, timeout=AI_BATCH_TIMEOUT,
+                        tokens_per_user=AI_BATCH_TOKENS_PER_USER):
+    """
+    One completion for entries [(key, one-line summary)] -> {key: insight}.
+    Keys that failed to parse (or the whole batch, on an API error) are left
+    out for the caller's fallback.
+    """
+    if gateway is None:
+        from services.ai_gateway import ai_gateway as gateway
+    ids = {f"u{n}": key for n, (key, _) in enumerate(entries, 1)}
+    prompt = batch_prompt([(uid, summary) for uid, (_, summary) in zip(ids, entries)], instructions)
+    try:
+        text = await gateway.complete(
+            [{"role": "system", "content": system_prompt}, {"role": "user", "content": prompt}],
+            temperature=0.7,
+            max_tokens=tokens_per_user * len(entries) + 50,
+            timeout=timeout,
+        )
+    except Exception as e:
+        print(f"⚠️ AI batch of {len(entries)} failed: {str(e) or type(e).__name__}")
+        return {}
+    parsed = parse_batch_reply(text, list(ids))
+    if len(parsed) < len(ids):
+        print(f"⚠️ AI batch: {len(ids) - len(parsed)}/{len(ids)} insights unparseable, using fallbacks")
+    return {ids[uid]: insight for uid, insight in parsed.items()}
+
+
+async def batch_insights(entries, instructions, system_prompt, gateway=None, batch_size=AI_BATCH_SIZE,
+                         concurrency=AI_BATCH_CONCURRENCY):
+    """insight_batch over any number of entries, batch_size per call, concurrency calls at a time"""
+    slots = asyncio.Semaphore(concurrency)
+
+    async def run(batch):
+        async with slots:
+            return await insight_batch(batch, instructions, system_prompt, gateway=gateway)
+
+    size = max(batch_size, 1)
+    batches = [entries[i:i + size] for i in range(0, len(entries), size)]
+    results = {}
+    for found in await asyncio.gather(*(run(batch) for batch in batches)):
+        results.update(found)
+    return results
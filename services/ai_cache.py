@@ -0,0 +1,147 @@
+"""
+AI Response Cache
+Replies to fixed and templated prompts ("Daily Boost", the menu blurb,
+goal/habit celebrations) are reused across users instead of calling the
+API every time.
+
+- Key: the prompt normalised (case, whitespace, trailing punctuation) with
+  per-user slot values - user name, goal name - replaced by {slot}.
+- Each key keeps a pool of up to AI_CACHE_VARIANTS different replies; a hit
+  picks one at random, so users don't all get the same text. Until the
+  pool is full, requests go to the API and add a variant.
+- Variants expire after AI_CACHE_TTL seconds; at most AI_CACHE_MAX_KEYS
+  keys are kept (least recently used dropped).
+
+Slot values in a stored reply are swapped back for the current user's, so
+"Great job, Anna!" is served to Ben as "Great job, Ben!".
+"""
+
+import os
+import random
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+
+AI_CACHE_TTL = float(os.getenv('AI_CACHE_TTL', 6 * 3600))
+AI_CACHE_VARIANTS = int(os.getenv('AI_CACHE_VARIANTS', 5))
+AI_CACHE_MAX_KEYS = int(os.getenv('AI_CACHE_MAX_KEYS', 5000))
+
+
+def _fill_slots(text, slots):
+    for name, value in slots.items():
+        text = text.replace('{' + name + '}', str(value))
+    return text
+
+
+def _cut_slots(text, slots):
+    """Replace slot values with {slot} (longest first, whole words, any case)"""
+    for name, value in sorted(slots.items(), key=lambda item: -len(str(item[1]))):
+        value = str(value).strip()
+        if value:
+            text = re.sub(rf'(?<!\w){re.escape(value)}(?!\w)', '{' + name + '}', text, flags=re.IGNORECASE)
+    return text
+
+
+def normalize_prompt(prompt, slots=None):
+    text = unicodedata.normalize('NFKC', prompt)
+    if slots:
+        text = _cut_slots(text, slots)
+    text = re.sub(r'\s+', ' ', text).strip().lower()
+    return text.rstrip('.!?… ')
+
+
+class AIResponseCache:
+    """normalised prompt -> pool of (reply with {slots}, stored_at)"""
+
+    def __init__(self, ttl=AI_CACHE_TTL, variants=AI_CACHE_VARIANTS, max_keys=AI_CACHE_MAX_KEYS):
+        self.ttl = ttl
+        self.variants = variants
+        self.max_keys = max_keys
+        self._pools = OrderedDict()
+        self._pending = {}               # key -> API calls in flight that will add a variant
+        self._stats = {'hits': 0, 'misses': 0, 'stored': 0, 'expired': 0, 'evicted': 0}
+
+    def _fresh(self, key):
+        pool = self._pools.get(key)
+        if not pool:
+            return []
+        now = time.monotonic()
+        fresh = [entry for entry in pool if now - entry[1] < self.ttl]
+        if len(fresh) != len(pool):
+            self._stats['expired'] += len(pool) - len(fresh)
+            if fresh:
+                self._pools[key] = fresh
+            else:
+                del self._pools[key]
+        return fresh
+
+    def get(self, key, slots=None):
+        """A cached reply for key (slots filled in), or None if the caller should call the API"""
+        fresh = self._fresh(key)
+        # Serve from the pool once it is full - or will be, counting calls already in flight
+        if fresh and len(fresh) + self._pending.get(key, 0) >= self.variants:
+            self._pools.move_to_end(key)
+            self._stats['hits'] += 1
+            return _fill_slots(random.choice(fresh)[0], slots or {})
+        self._stats['misses'] += 1
+        self._pending[key] = self._pending.get(key, 0) + 1
+        return None
+
+    def put(self, key, reply, slots=None):
+        """Add the API's reply to key's pool (call after a miss)"""
+        self._release(key)
+        template = _cut_slots(reply, slots) if slots else reply
+        pool = self._fresh(key)
+        if len(pool) >= self.variants or any(template == text for text, _ in pool):
+            return
+        self._pools[key] = pool + [(template, time.monotonic())]
+        self._pools.move_to_end(key)
+        self._stats['stored'] += 1
+        while len(self._pools) > self.max_keys:
+            self._pools.popitem(last=False)
+            self._stats['evicted'] += 1
+
+    def discard(self, key):
+        """The API call after a miss failed - nothing to store"""
+        self._release(key)
+
+    def _release(self, key):
+        pending = self._pending.get(key, 0) - 1
+        if pending > 0:
+            self._pending[key] = pending
+        else:
+            self._pending.pop(key, None)
+
+    def get_stats(self):
+        stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups * 100 if lookups else 0.0
+        stats['keys'] = len(self._pools)
+        stats['variants'] = sum(len(pool) for pool in self._pools.values())
+        return stats
+
+
+ai_cache = AIResponseCache()
+
+
+async def cached_reply(prompt, fetch, slots=None, cache=ai_cache):
+    """
+    Cached reply for prompt, else await fetch() and cache its result.
+    fetch returns (reply, cacheable); fallbacks and superseded calls come
+    back with cacheable=False and are returned without being stored.
+    """
+    key = normalize_prompt(prompt, slots)
+    reply = cache.get(key, slots)
+    if reply is not None:
+        return reply
+    try:
+        reply, cacheable = await fetch()
+    except BaseException:
+        cache.discard(key)
+        raise
+    if cacheable:
+        cache.put(key, reply, slots)
+    else:
+        cache.discard(key)
+    return reply
@@ -0,0 +1,202 @@
+"""
+AI Gateway
+One async OpenRouter client for handlers: a shared httpx connection pool,
+a per-call timeout, bounded concurrency and cancellation. Calls never
+block the event loop, so one slow completion doesn't hold up other users.
+
+    text = await ai_gateway.ask(messages, fallback="...", chat_id=chat_id)
+
+ask() never raises for API problems - it returns `fallback` on errors and
+timeouts, like the old chat_with_ai. With chat_id, a newer call for the
+same chat cancels the older one still waiting (the user moved on); the
+superseded call returns None so the handler can skip its reply.
+
+With on_text, the completion is streamed and on_text(text_so_far) is
+called as tokens arrive (services.live_message shows them in Telegram).
+"""
+
+import asyncio
+import os
+import time
+
+import httpx
+from openai import AsyncOpenAI, APITimeoutError
+
+from config import OPENROUTER_API_KEY
+
+AI_BASE_URL = os.getenv('AI_BASE_URL', 'https://openrouter.ai/api/v1')
+AI_MODEL = os.getenv('AI_MODEL', 'anthropic/claude-3.5-sonnet')
+AI_TIMEOUT = float(os.getenv('AI_TIMEOUT', 20))
+AI_CONCURRENCY = int(os.getenv('AI_CONCURRENCY', 32))
+AI_MAX_CONNECTIONS = int(os.getenv('AI_MAX_CONNECTIONS', 64))
+
+
+class AIGateway:
+    """Shared async client + concurrency limit + per-chat cancellation + metrics"""
+
+    def __init__(self, base_url=AI_BASE_URL, api_key=OPENROUTER_API_KEY, model=AI_MODEL,
+                 timeout=AI_TIMEOUT, concurrency=AI_CONCURRENCY, max_connections=AI_MAX_CONNECTIONS):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.model = model
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.max_connections = max_connections
+
+        self._client = None
+        self._slots = None
+        self._inflight = {}              # chat_id -> task of the newest call
+        self._superseded = set()
+        self._stats = {'calls': 0, 'ok': 0, 'errors': 0, 'timeouts': 0, 'fallbacks': 0,
+                       'cancelled': 0, 'latency_total_s': 0.0, 'latency_max_s': 0.0,
+                       'wait_total_s': 0.0, 'streams': 0, 'first_token_total_s': 0.0, 'truncated': 0}
+
+    # ===== LIFECYCLE =====
+    def _get_client(self):
+        if self._client is None:
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections),
+                timeout=httpx.Timeout(self.timeout, connect=5.0),
+            )
+            # No SDK retries: a retry would blow the per-call timeout; we fall back instead
+            self._client = AsyncOpenAI(base_url=self.base_url, api_key=self.api_key,
+                                       http_client=http_client, max_retries=0)
+            self._slots = asyncio.Semaphore(self.concurrency)
+        return self._client
+
+    async def close(self):
+        """Cancel pending calls and close the connection pool (post_shutdown)"""
+        for task in list(self._inflight.values()):
+            task.cancel()
+        self._inflight.clear()
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    # ===== CALLS =====
+    async def complete(self, messages, temperature=0.7, max_tokens=250, timeout=None, model=None):
+        """Completion text; raises on API errors and asyncio.TimeoutError"""
+        client = self._get_client()
+        timeout = timeout or self.timeout
+        queued = time.monotonic()
+        async with self._slots:
+            started = time.monotonic()
+            self._stats['wait_total_s'] += started - queued
+            response = await asyncio.wait_for(
+                client.chat.completions.create(
+                    model=model or self.model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                ),
+                max(timeout - (started - queued), 0.1)
+            )
+        elapsed = time.monotonic() - started
+        self._stats['latency_total_s'] += elapsed
+        self._stats['latency_max_s'] = max(self._stats['latency_max_s'], elapsed)
+        return response.choices[0].message.content.strip()
+
+    async def complete_stream(self, messages, on_text, temperature=0.7, max_tokens=250, timeout=None, model=None):
+        """
+        Streamed completion: on_text(text_so_far) on every new chunk, full text
+        at the end. If the stream breaks or times out after text has arrived,
+        the partial text is returned; before that it raises like complete().
+        """
+        client = self._get_client()
+        timeout = timeout or self.timeout
+        parts = []
+        queued = time.monotonic()
+        async with self._slots:
+            started = time.monotonic()
+            self._stats['wait_total_s'] += started - queued
+            self._stats['streams'] += 1
+
+            async def consume():
+                stream = await client.chat.completions.create(
+                    model=model or self.model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stream=True,
+                )
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if not delta:
+                        continue
+                    if not parts:
+                        self._stats['first_token_total_s'] += time.monotonic() - started
+                    parts.append(delta)
+                    on_text(''.join(parts).strip())
+
+            try:
+                await asyncio.wait_for(consume(), max(timeout - (started - queued), 0.1))
+            except Exception as e:
+                if not ''.join(parts).strip():
+                    raise
+                print(f"AI stream cut short: {str(e) or type(e).__name__}")
+                self._stats['truncated'] += 1
+        elapsed = time.monotonic() - started
+        self._stats['latency_total_s'] += elapsed
+        self._stats['latency_max_s'] = max(self._stats['latency_max_s'], elapsed)
+        return ''.join(parts).strip()
+
+    async def _ask(self, messages, fallback, on_text=None, **kwargs):
+        self._stats['calls'] += 1
+        try:
+            if on_text is None:
+                text = await self.complete(messages, **kwargs)
+            else:
+                text = await self.complete_stream(messages, on_text, **kwargs)
+        except asyncio.CancelledError:
+            self._stats['cancelled'] += 1
+            raise
+        except (asyncio.TimeoutError, APITimeoutError):
+            print("AI Error: timed out")
+            self._stats['timeouts'] += 1
+            self._stats['fallbacks'] += 1
+            return fallback
+        except Exception as e:
+            print(f"AI Error: {e}")
+            self._stats['errors'] += 1
+            self._stats['fallbacks'] += 1
+            return fallback
+        self._stats['ok'] += 1
+        return text
+
+    async def ask(self, messages, fallback, chat_id=None, **kwargs):
+        """Completion text, `fallback` on failure, None if superseded by a newer call for chat_id"""
+        if chat_id is None:
+            return await self._ask(messages, fallback, **kwargs)
+
+        previous = self._inflight.get(chat_id)
+        if previous is not None and not previous.done():
+            self._superseded.add(previous)
+            previous.cancel()
+
+        task = asyncio.ensure_future(self._ask(messages, fallback, **kwargs))
+        self._inflight[chat_id] = task
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if task in self._superseded:
+                return None          # a newer call for this chat replaced us
+            task.cancel()
+            raise
+        finally:
+            self._superseded.discard(task)
+            if self._inflight.get(chat_id) is task:
+                del self._inflight[chat_id]
+
+    # ===== METRICS =====
+    def get_stats(self):
+        stats = dict(self._stats)
+        stats['avg_latency_s'] = stats['latency_total_s'] / stats['ok'] if stats['ok'] else 0.0
+        stats['avg_wait_s'] = stats['wait_total_s'] / stats['calls'] if stats['calls'] else 0.0
+        stats['avg_first_token_s'] = stats['first_token_total_s'] / stats['streams'] if stats['streams'] else 0.0
+        stats['in_flight'] = sum(1 for task in self._inflight.values() if not task.done())
+        return stats
+
+
+# Shared gateway for handlers and jobs
+ai_gateway = AIGateway()
@@ -5,16 +5,25 @@ Uses OpenRouter for advanced psychology insights
 
 from openai import OpenAI
 from config import OPENROUTER_API_KEY
+from services.ai_batch import batch_insights, AI_BATCH_SIZE, AI_BATCH_CONCURRENCY
 
 client = OpenAI(
     base_url="https://openrouter.ai/api/v1",
     api_key=OPENROUTER_API_KEY,
 )
 
-def generate_psychology_insights(chat_id, weekly_stats, moods, conversations, user_name):
-    """Generate 2-3 line psychological insight using Claude/GPT"""
-    
-    # Build context
+SYSTEM_PROMPT = "You are a compassionate psychologist providing brief, actionable insights based on behavioral data and emotional patterns."
+
+BATCH_INSTRUCTIONS = (
+    "You are an experienced psychologist specializing in behavioral psychology and emotional wellness. "
+    "For each user below, write a warm, personalized 2-3 sentence psychological insight addressed to them by name "
+    "that acknowledges their emotional state if concerns exist, identifies a behavioral pattern, and offers one "
+    "actionable, compassionate suggestion. Empathetic, non-judgmental, encouraging."
+)
+
+
+def _week_context(weekly_stats, moods, conversations):
+    """Completion rate, behavior pattern, mood and concern summary for one user's week"""
     completion_rate = 0
     if weekly_stats:
         total_completed = (weekly_stats.get('goals_completed') or 0) + (weekly_stats.get('habits_completed') or 0)
@@ -63,14 +72,50 @@ def generate_psychology_insights(chat_id, weekly_stats, moods, conversations, us
     # Behavioral patterns
     behavior_pattern = "consistent" if completion_rate > 70 else "inconsistent" if completion_rate > 40 else "struggling"
     
+    return {
+        'completion_rate': completion_rate,
+        'behavior_pattern': behavior_pattern,
+        'mood_summary': mood_summary,
+        'concerns': concerns,
+        'concern_text': concern_text,
+        'concern_quotes': concern_quotes,
+    }
+
+
+def _fallback_insight(user_name, completion_rate, concerns):
+    """Rule-based insight when the AI is unavailable or its answer unusable"""
+    if concerns:
+        if 'loneliness' in concerns:
+            return f"{user_name}, feeling alone is valid. Your {completion_rate:.0f}% completion shows you're still showing up for yourself. Consider reaching out to one person today - connection heals."
+        elif 'stress' in concerns:
+            return f"{user_name}, stress is affecting your progress ({completion_rate:.0f}%). Break tasks into smaller steps. Remember: progress, not perfection."
+        elif 'anxiety' in concerns:
+            return f"{user_name}, anxiety can be overwhelming. Your {completion_rate:.0f}% shows resilience. Try grounding exercises before tackling goals."
+    
+    # Generic positive feedback
+    if completion_rate >= 70:
+        return f"{user_name}, your {completion_rate:.0f}% completion reflects strong discipline. Celebrate these wins - they're building lasting habits."
+    elif completion_rate >= 40:
+        return f"{user_name}, {completion_rate:.0f}% shows you're making progress despite challenges. Focus on consistency over perfection."
+    else:
+        return f"{user_name}, starting is brave. Your {completion_rate:.0f}% is a foundation. Set one tiny goal tomorrow - momentum builds gradually."
+
+
+def generate_psychology_insights(chat_id, weekly_stats, moods, conversations, user_name):
+    """Generate 2-3 line psychological insight using Claude/GPT"""
+    
+    # Build context
+    week = _week_context(weekly_stats, moods, conversations)
+    concern_quotes = week['concern_quotes']
+    
     # Create detailed prompt
     prompt = f"""You are an experienced psychologist specializing in behavioral psychology and emotional wellness. Analyze this week's data and provide a brief, compassionate psychological insight.
 
 **User:** {user_name}
-**Completion Rate:** {completion_rate:.1f}%
-**Behavior Pattern:** {behavior_pattern}
-**{mood_summary}**
-**{concern_text}**
+**Completion Rate:** {week['completion_rate']:.1f}%
+**Behavior Pattern:** {week['behavior_pattern']}
+**{week['mood_summary']}**
+**{week['concern_text']}**
 
 {f"**Recent expressions:** {concern_quotes[:2]}" if concern_quotes else ""}
 
@@ -92,7 +137,7 @@ Psychology Insight:"""
             messages=[
                 {
                     "role": "system", 
-                    "content": "You are a compassionate psychologist providing brief, actionable insights based on behavioral data and emotional patterns."
+                    "content": SYSTEM_PROMPT
                 },
                 {
                     "role": "user", 
@@ -114,21 +159,37 @@ Psychology Insight:"""
         print(f"AI Psychology Error: {e}")
         
         # Fallback based on data
-        if concerns:
-            if 'loneliness' in concerns:
-                return f"{user_name}, feeling alone is valid. Your {completion_rate:.0f}% completion shows you're still showing up for yourself. Consider reaching out to one person today - connection heals."
-            elif 'stress' in concerns:
-                return f"{user_name}, stress is affecting your progress ({completion_rate:.0f}%). Break tasks into smaller steps. Remember: progress, not perfection."
-            elif 'anxiety' in concerns:
-                return f"{user_name}, anxiety can be overwhelming. Your {completion_rate:.0f}% shows resilience. Try grounding exercises before tackling goals."
-        
-        # Generic positive feedback
-        if completion_rate >= 70:
-            return f"{user_name}, your {completion_rate:.0f}% completion reflects strong discipline. Celebrate these wins - they're building lasting habits."
-        elif completion_rate >= 40:
-            return f"{user_name}, {completion_rate:.0f}% shows you're making progress despite challenges. Focus on consistency over perfection."
-        else:
-            return f"{user_name}, starting is brave. Your {completion_rate:.0f}% is a foundation. Set one tiny goal tomorrow - momentum builds gradually."
+        return _fallback_insight(user_name, week['completion_rate'], week['concerns'])
+
+
+async def generate_psychology_insights_batch(users, gateway=None, batch_size=AI_BATCH_SIZE,
+                                             concurrency=AI_BATCH_CONCURRENCY):
+    """
+    generate_psychology_insights for many users: compact one-line summaries,
+    batch_size users per AI call, concurrency calls at a time.
+    users: [{'chat_id', 'weekly_stats', 'moods', 'conversations', 'user_name'}]
+    Returns {chat_id: insight}; anyone the AI answer doesn't cover gets the
+    rule-based insight.
+    
+    Nothing calls this (or generate_psychology_insights) yet: psychology
+    insights are a planned premium feature with no job sending them.
+    benchmarks/ai_batch.py is the only consumer.
+    """
+    weeks = {}
+    entries = []
+    for user in users:
+        week = _week_context(user.get('weekly_stats'), user.get('moods'), user.get('conversations'))
+        weeks[user['chat_id']] = (user['user_name'], week)
+        entries.append((user['chat_id'],
+                        f"{user['user_name']} - completion {week['completion_rate']:.0f}% ({week['behavior_pattern']}); "
+                        f"{week['mood_summary']}; {week['concern_text']}"))
+    
+    insights = await batch_insights(entries, BATCH_INSTRUCTIONS, SYSTEM_PROMPT, gateway=gateway,
+                                    batch_size=batch_size, concurrency=concurrency)
+    for chat_id, (user_name, week) in weeks.items():
+        if chat_id not in insights:
+            insights[chat_id] = _fallback_insight(user_name, week['completion_rate'], week['concerns'])
+    return insights
 
 
 def analyze_emotional_state(moods, conversations):
@@ -3,24 +3,13 @@ AI Response Service - Helpful Friend Mode
 Uses OpenRouter for practical, empathetic, solution-oriented responses
 """
 
-from openai import OpenAI
-from config import OPENROUTER_API_KEY
+from services.ai_gateway import ai_gateway
+from services.ai_cache import cached_reply
+from services.content_pool import content_pool
 
-client = OpenAI(
-    base_url="https://openrouter.ai/api/v1",
-    api_key=OPENROUTER_API_KEY,
-)
+FALLBACK_REPLY = "I'm here for you. Tell me more about what you need help with."
 
-def chat_with_ai(prompt, chat_id):
-    """Get helpful, practical AI response"""
-    
-    try:
-        response = client.chat.completions.create(
-            model="anthropic/claude-3.5-sonnet",
-            messages=[
-                {
-                    "role": "system",
-                    "content": """You are a helpful, caring friend. NOT a therapist.
+SYSTEM_PROMPT = """You are a helpful, caring friend. NOT a therapist.
 
 YOUR PERSONALITY:
 - Talk like a real friend, not a counselor
@@ -48,18 +37,61 @@ RESPOND LIKE:
 "I'd suggest..."
 
 Keep responses 2-4 sentences unless giving steps."""
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
+
+async def chat_with_ai(prompt, chat_id, supersede=False, cache=False, slots=None, on_text=None):
+    """
+    Get helpful, practical AI response (async, via services.ai_gateway)
+    Falls back to a supportive default on errors/timeouts. With supersede=True
+    a newer call for the same chat cancels this one and it returns None.
+    cache=True reuses replies across users for fixed/templated prompts
+    (services.ai_cache); slots are per-user values in the prompt, e.g.
+    {'name': user_name}, swapped in and out of cached replies.
+    With on_text the reply is streamed: on_text(text_so_far) is called as
+    tokens arrive (e.g. LiveMessage.update from services.live_message).
+    """
+    messages = [
+        {
+            "role": "system",
+            "content": SYSTEM_PROMPT
+        },
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
+
+    async def fetch():
+        reply = await ai_gateway.ask(
+            messages,
+            FALLBACK_REPLY,
+            chat_id=chat_id if supersede else None,
             temperature=0.7,
             max_tokens=250,
+            on_text=on_text,
         )
-        
-        return response.choices[0].message.content.strip()
-        
-    except Exception as e:
-        print(f"AI Error: {e}")
-        return "I'm here for you. Tell me more about what you need help with."
+        return reply, reply is not None and reply is not FALLBACK_REPLY
+
+    if not cache:
+        return (await fetch())[0]
+    return await cached_reply(prompt, fetch, slots)
+
+
+async def pooled_reply(template, prompt, chat_id, slots=None, category=None, **kwargs):
+    """
+    Precomputed message from the nightly content pool (services.content_pool);
+    on a miss, a live reply to prompt via chat_with_ai(cache=True).
+    """
+    text = content_pool.pick(template, chat_id, category, slots)
+    if text is not None:
+        return text
+    return await chat_with_ai(prompt, chat_id, cache=True, slots=slots, **kwargs)
+
+
+async def get_motivation(item, chat_id=None, kind='goal'):
+    """Short motivation line for a goal/habit reminder (scheduler/daily_tasks)"""
+    return await pooled_reply(
+        f'{kind}_reminder',
+        f"Give me a short, friendly nudge to work on my {kind} today: {item}. 1-2 sentences.",
+        chat_id,
+        slots={kind: item},
+    )
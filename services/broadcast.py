@@ -0,0 +1,168 @@
+"""
+Broadcast Service
+Sends an admin announcement to every user without blocking the handler:
+bounded concurrency, checkpointed in broadcast_jobs after every chunk so a
+restart resumes where it stopped. Pacing and 429 retries are left to the
+outbound dispatcher - sends go in its lowest 'broadcast' class.
+"""
+
+import asyncio
+import os
+import time
+
+from telegram.error import RetryAfter, Forbidden, BadRequest, TimedOut, NetworkError, TelegramError
+
+from database.async_db import run_sync
+from database.user_db import iter_users
+from database.broadcast_db import (
+    get_broadcast, get_unfinished_broadcasts, save_broadcast_progress, set_broadcast_status
+)
+
+BROADCAST_CONCURRENCY = int(os.getenv('BROADCAST_CONCURRENCY', 20))   # sends in flight
+BROADCAST_CHUNK = int(os.getenv('BROADCAST_CHUNK', 500))               # users per checkpoint
+MAX_RETRIES = 3
+
+_running = {}   # broadcast_id -> asyncio.Task
+
+
+def format_announcement(message):
+    return f"📢 **Announcement**\n\n{message}"
+
+
+async def send_one(bot, chat_id, text, counts):
+    """Deliver to one chat. Updates counts in place."""
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            await bot.send_message(
+                chat_id=chat_id, text=text, parse_mode='Markdown',
+                rate_limit_args={'priority': 'broadcast'}
+            )
+            counts['sent'] += 1
+            return
+        except Forbidden:
+            counts['blocked'] += 1   # blocked the bot / deactivated
+            return
+        except (BadRequest, TimedOut, RetryAfter) as e:
+            # Bad chat, delivery unknown, or still flood limited after the
+            # dispatcher's own retries - retrying here could double-send
+            print(f"❌ Broadcast to {chat_id} failed: {e}")
+            counts['failed'] += 1
+            return
+        except NetworkError:
+            await asyncio.sleep(2 ** attempt)
+        except TelegramError as e:
+            print(f"❌ Broadcast to {chat_id} failed: {e}")
+            counts['failed'] += 1
+            return
+    counts['failed'] += 1
+
+
+async def send_to_chats(bot, chat_ids, text, counts, concurrency=BROADCAST_CONCURRENCY):
+    """Send text to a batch of chats with at most `concurrency` sends in flight"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def worker(chat_id):
+        async with semaphore:
+            await send_one(bot, chat_id, text, counts)
+
+    await asyncio.gather(*(worker(chat_id) for chat_id in chat_ids))
+
+
+async def run_broadcast(bot, broadcast_id, on_progress=None):
+    """
+    Send (or resume) a broadcast job. on_progress(job) is awaited after
+    every checkpointed chunk. Returns the final job dict.
+    """
+    job = await run_sync(get_broadcast, broadcast_id)
+    if not job or job['status'] != 'running':
+        return job
+
+    text = format_announcement(job['message'])
+    counts = {'sent': job['sent'], 'failed': job['failed'], 'blocked': job['blocked']}
+    started = time.monotonic()
+
+    users = iter_users(chunk_size=BROADCAST_CHUNK, after_chat_id=job['last_chat_id'])
+    while True:
+        chunk = await run_sync(next, users, None)
+        if chunk is None:
+            break
+
+        chat_ids = [user['chat_id'] for user in chunk]
+        await send_to_chats(bot, chat_ids, text, counts)
+
+        job['last_chat_id'] = chat_ids[-1]
+        job.update(counts)
+        await run_sync(save_broadcast_progress, broadcast_id, job['last_chat_id'], **counts)
+        if on_progress:
+            await on_progress(dict(job, elapsed=time.monotonic() - started))
+
+    job['status'] = 'done'
+    await run_sync(save_broadcast_progress, broadcast_id, job['last_chat_id'], status='done', **counts)
+    if on_progress:
+        await on_progress(dict(job, elapsed=time.monotonic() - started))
+    print(f"📢 Broadcast #{broadcast_id} done: {counts}")
+    return job
+
+
+def progress_text(job):
+    """Admin-facing status of a broadcast"""
+    handled = job['sent'] + job['failed'] + job['blocked']
+    percent = min(100, handled * 100 // job['total']) if job['total'] else 100
+    title = "✅ **Broadcast Complete**" if job['status'] == 'done' else f"📢 **Broadcasting #{job['id']}** ({percent}%)"
+    text = (
+        f"{title}\n\n"
+        f"Sent: {job['sent']}\n"
+        f"Failed: {job['failed']}\n"
+        f"Blocked: {job['blocked']}\n"
+        f"Total users: {job['total']}"
+    )
+    if job['status'] == 'running':
+        text += f"\n\nStop with /adminbroadcaststop {job['id']}"
+    return text
+
+
+def progress_reporter(bot, chat_id, message_id):
+    """on_progress callback that edits the admin's status message"""
+    async def report(job):
+        try:
+            await bot.edit_message_text(
+                chat_id=chat_id, message_id=message_id,
+                text=progress_text(job), parse_mode='Markdown'
+            )
+        except TelegramError as e:
+            print(f"⚠️ Broadcast progress update failed: {e}")
+    return report
+
+
+def start_broadcast(application, broadcast_id, on_progress=None):
+    """Run a broadcast in the background. Returns the task."""
+    task = application.create_task(run_broadcast(application.bot, broadcast_id, on_progress=on_progress))
+    _running[broadcast_id] = task
+    task.add_done_callback(lambda _: _running.pop(broadcast_id, None))
+    return task
+
+
+async def stop_broadcast(broadcast_id):
+    """Cancel a running broadcast (progress so far stays recorded)"""
+    task = _running.pop(broadcast_id, None)
+    if task:
+        task.cancel()
+    return await run_sync(set_broadcast_status, broadcast_id, 'cancelled')
+
+
+async def resume_broadcasts(application):
+    """Restart broadcasts interrupted by a shutdown; tell their admins"""
+    for job in await run_sync(get_unfinished_broadcasts):
+        if job['id'] in _running:
+            continue
+        try:
+            status = await application.bot.send_message(
+                chat_id=job['created_by'],
+                text=f"🔄 Resuming broadcast #{job['id']}...\n\n{progress_text(job)}",
+                parse_mode='Markdown'
+            )
+            on_progress = progress_reporter(application.bot, job['created_by'], status.message_id)
+        except TelegramError:
+            on_progress = None
+        start_broadcast(application, job['id'], on_progress)
+        print(f"🔄 Resumed broadcast #{job['id']} after chat {job['last_chat_id']}")
@@ -0,0 +1,224 @@
+"""
+Chart Cache
+Content-addressed PNG cache for rendered charts. The key is a hash of
+(chart kind, data series, user name, STYLE_VERSION, CHART_BACKEND), so a
+chart is only re-rendered when the data behind it changes - or when
+chart_generator's look changes and STYLE_VERSION is bumped.
+
+PNGs live in CHART_CACHE_DIR (default data/chart_cache) as <key>.png,
+evicted least recently used once the directory exceeds CHART_CACHE_MAX_MB.
+The Telegram file_id of the first send is kept next to it (<key>.fid), so
+repeat sends of the same chart upload nothing:
+
+    await send_chart(bot, chat_id, 'weekly', (days, completions), caption=...)
+
+The async helpers do every disk access (index load, PNG and file_id
+reads/writes) in the default executor, never on the event loop.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from telegram.error import BadRequest
+
+CHART_CACHE_DIR = os.getenv('CHART_CACHE_DIR', os.path.join('data', 'chart_cache'))
+CHART_CACHE_MAX_MB = float(os.getenv('CHART_CACHE_MAX_MB', 200))
+
+
+def chart_key(kind, args, user_name=None):
+    """Stable hash of everything that shows up in the picture"""
+    from services.chart_generator import STYLE_VERSION, CHART_BACKEND
+    payload = json.dumps([kind, CHART_BACKEND, STYLE_VERSION, user_name, list(args)],
+                         default=str, separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ChartCache:
+    """Disk LRU of PNG bytes + remembered Telegram file_ids"""
+
+    def __init__(self, directory=CHART_CACHE_DIR, max_bytes=int(CHART_CACHE_MAX_MB * 1024 * 1024)):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index = None               # key -> PNG size, least recently used first
+        self._bytes = 0
+        self._file_ids = {}
+        self._stats = {'hits': 0, 'misses': 0, 'file_id_hits': 0, 'evictions': 0}
+
+    def _path(self, key, ext='png'):
+        return os.path.join(self.directory, f"{key}.{ext}")
+
+    def _load(self):
+        """Rebuild the LRU order from file mtimes (first use after a restart)"""
+        os.makedirs(self.directory, exist_ok=True)
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.png'):
+                st = os.stat(os.path.join(self.directory, name))
+                entries.append((st.st_mtime, name[:-4], st.st_size))
+        entries.sort()
+        self._index = OrderedDict((key, size) for _, key, size in entries)
+        self._bytes = sum(self._index.values())
+
+    def _ensure_loaded(self):
+        if self._index is None:
+            self._load()
+
+    # ===== PNG BYTES =====
+    def get(self, key):
+        """PNG bytes or None; a hit marks the entry recently used"""
+        with self._lock:
+            self._ensure_loaded()
+            if key not in self._index:
+                self._stats['misses'] += 1
+                return None
+            try:
+                with open(self._path(key), 'rb') as f:
+                    png = f.read()
+                os.utime(self._path(key))
+            except OSError:
+                self._drop(key)
+                self._stats['misses'] += 1
+                return None
+            self._index.move_to_end(key)
+            self._stats['hits'] += 1
+            return png
+
+    def put(self, key, png):
+        with self._lock:
+            self._ensure_loaded()
+            tmp = self._path(key, f"{os.getpid()}.tmp")
+            with open(tmp, 'wb') as f:
+                f.write(png)
+            os.replace(tmp, self._path(key))
+
+            self._bytes += len(png) - self._index.get(key, 0)
+            self._index[key] = len(png)
+            self._index.move_to_end(key)
+            while self._bytes > self.max_bytes and len(self._index) > 1:
+                oldest = next(iter(self._index))
+                self._drop(oldest)
+                self._stats['evictions'] += 1
+
+    def _drop(self, key):
+        self._bytes -= self._index.pop(key, 0)
+        self._file_ids.pop(key, None)
+        for ext in ('png', 'fid'):
+            try:
+                os.remove(self._path(key, ext))
+            except FileNotFoundError:
+                pass
+
+    # ===== TELEGRAM FILE IDS =====
+    def get_file_id(self, key):
+        with self._lock:
+            self._ensure_loaded()
+            if key not in self._index:
+                return None
+            file_id = self._file_ids.get(key)
+            if file_id is None:
+                try:
+                    with open(self._path(key, 'fid')) as f:
+                        file_id = self._file_ids[key] = f.read().strip()
+                except FileNotFoundError:
+                    return None
+            self._index.move_to_end(key)
+            self._stats['file_id_hits'] += 1
+            return file_id
+
+    def set_file_id(self, key, file_id):
+        with self._lock:
+            self._ensure_loaded()
+            if key not in self._index:
+                return
+            self._file_ids[key] = file_id
+            with open(self._path(key, 'fid'), 'w') as f:
+                f.write(file_id)
+
+    def forget_file_id(self, key):
+        """Telegram rejected the file_id - next send uploads the PNG again"""
+        with self._lock:
+            self._file_ids.pop(key, None)
+            try:
+                os.remove(self._path(key, 'fid'))
+            except FileNotFoundError:
+                pass
+
+    # ===== METRICS =====
+    def get_stats(self):
+        with self._lock:
+            self._ensure_loaded()
+            stats = dict(self._stats)
+            stats['entries'] = len(self._index)
+            stats['size_mb'] = self._bytes / (1024 * 1024)
+            lookups = stats['hits'] + stats['misses']
+            stats['hit_rate'] = stats['hits'] / lookups * 100 if lookups else 0.0
+            return stats
+
+
+chart_cache = ChartCache()
+
+
+def _off_loop(func, *args):
+    """Run a blocking ChartCache call in the default executor"""
+    return asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
+def render_cached(kind, args, user_name=None, cache=chart_cache):
+    """Sync path: cached PNG bytes, rendering inline on a miss"""
+    from services import chart_generator
+    from services.chart_service import RENDERERS
+    key = chart_key(kind, args, user_name)
+    png = cache.get(key)
+    if png is None:
+        png = getattr(chart_generator, RENDERERS[kind])(*args)
+        cache.put(key, png)
+    return png
+
+
+async def get_chart(kind, args, user_name=None, cache=chart_cache, charts=None):
+    """(key, photo): a known Telegram file_id, else PNG bytes from disk or the chart service"""
+    key = chart_key(kind, args, user_name)
+    file_id = await _off_loop(cache.get_file_id, key)
+    if file_id:
+        return key, file_id
+
+    png = await _off_loop(cache.get, key)
+    if png is None:
+        if charts is None:
+            from services.chart_service import chart_service as charts
+        png = await charts.render(kind, *args)
+        await _off_loop(cache.put, key, png)
+    return key, png
+
+
+async def remember_sent(key, message, cache=chart_cache):
+    """Keep the file_id of an uploaded chart for the next send"""
+    if message is not None and getattr(message, 'photo', None):
+        await _off_loop(cache.set_file_id, key, message.photo[-1].file_id)
+
+
+async def send_photo_cached(bot, chat_id, key, photo, cache=chart_cache, **kwargs):
+    """send_photo that falls back to the PNG when a cached file_id is rejected"""
+    if isinstance(photo, str):
+        try:
+            return await bot.send_photo(chat_id=chat_id, photo=photo, **kwargs)
+        except BadRequest as e:
+            print(f"⚠️ Cached chart file_id rejected ({e}), uploading again")
+            await _off_loop(cache.forget_file_id, key)
+            photo = await _off_loop(cache.get, key)
+            if photo is None:
+                raise
+    message = await bot.send_photo(chat_id=chat_id, photo=photo, **kwargs)
+    await remember_sent(key, message, cache)
+    return message
+
+
+async def send_chart(bot, chat_id, kind, args, user_name=None, cache=chart_cache, **kwargs):
+    """Render-or-reuse a chart and send it; kwargs go to send_photo"""
+    key, photo = await get_chart(kind, args, user_name, cache)
+    return await send_photo_cached(bot, chat_id, key, photo, cache, **kwargs)
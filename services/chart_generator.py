@@ -1,18 +1,41 @@
 """
 Beautiful Progress Chart Generator
 NOW WITH REAL DATA!
+
+CHART_BACKEND picks the renderer: 'matplotlib' (default) or 'pillow'
+(services/chart_pillow.py - same charts without importing matplotlib).
+matplotlib is only imported when the first matplotlib chart is drawn.
 """
 
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import numpy as np
+import os
 from datetime import datetime, timedelta, date
 import io
 
-plt.style.use('seaborn-v0_8-darkgrid')
+CHART_BACKEND = os.getenv('CHART_BACKEND', 'matplotlib').lower()
+
+# Bump when any chart's look changes - part of the chart cache key
+STYLE_VERSION = 1
+
+_plt = None
+
+def _pyplot():
+    """matplotlib.pyplot with the Agg backend and seaborn style, imported on first use"""
+    global _plt
+    if _plt is None:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        plt.style.use('seaborn-v0_8-darkgrid')
+        _plt = plt
+    return _plt
 
-def create_weekly_progress_chart(chat_id, weekly_data=None):
+def _pillow():
+    if CHART_BACKEND != 'pillow':
+        return None
+    from services import chart_pillow
+    return chart_pillow
+
+def create_weekly_progress_chart(chat_id, weekly_data=None, user_name=None):
     """Create weekly progress chart with REAL DATA"""
     
     # Get real data from database
@@ -55,11 +78,21 @@ def create_weekly_progress_chart(chat_id, weekly_data=None):
             days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
             completions = [0, 0, 0, 0, 0, 0, 0]
     
+    from services.chart_cache import render_cached
+    return io.BytesIO(render_cached('weekly', (days, completions)))
+
+def render_weekly_chart(days, completions):
+    """Draw the weekly progress chart from a ready data series -> PNG bytes (no DB access)"""
+    pillow = _pillow()
+    if pillow:
+        return pillow.render_weekly_chart(days, completions)
+    plt = _pyplot()
+    
     # Create figure
     fig, ax = plt.subplots(figsize=(10, 6), facecolor='white')
     
     # Plot
-    x = np.arange(len(days))
+    x = list(range(len(days)))
     ax.plot(x, completions, color='#4A90E2', linewidth=3, marker='o', 
             markersize=10, markerfacecolor='#4A90E2', markeredgewidth=2, markeredgecolor='white')
     ax.fill_between(x, completions, alpha=0.3, color='#4A90E2')
@@ -107,13 +140,72 @@ def create_weekly_progress_chart(chat_id, weekly_data=None):
     buf = io.BytesIO()
     plt.tight_layout()
     plt.savefig(buf, format='png', dpi=150, bbox_inches='tight', facecolor='white')
-    buf.seek(0)
     plt.close()
     
-    return buf
+    return buf.getvalue()
+
+def create_3day_feedback_chart(chat_id, item, history, type='goal'):
+    """Create 3-day pattern chart for a goal/habit from its daily history (oldest first)"""
+    today = date.today()
+    days = [(today - timedelta(days=len(history) - 1 - n)).strftime('%a') for n in range(len(history))]
+    name = item.get('goal') if type == 'goal' else item.get('habit')
+    return io.BytesIO(render_3day_feedback_chart(name, days, history, type))
+
+def render_3day_feedback_chart(name, days, history, type='goal'):
+    """Draw done/missed bars for the last days of one goal/habit -> PNG bytes (no DB access)"""
+    pillow = _pillow()
+    if pillow:
+        return pillow.render_3day_feedback_chart(name, days, history, type)
+    plt = _pyplot()
+    
+    fig, ax = plt.subplots(figsize=(10, 5), facecolor='white')
+    
+    x = list(range(len(days)))
+    colors = ['#27AE60' if done else '#E74C3C' for done in history]
+    ax.bar(x, [1] * len(days), color=colors, width=0.6, edgecolor='white', linewidth=2)
+    for i, done in enumerate(history):
+        ax.text(i, 0.5, 'Done' if done else 'Missed', ha='center', va='center',
+                fontsize=11, fontweight='bold', color='white')
+    
+    # Styling
+    ax.set_title(f"{type.capitalize()}: {name}", fontsize=16, fontweight='bold', pad=20)
+    ax.set_xticks(x)
+    ax.set_xticklabels(days, fontsize=10)
+    ax.set_yticks([])
+    ax.set_ylim(0, 1.2)
+    ax.set_facecolor('#fafafa')
+    for side in ('top', 'right', 'left'):
+        ax.spines[side].set_visible(False)
+    
+    # Missed run at the end
+    missed = 0
+    for done in reversed(history):
+        if done:
+            break
+        missed += 1
+    done_count = sum(1 for done in history if done)
+    stats_text = f"Done {done_count}/{len(history)} days | {missed} missed in a row"
+    ax.text(0.5, -0.15, stats_text, ha='center', va='center',
+            transform=ax.transAxes, fontsize=11, color='#666',
+            bbox=dict(boxstyle='round,pad=0.5', facecolor='#f0f0f0', edgecolor='none'))
+    
+    buf = io.BytesIO()
+    plt.tight_layout()
+    plt.savefig(buf, format='png', dpi=150, bbox_inches='tight', facecolor='white')
+    plt.close()
+    
+    return buf.getvalue()
 
 def create_badge_showcase(badges_earned):
     """Create badge showcase with REAL EARNED BADGES"""
+    return io.BytesIO(render_badge_showcase(badges_earned))
+
+def render_badge_showcase(badges_earned):
+    """Draw the badge showcase from badge rows -> PNG bytes (no DB access)"""
+    pillow = _pillow()
+    if pillow:
+        return pillow.render_badge_showcase(badges_earned)
+    plt = _pyplot()
     
     fig = plt.figure(figsize=(10, 6), facecolor='white')
     ax = fig.add_subplot(111)
@@ -183,7 +275,6 @@ def create_badge_showcase(badges_earned):
     buf = io.BytesIO()
     plt.tight_layout()
     plt.savefig(buf, format='png', dpi=150, bbox_inches='tight', facecolor='white')
-    buf.seek(0)
     plt.close()
     
-    return buf
+    return buf.getvalue()
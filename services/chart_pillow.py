@@ -0,0 +1,236 @@
+"""
+Pillow Chart Backend
+The three fixed charts drawn directly with Pillow - no matplotlib, numpy
+or seaborn import, so a fresh process starts rendering without the
+matplotlib cold start and at about half the memory. Same layout, colors
+and text as the matplotlib versions in chart_generator (which dispatches
+here when CHART_BACKEND=pillow).
+
+Everything is drawn at 2x and box-downsampled for anti-aliasing. Fonts: DejaVu
+Sans if installed (or CHART_FONT_DIR), else Pillow's built-in font.
+"""
+
+import io
+import math
+import os
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFont
+
+SCALE = 2
+CHART_FONT_DIR = os.getenv('CHART_FONT_DIR', '')
+
+BLUE = '#4A90E2'
+GREEN = '#27AE60'
+RED = '#E74C3C'
+TEXT = '#262626'
+MUTED = '#666666'
+PANEL = '#fafafa'
+GRID = '#d9d9d9'
+BOX = '#f0f0f0'
+
+BADGES = [
+    ('soul_silver', 'Soul Silver', '50%+ Weekly', '#B0B7BF'),
+    ('soul_gold', 'Soul Gold', '80%+ Weekly', '#F4C430'),
+    ('soul_diamond', 'Soul Diamond', '90%+ Weekly', '#5DADE2'),
+    ('pure_soul', 'Pure Soul', 'Perfect Month', '#9B59B6'),
+]
+
+
+@lru_cache(maxsize=None)
+def _font(size, bold=False):
+    name = 'DejaVuSans-Bold.ttf' if bold else 'DejaVuSans.ttf'
+    candidates = [os.path.join(CHART_FONT_DIR, name)] if CHART_FONT_DIR else []
+    candidates += [name, os.path.join('/usr/share/fonts/truetype/dejavu', name)]
+    for path in candidates:
+        try:
+            return ImageFont.truetype(path, size * SCALE)
+        except OSError:
+            continue
+    return ImageFont.load_default(size=size * SCALE)
+
+
+class _Canvas:
+    """ImageDraw in chart coordinates (drawn at SCALE x)"""
+
+    def __init__(self, width, height):
+        self.width, self.height = width, height
+        self.image = Image.new('RGB', (width * SCALE, height * SCALE), 'white')
+        self.draw = ImageDraw.Draw(self.image, 'RGBA')
+
+    @staticmethod
+    def _s(*values):
+        return [round(v * SCALE) for v in values]
+
+    def text(self, x, y, text, size, color=TEXT, bold=False, anchor='mm'):
+        self.draw.text(self._s(x, y), text, fill=color, font=_font(size, bold), anchor=anchor)
+
+    def text_width(self, text, size, bold=False):
+        left, _, right, _ = _font(size, bold).getbbox(text)
+        return (right - left) / SCALE
+
+    def rect(self, x0, y0, x1, y1, fill, radius=0):
+        self.draw.rounded_rectangle(self._s(x0, y0, x1, y1), radius=radius * SCALE, fill=fill)
+
+    def line(self, points, color, width, dash=None):
+        if dash is None:
+            self.draw.line([tuple(self._s(x, y)) for x, y in points], fill=color, width=width * SCALE, joint='curve')
+            return
+        (x0, y0), (x1, _) = points        # horizontal dashed line
+        x = x0
+        while x < x1:
+            self.draw.line([tuple(self._s(x, y0)), tuple(self._s(min(x + dash, x1), y0))], fill=color, width=width * SCALE)
+            x += dash * 2
+
+    def polygon(self, points, fill):
+        self.draw.polygon([tuple(self._s(x, y)) for x, y in points], fill=fill)
+
+    def circle(self, x, y, r, fill, outline=None, width=0):
+        self.draw.ellipse(self._s(x - r, y - r, x + r, y + r), fill=fill, outline=outline, width=width * SCALE)
+
+    def vertical_text(self, x, y, text, size, color=TEXT, bold=True):
+        font = _font(size, bold)
+        left, top, right, bottom = font.getbbox(text)
+        label = Image.new('RGBA', (right - left, bottom - top), (255, 255, 255, 0))
+        ImageDraw.Draw(label).text((-left, -top), text, fill=color, font=font)
+        label = label.rotate(90, expand=True)
+        self.image.paste(label, (round(x * SCALE - label.width / 2), round(y * SCALE - label.height / 2)), label)
+
+    def stats_box(self, x, y, text, size=15):
+        half = self.text_width(text, size) / 2 + 14
+        self.rect(x - half, y - 20, x + half, y + 20, BOX, radius=10)
+        self.text(x, y, text, size, MUTED)
+
+    def png(self):
+        buf = io.BytesIO()
+        self.image.reduce(SCALE).save(buf, format='PNG')
+        return buf.getvalue()
+
+
+def _alpha(color, alpha):
+    color = color.lstrip('#')
+    return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4)) + (alpha,)
+
+
+def _y_ticks(top):
+    step = max(1, math.ceil(top / 6))
+    return list(range(0, top + 1, step))
+
+
+def render_weekly_chart(days, completions):
+    """Weekly progress line chart -> PNG bytes"""
+    c = _Canvas(1485, 880)
+    left, right, top, bottom = 110, 1465, 120, 740
+    top_value = max(completions) + 1 if completions and max(completions) > 0 else 5
+
+    c.text(c.width / 2, 30, 'Weekly Progress', 30, bold=True)
+    if len(completions) >= 2:
+        trend = completions[-1] - completions[0]
+        if trend > 0:
+            message, color = f"You are improving! +{trend} tasks", GREEN
+        elif trend < 0:
+            message, color = "Keep pushing!", RED
+        else:
+            message, color = "Steady progress!", BLUE
+    else:
+        message, color = "Start tracking to see progress!", BLUE
+    c.text(c.width / 2, 78, message, 19, color, bold=True)
+
+    # Plot area, grid and y axis
+    c.rect(left, top, right, bottom, PANEL)
+    y_of = lambda value: bottom - (bottom - top) * value / top_value
+    for tick in _y_ticks(top_value):
+        c.line([(left, y_of(tick)), (right, y_of(tick))], GRID, 1, dash=6)
+        c.text(left - 14, y_of(tick), str(tick), 16, anchor='rm')
+    c.vertical_text(32, (top + bottom) / 2, 'Tasks Completed', 19)
+
+    # Series
+    pad = 64
+    step = (right - left - 2 * pad) / max(len(days) - 1, 1)
+    points = [(left + pad + i * step, y_of(value)) for i, value in enumerate(completions)]
+    if points:
+        c.polygon([(points[0][0], bottom)] + points + [(points[-1][0], bottom)], _alpha(BLUE, 77))
+        if len(points) > 1:
+            c.line(points, BLUE, 6)
+        for x, y in points:
+            c.circle(x, y, 11, BLUE, outline='white', width=3)
+
+    for i, day in enumerate(days):
+        c.text(left + pad + i * step, bottom + 26, day, 16)
+    c.text(c.width / 2, bottom + 70, 'Day of Week', 19, bold=True)
+
+    total = sum(completions)
+    avg = total / len(days) if days else 0
+    c.stats_box(c.width / 2, bottom + 115, f"Total: {total} tasks | Avg: {avg:.1f}/day")
+    return c.png()
+
+
+def render_3day_feedback_chart(name, days, history, type='goal'):
+    """Done/missed bars for one goal/habit -> PNG bytes"""
+    c = _Canvas(1485, 730)
+    left, right, top, bottom = 40, 1445, 110, 600
+
+    c.text(c.width / 2, 45, f"{type.capitalize()}: {name}", 30, bold=True)
+    c.rect(left, top, right, bottom, PANEL)
+
+    slot = (right - left) / max(len(days), 1)
+    bar_top = bottom - (bottom - top) / 1.2
+    for i, done in enumerate(history):
+        x0 = left + i * slot + slot * 0.2
+        x1 = left + (i + 1) * slot - slot * 0.2
+        c.rect(x0, bar_top, x1, bottom, GREEN if done else RED)
+        c.text((x0 + x1) / 2, (bar_top + bottom) / 2, 'Done' if done else 'Missed', 18, 'white', bold=True)
+    for i, day in enumerate(days):
+        c.text(left + (i + 0.5) * slot, bottom + 26, day, 16)
+
+    missed = 0
+    for done in reversed(history):
+        if done:
+            break
+        missed += 1
+    done_count = sum(1 for done in history if done)
+    c.stats_box(c.width / 2, bottom + 90, f"Done {done_count}/{len(history)} days | {missed} missed in a row")
+    return c.png()
+
+
+def _lock(c, x, y, color):
+    c.rect(x - 24, y - 4, x + 24, y + 34, color, radius=6)
+    c.draw.arc(c._s(x - 16, y - 34, x + 16, y + 6), 180, 360, fill=color, width=7 * SCALE)
+
+
+def render_badge_showcase(badges_earned):
+    """2x2 grid of earned / locked badges -> PNG bytes"""
+    c = _Canvas(1485, 860)
+    c.text(c.width / 2, 40, 'Your Achievements', 34, bold=True)
+
+    counts = {}
+    for badge in badges_earned or []:
+        counts[badge.get('badge_type')] = counts.get(badge.get('badge_type'), 0) + 1
+
+    positions = [(371, 270), (1114, 270), (371, 560), (1114, 560)]
+    for (x, y), (badge_type, title, subtitle, color) in zip(positions, BADGES):
+        count = counts.get(badge_type, 0)
+        if count:
+            c.circle(x, y, 70, color)
+            c.circle(x, y, 52, None, outline='white', width=5)
+            c.text(x, y, title.split()[-1][0], 44, 'white', bold=True)
+            c.text(x, y + 105, title, 18, '#333333', bold=True)
+            c.text(x, y + 132, subtitle, 16, '#333333', bold=True)
+            if count > 1:
+                c.circle(x + 64, y - 60, 22, BLUE)
+                c.text(x + 64, y - 60, f"×{count}", 15, 'white', bold=True)
+        else:
+            c.circle(x, y, 70, '#eeeeee')
+            _lock(c, x, y - 6, '#c8c8c8')
+            c.text(x, y + 105, title, 18, '#bbbbbb')
+            c.text(x, y + 132, subtitle, 16, '#bbbbbb')
+
+    earned = len(counts)
+    if earned == 4:
+        message = "You've unlocked all badges!"
+    elif earned > 0:
+        message = f"{earned}/4 unlocked! Keep going!"
+    else:
+        message = "Complete goals to unlock badges!"
+    c.text(c.width / 2, 800, message, 19, BLUE, bold=True)
+    return c.png()
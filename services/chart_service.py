@@ -0,0 +1,139 @@
+"""
+Chart Service
+Renders charts in a pool of warm worker processes so matplotlib never runs
+on the event loop. Each worker imports matplotlib, applies the seaborn
+style and draws one throwaway figure when it starts, so the first real
+chart doesn't pay for font cache and style loading.
+
+The pool is created by the first render(), on the event loop thread, so
+workers are forked from the main thread (never from an executor thread)
+and a bot that never draws a chart never starts them.
+
+    png = await chart_service.render('weekly', days, completions)
+
+Returns PNG bytes. Raises ChartQueueFull when CHART_MAX_QUEUE renders are
+already waiting (callers skip the chart or retry later) and
+asyncio.TimeoutError after CHART_TIMEOUT seconds.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+CHART_WORKERS = int(os.getenv('CHART_WORKERS', max(1, (os.cpu_count() or 2) - 1)))
+CHART_TIMEOUT = float(os.getenv('CHART_TIMEOUT', 20))
+CHART_MAX_QUEUE = int(os.getenv('CHART_MAX_QUEUE', 200))
+
+# kind -> pure render function in services.chart_generator
+RENDERERS = {
+    'weekly': 'render_weekly_chart',
+    'three_day': 'render_3day_feedback_chart',
+    'badges': 'render_badge_showcase',
+}
+
+
+class ChartQueueFull(Exception):
+    """Too many charts already waiting for a worker"""
+
+
+def _warm_worker():
+    """Worker initializer: load the chart backend (matplotlib + style by default) and draw once"""
+    from services.chart_generator import render_weekly_chart
+    render_weekly_chart(['Mon', 'Tue'], [0, 1])
+
+
+def _ping():
+    return os.getpid()
+
+
+def _render(kind, args):
+    from services import chart_generator
+    return getattr(chart_generator, RENDERERS[kind])(*args)
+
+
+class ChartService:
+    """Process pool + queue-depth limit + timings for chart rendering"""
+
+    def __init__(self, workers=CHART_WORKERS, timeout=CHART_TIMEOUT, max_queue=CHART_MAX_QUEUE):
+        self.workers = workers
+        self.timeout = timeout
+        self.max_queue = max_queue
+        self._pool = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._stats = {'rendered': 0, 'rejected': 0, 'timeouts': 0, 'errors': 0,
+                       'restarts': 0, 'render_total_s': 0.0, 'render_max_s': 0.0}
+
+    # ===== LIFECYCLE =====
+    def _ensure_pool(self):
+        """The pool; workers are forked (and warm themselves) on submit, in the calling thread"""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+            return self._pool
+
+    def start(self):
+        """Spawn and warm every worker now (blocks) - call from the main thread"""
+        pool = self._ensure_pool()
+        for future in [pool.submit(_ping) for _ in range(self.workers)]:
+            future.result()
+        return pool
+
+    def shutdown(self, wait=True):
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+    # ===== RENDERING =====
+    async def render(self, kind, *args, timeout=None):
+        """PNG bytes for RENDERERS[kind](*args), rendered in a worker"""
+        if kind not in RENDERERS:
+            raise ValueError(f"Unknown chart kind: {kind}")
+        if self._pending >= self.max_queue:
+            self._stats['rejected'] += 1
+            raise ChartQueueFull(f"{self._pending} charts already queued")
+
+        loop = asyncio.get_running_loop()
+        self._pending += 1
+        started = time.monotonic()
+        try:
+            # On timeout the worker still finishes the figure; only the caller stops waiting
+            png = await asyncio.wait_for(
+                loop.run_in_executor(self._ensure_pool(), _render, kind, args),
+                timeout or self.timeout
+            )
+        except asyncio.TimeoutError:
+            self._stats['timeouts'] += 1
+            raise
+        except BrokenProcessPool:
+            # A worker died (OOM, segfault) - replace the pool for the next caller
+            self._stats['errors'] += 1
+            self._stats['restarts'] += 1
+            self.shutdown(wait=False)
+            raise
+        except Exception:
+            self._stats['errors'] += 1
+            raise
+        finally:
+            self._pending -= 1
+
+        elapsed = time.monotonic() - started
+        self._stats['rendered'] += 1
+        self._stats['render_total_s'] += elapsed
+        self._stats['render_max_s'] = max(self._stats['render_max_s'], elapsed)
+        return png
+
+    # ===== METRICS =====
+    def get_stats(self):
+        stats = dict(self._stats)
+        stats['workers'] = self.workers if self._pool is not None else 0
+        stats['queued'] = self._pending
+        stats['avg_render_s'] = stats['render_total_s'] / stats['rendered'] if stats['rendered'] else 0.0
+        return stats
+
+
+# Shared pool for handlers, jobs and the weekly report pipeline
+chart_service = ChartService()
@@ -0,0 +1,240 @@
+"""
+Content Pool
+Motivation and congratulation messages generated off-peak (nightly job)
+and served from a local pool, so boosts, celebrations and reminders don't
+wait on the AI at the busiest times of day.
+
+- One pool per template and category (e.g. habit_done:building for a
+  3-6 day streak), TEMPLATES below. Messages use {slot} placeholders
+  ({name}, {goal}, {habit}) filled in per user when served.
+- Stored in CONTENT_POOL_FILE (data/content_pool.json), rewritten atomically
+  by refresh(). Pools the AI failed to fill keep yesterday's messages.
+- Rotation and dedup per user: each user walks a pool from their own
+  starting point, so they see every message once before any repeats.
+
+pick() is a dict lookup (microseconds) and returns None on a miss - the
+caller falls back to live generation (services.ai_response.pooled_reply).
+"""
+
+import asyncio
+import json
+import os
+import re
+import time
+import zlib
+
+CONTENT_POOL_FILE = os.getenv('CONTENT_POOL_FILE', 'data/content_pool.json')
+CONTENT_POOL_SIZE = int(os.getenv('CONTENT_POOL_SIZE', 20))
+CONTENT_POOL_HOUR = int(os.getenv('CONTENT_POOL_HOUR', 3))              # UTC, off-peak
+CONTENT_POOL_MAX_AGE = float(os.getenv('CONTENT_POOL_MAX_AGE', 36 * 3600))
+
+MIN_MESSAGES = 3
+
+# template -> (what to write, slots it may use, categories)
+TEMPLATES = {
+    'daily_boost': ("a daily motivation message that gives a boost of energy", (), ('any',)),
+    'boost': ("a powerful, energetic motivational message to boost {name}'s day", ('name',), ('any',)),
+    'goal_set': ("an excited, encouraging message celebrating that I just set the goal {goal}", ('goal',), ('any',)),
+    'goal_done': ("an enthusiastic message celebrating today's progress on the goal {goal}", ('goal',),
+                  ('start', 'building', 'strong')),
+    'habit_set': ("a message celebrating starting the 21-day habit {habit}", ('habit',), ('any',)),
+    'habit_done': ("an enthusiastic message celebrating today's progress on the habit {habit}", ('habit',),
+                   ('start', 'building', 'strong')),
+    'goal_reminder': ("a friendly nudge to work on the goal {goal} today", ('goal',), ('any',)),
+    'habit_reminder': ("a friendly nudge to do the habit {habit} today", ('habit',), ('any',)),
+}
+
+CATEGORY_HINTS = {
+    'start': "The streak is just 1-2 days - celebrate getting started.",
+    'building': "The streak is 3-6 days - celebrate the momentum.",
+    'strong': "The streak is a week or more - celebrate the consistency.",
+}
+
+
+def streak_category(streak):
+    """Category of the *_done templates for a streak"""
+    streak = streak or 0
+    if streak <= 2:
+        return 'start'
+    if streak <= 6:
+        return 'building'
+    return 'strong'
+
+
+def _pool_key(template, category):
+    return f"{template}:{category or 'any'}"
+
+
+def _fill(text, slots):
+    for name, value in (slots or {}).items():
+        text = text.replace('{' + name + '}', str(value))
+    return text
+
+
+def _prompt(template, category):
+    what, slots, _ = TEMPLATES[template]
+    placeholders = ', '.join('{' + slot + '}' for slot in slots)
+    lines = [
+        f"Write {CONTENT_POOL_SIZE} different versions of {what}.",
+        "Each is 1-2 short sentences, warm and casual, with at most one emoji.",
+        "Put each on its own line with no numbering, quotes or extra text.",
+    ]
+    if placeholders:
+        lines.append(f"Write the placeholder {placeholders} literally - it is filled in later.")
+    if category in CATEGORY_HINTS:
+        lines.append(CATEGORY_HINTS[category])
+    return ' '.join(lines)
+
+
+def parse_messages(text, allowed_slots=()):
+    """One message per line; drops numbering, chatter, bad placeholders and duplicates"""
+    messages = []
+    seen = set()
+    for line in text.splitlines():
+        line = re.sub(r'^\s*(?:\d+[.)]|[-*•])\s*', '', line).strip().strip('"“”').strip()
+        if not 20 <= len(line) <= 300 or line.endswith(':'):
+            continue
+        if any(slot not in allowed_slots for slot in re.findall(r'\{(\w*)\}', line)):
+            continue
+        if '{' in re.sub(r'\{\w+\}', '', line) or '}' in re.sub(r'\{\w+\}', '', line):
+            continue
+        normalized = re.sub(r'\W+', ' ', line).strip().lower()
+        if normalized in seen:
+            continue
+        seen.add(normalized)
+        messages.append(line)
+    return messages[:CONTENT_POOL_SIZE]
+
+
+class ContentPool:
+    """template:category -> messages, plus each user's position in every pool"""
+
+    def __init__(self, path=CONTENT_POOL_FILE):
+        self.path = path
+        self.pools = {}
+        self.generated_at = None
+        self._served = {}                # (chat_id, pool key) -> messages served since generation
+        self._loaded = False
+        self._stats = {'hits': 0, 'misses': 0, 'refreshes': 0, 'refresh_failures': 0}
+
+    # ===== STORAGE =====
+    def load(self):
+        """Read the pool file (on_startup; pick() loads lazily too)"""
+        self._loaded = True
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Content pool unreadable ({e}), starting empty")
+            return
+        self.pools = data.get('pools', {})
+        self.generated_at = data.get('generated_at')
+        self._served = {}
+        for entry, count in data.get('served', {}).items():
+            chat_id, key = entry.split('|', 1)
+            self._served[(int(chat_id), key)] = count
+
+    def save(self):
+        """Atomic write of pools and per-user positions"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        data = {
+            'generated_at': self.generated_at,
+            'pools': self.pools,
+            'served': {f"{chat_id}|{key}": count for (chat_id, key), count in self._served.items()},
+        }
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def is_stale(self):
+        if not self._loaded:
+            self.load()
+        return self.generated_at is None or time.time() - self.generated_at > CONTENT_POOL_MAX_AGE
+
+    # ===== SERVING =====
+    def pick(self, template, chat_id, category=None, slots=None):
+        """Next unseen message for this user (slots filled in), or None on a miss"""
+        if not self._loaded:
+            self.load()
+        key = _pool_key(template, category)
+        messages = self.pools.get(key)
+        if not messages:
+            self._stats['misses'] += 1
+            return None
+        served = self._served.get((chat_id, key), 0)
+        self._served[(chat_id, key)] = served + 1
+        # Own starting point per user, then walk the pool: no repeats until it's used up
+        start = zlib.crc32(f"{chat_id}|{key}".encode())
+        self._stats['hits'] += 1
+        return _fill(messages[(start + served) % len(messages)], slots)
+
+    # ===== GENERATION =====
+    async def refresh(self, generate, concurrency=4):
+        """
+        Regenerate every pool. generate(prompt) is a coroutine returning the
+        raw AI text; pools that come back short keep their old messages.
+        """
+        if not self._loaded:
+            self.load()
+        slots = asyncio.Semaphore(concurrency)
+
+        async def build(template, category):
+            async with slots:
+                try:
+                    text = await generate(_prompt(template, category))
+                except Exception as e:
+                    print(f"❌ Content pool {template}:{category} failed: {e}")
+                    return None
+            return parse_messages(text or '', TEMPLATES[template][1])
+
+        jobs = [(template, category) for template, (_, _, categories) in TEMPLATES.items()
+                for category in categories]
+        results = await asyncio.gather(*(build(template, category) for template, category in jobs))
+
+        pools = dict(self.pools)
+        fresh = 0
+        for (template, category), messages in zip(jobs, results):
+            if messages and len(messages) >= MIN_MESSAGES:
+                pools[_pool_key(template, category)] = messages
+                fresh += 1
+            else:
+                self._stats['refresh_failures'] += 1
+        if fresh:
+            self.pools = pools
+            self.generated_at = time.time()
+            self._served = {}        # new messages - everyone starts over
+            self._stats['refreshes'] += 1
+            await asyncio.get_running_loop().run_in_executor(None, self.save)
+        return fresh, len(jobs)
+
+    def get_stats(self):
+        stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups * 100 if lookups else 0.0
+        stats['pools'] = len(self.pools)
+        stats['messages'] = sum(len(messages) for messages in self.pools.values())
+        stats['age_h'] = (time.time() - self.generated_at) / 3600 if self.generated_at else None
+        return stats
+
+
+# Shared pool for handlers, reminders and jobs
+content_pool = ContentPool()
+
+
+async def refresh_content_pool(gateway=None, pool=content_pool):
+    """Generate all pools through the AI gateway (nightly job)"""
+    if gateway is None:
+        from services.ai_gateway import ai_gateway as gateway
+
+    async def generate(prompt):
+        return await gateway.complete(
+            [{"role": "user", "content": prompt}],
+            temperature=0.9,
+            max_tokens=60 * CONTENT_POOL_SIZE,
+            timeout=gateway.timeout * 3,
+        )
+
+    return await pool.refresh(generate)
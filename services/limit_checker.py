@@ -128,7 +128,7 @@ def can_view_progress(chat_id):
 
 def increment_mood_check(chat_id):
     """Increment mood check counter for free users"""
-    from database import get_db_connection
+    from database import get_db_connection, invalidate_user_cache
     from datetime import datetime
     
     # Premium users don't need tracking
@@ -161,6 +161,7 @@ def increment_mood_check(chat_id):
                 WHERE chat_id = %s
             ''', (today, mood_count, chat_id))
             conn.commit()
+            invalidate_user_cache(chat_id)
     finally:
         conn.close()
 
@@ -0,0 +1,108 @@
+"""
+Live Message
+A Telegram reply that grows while the AI streams it: the first chunk is
+sent as soon as it arrives, then the message is edited at most once per
+STREAM_EDIT_INTERVAL with whatever has streamed in since. Edits in between
+are coalesced, never queued, so a reply costs a handful of edits and stays
+inside Telegram's per-chat limits (outbound paces them too).
+
+    live = LiveMessage(update.message, reply_markup=get_main_menu_keyboard())
+    response = await chat_with_ai(text, chat_id, on_text=live.update)
+    await live.finish(response)
+"""
+
+import asyncio
+import os
+
+from telegram.error import BadRequest
+
+STREAM_REPLIES = os.getenv('STREAM_REPLIES', '1') == '1'
+STREAM_EDIT_INTERVAL = float(os.getenv('STREAM_EDIT_INTERVAL', 1.0))
+
+MAX_MESSAGE_LENGTH = 4096
+CURSOR = ' ▌'
+
+
+def _clip(text, room=MAX_MESSAGE_LENGTH):
+    return text if len(text) <= room else text[:room - 1] + '…'
+
+
+class LiveMessage:
+    """One send, then throttled edits of the latest streamed text"""
+
+    def __init__(self, reply_to, interval=STREAM_EDIT_INTERVAL, **send_kwargs):
+        self.reply_to = reply_to
+        self.interval = interval
+        self.send_kwargs = send_kwargs
+        self.message = None              # our reply, once sent
+        self.edits = 0
+        self._text = ''
+        self._shown = ''
+        self._changed = asyncio.Event()
+        self._task = None
+        self._request = None             # send/edit in flight
+        self._broken = False
+
+    def update(self, text):
+        """on_text callback: remember the latest text, the pacer shows it"""
+        self._text = text
+        self._changed.set()
+        if self._task is None:
+            self._task = asyncio.create_task(self._pace())
+
+    async def _pace(self):
+        while not self._broken:
+            await self._changed.wait()
+            self._changed.clear()
+            text = _clip(self._text, MAX_MESSAGE_LENGTH - len(CURSOR)) + CURSOR
+            self._request = asyncio.ensure_future(self._show(text))
+            # Shielded: finish() cancels the pacer, never a request half way through
+            await asyncio.shield(self._request)
+            await asyncio.sleep(self.interval)
+
+    async def _show(self, text):
+        if text == self._shown:
+            return
+        try:
+            if self.message is None:
+                self.message = await self.reply_to.reply_text(text, **self.send_kwargs)
+            else:
+                await self.message.edit_text(text)
+                self.edits += 1
+            self._shown = text
+        except BadRequest as e:
+            if 'not modified' in str(e).lower():
+                self._shown = text
+                return
+            print(f"❌ Live message edit failed: {e}")
+            self._broken = True
+        except Exception as e:
+            print(f"❌ Live message edit failed: {e}")
+            self._broken = True
+
+    async def finish(self, text):
+        """
+        Final text without the cursor. None (the call was superseded) keeps
+        what was shown, marked as cut off. Falls back to a fresh reply if
+        nothing was shown or editing stopped working.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._request is not None and not self._request.done():
+            await self._request
+
+        if text is None:
+            if self.message is None:
+                return
+            text = self._text.rstrip() + ' …'
+        text = _clip(text)
+
+        if self.message is not None and not self._broken:
+            await self._show(text)
+            if not self._broken:
+                return
+        await self.reply_to.reply_text(text, **self.send_kwargs)
@@ -0,0 +1,168 @@
+"""
+Outbound Dispatcher
+One gate for every Telegram API call the bot makes, plugged in with
+ApplicationBuilder().rate_limiter(outbound).
+
+Message-type calls (send*/edit*/copy*/forward*) wait for a per-chat token,
+then queue for a global, evenly spaced send slot. Slots go to the highest
+priority class waiting:
+
+    interactive (replies to the user, the default) > reminder > report > broadcast
+
+so a 9:00 burst of reminders or a running broadcast never delays a reply
+by more than a slot or two. A 429 pauses every class for retry_after and
+the request is retried. Pick the class per call:
+
+    await bot.send_message(..., rate_limit_args={'priority': 'reminder'})
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import time
+
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+
+from services.rate_limiter import (
+    TokenBucket, GLOBAL_RATE, PER_CHAT_RATE, MAX_CHAT_BUCKETS, retry_after_seconds
+)
+
+PRIORITIES = ('interactive', 'reminder', 'report', 'broadcast')   # highest first
+OUTBOUND_MAX_RETRIES = int(os.getenv('OUTBOUND_MAX_RETRIES', 3))
+PER_CHAT_BURST = 3                                                  # quick reply + edit + follow-up
+THROTTLED_PREFIXES = ('send', 'edit', 'copy', 'forward')
+UNTHROTTLED = 'other'          # stats bucket for non-message calls (getUpdates, answerCallbackQuery, ...)
+
+
+class OutboundDispatcher(BaseRateLimiter):
+    """Priority-ordered, smoothed, 429-aware rate limiter for the whole bot"""
+
+    def __init__(self, global_rate=GLOBAL_RATE, per_chat_rate=PER_CHAT_RATE,
+                 max_retries=OUTBOUND_MAX_RETRIES):
+        self.global_bucket = TokenBucket(global_rate)
+        self.per_chat_rate = per_chat_rate
+        self.max_retries = max_retries
+
+        self._chats = {}
+        self._queue = []                 # heap of (priority rank, seq, future)
+        self._seq = itertools.count()
+        self._wakeup = None
+        self._pump_task = None
+
+        self._started = time.monotonic()
+        self._stats = {
+            name: {'requests': 0, 'sent': 0, 'errors': 0, 'retry_after': 0,
+                   'wait_total_ms': 0.0, 'wait_max_ms': 0.0}
+            for name in PRIORITIES + (UNTHROTTLED,)
+        }
+
+    # ===== LIFECYCLE (called by the Bot) =====
+    async def initialize(self):
+        if self._pump_task is None:
+            self._wakeup = asyncio.Event()
+            self._pump_task = asyncio.create_task(self._pump())
+
+    async def shutdown(self):
+        if self._pump_task is not None:
+            self._pump_task.cancel()
+            self._pump_task = None
+        for _, _, future in self._queue:
+            future.cancel()
+        self._queue.clear()
+
+    # ===== SLOTS =====
+    async def _pump(self):
+        """Release one queued request per global token, best priority first"""
+        while True:
+            while not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+
+            await self.global_bucket.acquire()
+            while self._queue:
+                _, _, future = heapq.heappop(self._queue)
+                if not future.done():
+                    future.set_result(None)
+                    break
+
+    async def _slot(self, rank):
+        if self._pump_task is None:
+            await self.initialize()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (rank, next(self._seq), future))
+        self._wakeup.set()
+        await future
+
+    def _chat_bucket(self, chat_id):
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            if len(self._chats) >= MAX_CHAT_BUCKETS:
+                self._chats = {cid: b for cid, b in self._chats.items() if not b.is_idle()}
+            bucket = self._chats[chat_id] = TokenBucket(self.per_chat_rate, capacity=PER_CHAT_BURST)
+        return bucket
+
+    # ===== REQUESTS =====
+    async def process_request(self, callback, args, kwargs, endpoint, data, rate_limit_args):
+        throttled = endpoint.startswith(THROTTLED_PREFIXES)
+        name = (rate_limit_args or {}).get('priority', 'interactive')
+        if not throttled:
+            name = UNTHROTTLED
+        elif name not in PRIORITIES:
+            name = 'interactive'
+        stats = self._stats[name]
+        stats['requests'] += 1
+
+        chat_id = data.get('chat_id')
+
+        for attempt in range(self.max_retries + 1):
+            started = time.monotonic()
+            if throttled:
+                if isinstance(chat_id, int):
+                    await self._chat_bucket(chat_id).acquire()
+                await self._slot(PRIORITIES.index(name))
+
+            waited_ms = (time.monotonic() - started) * 1000
+            stats['wait_total_ms'] += waited_ms
+            stats['wait_max_ms'] = max(stats['wait_max_ms'], waited_ms)
+
+            try:
+                result = await callback(*args, **kwargs)
+            except RetryAfter as e:
+                stats['retry_after'] += 1
+                # Flood control is bot-wide: hold every class back
+                self.global_bucket.pause(retry_after_seconds(e.retry_after))
+                if attempt == self.max_retries:
+                    stats['errors'] += 1
+                    raise
+                continue
+            except Exception:
+                stats['errors'] += 1
+                raise
+
+            stats['sent'] += 1
+            return result
+
+    # ===== METRICS =====
+    def get_stats(self):
+        """Per-class counters, throughput and queue depth"""
+        uptime = max(time.monotonic() - self._started, 1e-9)
+        queued = [0] * len(PRIORITIES)
+        for rank, _, future in self._queue:
+            if not future.done():
+                queued[rank] += 1
+
+        stats = {}
+        for rank, name in enumerate(PRIORITIES + (UNTHROTTLED,)):
+            entry = dict(self._stats[name])
+            attempts = entry['sent'] + entry['errors'] + entry['retry_after']
+            entry['avg_wait_ms'] = entry['wait_total_ms'] / attempts if attempts else 0.0
+            entry['per_sec'] = entry['sent'] / uptime
+            entry['queued'] = queued[rank] if rank < len(queued) else 0
+            stats[name] = entry
+        return stats
+
+
+# Shared instance wired into the Application in bot.py
+outbound = OutboundDispatcher()
@@ -3,7 +3,7 @@ Progress Display Service - FREE USERS ONLY
 No weekly charts/reports - Premium only
 """
 
-from database import get_all_goals, get_all_habits, get_user
+from database import get_all_goals, get_all_habits, get_user, count_done_on
 from database.premium_db import is_premium_user
 from datetime import date
 from services.limit_checker import get_remaining_limits
@@ -19,7 +19,7 @@ def render_progress_screen(chat_id):
     # Get limits
     limits = get_remaining_limits(chat_id)
     
-    # Count completed today - check goals/habits tables directly
+    # Count completed today and today's mood
     from database.connection import get_db_connection
     connection = get_db_connection()
     
@@ -32,25 +32,10 @@ def render_progress_screen(chat_id):
         try:
             today = date.today()
             
-            # Count goals marked done today
-            cursor.execute("""
-                SELECT COUNT(*) as count FROM goals
-                WHERE chat_id = %s AND status = 'completed' 
-                AND DATE(completed_at) = %s
-            """, (chat_id, today))
-            result = cursor.fetchone()
-            if result:
-                goals_completed_today = result['count']
-            
-            # Count habits marked done today
-            cursor.execute("""
-                SELECT COUNT(*) as count FROM habits
-                WHERE chat_id = %s AND status = 'completed'
-                AND DATE(completed_at) = %s
-            """, (chat_id, today))
-            result = cursor.fetchone()
-            if result:
-                habits_completed_today = result['count']
+            # Goals/habits done today (one lookup in the completion bitmaps)
+            done_today = count_done_on(chat_id, today)
+            goals_completed_today = done_today['goal']
+            habits_completed_today = done_today['habit']
             
             # Mood check today
             cursor.execute("""
@@ -0,0 +1,68 @@
+"""
+Rate Limiter
+Asyncio token buckets for outgoing Telegram messages.
+
+Telegram allows roughly 30 messages/second overall and about 1/second to
+the same chat; going faster earns 429 "Too Many Requests" with a
+retry_after. The outbound dispatcher combines one global bucket with
+lazily created per-chat buckets and pauses everything when Telegram says so.
+"""
+
+import asyncio
+import os
+import time
+
+GLOBAL_RATE = float(os.getenv('TELEGRAM_GLOBAL_RATE', 25))      # msgs/sec, kept under the 30 limit
+PER_CHAT_RATE = float(os.getenv('TELEGRAM_PER_CHAT_RATE', 1))   # msgs/sec to one chat
+MAX_CHAT_BUCKETS = 10000                                        # idle buckets pruned beyond this
+
+
+def retry_after_seconds(retry_after):
+    """RetryAfter.retry_after is an int (PTB 20) or a timedelta (newer PTB)"""
+    return retry_after.total_seconds() if hasattr(retry_after, 'total_seconds') else float(retry_after)
+
+
+class TokenBucket:
+    """
+    `rate` tokens per second, bursts up to `capacity` (default 1: evenly
+    spaced sends, no burst). Waiters are served in arrival order.
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait for a token"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds):
+        """Hand out nothing for `seconds` (e.g. Telegram's retry_after)"""
+        now = time.monotonic()
+        self._paused_until = max(self._paused_until, now + seconds)
+        self._tokens = 0
+        self._updated = max(now, self._paused_until)
+
+    def is_idle(self):
+        """Full and nobody waiting - safe to drop"""
+        self._refill(max(time.monotonic(), self._updated))
+        return self._tokens >= self.capacity and not self._lock.locked()
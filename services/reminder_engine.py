@@ -0,0 +1,218 @@
+"""
+Reminder Engine
+Compact time-bucketed index of goal/habit reminders and EOD summaries.
+
+Instead of one PTB job per (user, item, reminder time), every reminder is a
+small key in a bucket for its UTC minute of the day. One repeating job ticks
+each minute and hands back the keys that are due. Buckets are recomputed per
+timezone when its UTC offset changes (DST).
+
+All methods run on the bot's event loop (handlers and job callbacks), so no
+locking is needed.
+"""
+
+import datetime
+import time
+from collections import defaultdict
+
+import pytz
+
+MINUTES_PER_DAY = 24 * 60
+MAX_CATCHUP_MINUTES = 15   # a late tick fires missed minutes up to this far back
+
+
+def parse_hhmm(value):
+    """'HH:MM' -> minutes after midnight, or None if malformed"""
+    try:
+        parts = value.split(':')
+        if len(parts) != 2:
+            return None
+        h, m = int(parts[0]), int(parts[1])
+    except (AttributeError, ValueError):
+        return None
+    if 0 <= h < 24 and 0 <= m < 60:
+        return h * 60 + m
+    return None
+
+
+def _offset_minutes(tzinfo, now_utc):
+    """Current UTC offset of a timezone in minutes"""
+    return int(now_utc.astimezone(tzinfo).utcoffset().total_seconds() // 60)
+
+
+class ReminderEngine:
+    """
+    UTC-minute buckets of reminder keys: (chat_id, kind, item_id, 'HH:MM').
+    kind is 'goal', 'habit' or 'eod' (item_id 0). The key doubles as the
+    registry key - lookup, cancel and reschedule never scan other users.
+    """
+
+    def __init__(self):
+        self._buckets = defaultdict(set)     # UTC minute of day -> keys
+        self._slots = {}                     # key -> (UTC minute of day, tz name)
+        self._by_chat = defaultdict(dict)    # chat_id -> {(kind, item_id): set(keys)}
+        self._by_tz = defaultdict(set)       # tz name -> keys
+        self._tz = {}                        # tz name -> (tzinfo, offset minutes in use)
+
+        self._last_minute = None             # absolute UTC minute of the last tick
+        self._job = None
+        self._stats = {'fired': 0, 'ticks': 0, 'rebuckets': 0, 'last_tick_ms': 0.0}
+
+    # ===== INDEX MAINTENANCE =====
+    def _utc_minute(self, local_minute, tz_name):
+        return (local_minute - self._tz[tz_name][1]) % MINUTES_PER_DAY
+
+    def add(self, chat_id, kind, item_id, reminder_times, tzinfo):
+        """Index (or re-index) an item's reminders. Returns the number added."""
+        self.remove(chat_id, kind, item_id)
+
+        tz_name = tzinfo.zone
+        if tz_name not in self._tz:
+            now_utc = datetime.datetime.now(pytz.UTC)
+            self._tz[tz_name] = (tzinfo, _offset_minutes(tzinfo, now_utc))
+
+        keys = set()
+        for reminder_time in reminder_times or []:
+            local_minute = parse_hhmm(reminder_time)
+            if local_minute is None:
+                continue
+
+            key = (chat_id, kind, item_id, f"{local_minute // 60:02d}:{local_minute % 60:02d}")
+            utc_minute = self._utc_minute(local_minute, tz_name)
+            self._buckets[utc_minute].add(key)
+            self._slots[key] = (utc_minute, tz_name)
+            self._by_tz[tz_name].add(key)
+            keys.add(key)
+
+        if keys:
+            self._by_chat[chat_id][(kind, item_id)] = keys
+        return len(keys)
+
+    def _discard(self, key):
+        """Unlink one key from the bucket and timezone indexes"""
+        utc_minute, tz_name = self._slots.pop(key)
+        bucket = self._buckets[utc_minute]
+        bucket.discard(key)
+        if not bucket:
+            del self._buckets[utc_minute]
+        self._by_tz[tz_name].discard(key)
+
+    def remove(self, chat_id, kind, item_id):
+        """Drop all reminders of one item. Returns the number removed."""
+        items = self._by_chat.get(chat_id)
+        if not items:
+            return 0
+        keys = items.pop((kind, item_id), None)
+        if not items:
+            del self._by_chat[chat_id]
+        if not keys:
+            return 0
+
+        for key in keys:
+            self._discard(key)
+        return len(keys)
+
+    # ===== REGISTRY LOOKUPS (O(1) by key) =====
+    def get(self, chat_id, kind, item_id, at):
+        """(UTC minute of day, tz name) for one reminder, or None"""
+        return self._slots.get((chat_id, kind, item_id, at))
+
+    def cancel(self, chat_id, kind, item_id, at=None):
+        """Cancel one reminder time, or every time of the item when at is None"""
+        if at is None:
+            return self.remove(chat_id, kind, item_id)
+
+        key = (chat_id, kind, item_id, at)
+        if key not in self._slots:
+            return 0
+        self._discard(key)
+
+        items = self._by_chat[chat_id]
+        keys = items[(kind, item_id)]
+        keys.discard(key)
+        if not keys:
+            del items[(kind, item_id)]
+            if not items:
+                del self._by_chat[chat_id]
+        return 1
+
+    def reschedule(self, chat_id, kind, item_id, reminder_times, tzinfo):
+        """Replace an item's reminder times (same as add)"""
+        return self.add(chat_id, kind, item_id, reminder_times, tzinfo)
+
+    def reschedule_chat(self, chat_id, tzinfo):
+        """Move all of a user's reminders to a new timezone (same local times)"""
+        items = list(self._by_chat.get(chat_id, {}).items())
+        for (kind, item_id), keys in items:
+            self.add(chat_id, kind, item_id, [key[3] for key in keys], tzinfo)
+        return sum(len(keys) for _, keys in items)
+
+    def reminders_for(self, chat_id):
+        """All reminder keys of one user"""
+        return [key for keys in self._by_chat.get(chat_id, {}).values() for key in keys]
+
+    def _refresh_offsets(self, now_utc):
+        """Re-bucket every timezone whose UTC offset changed (DST switch)"""
+        for tz_name, (tzinfo, offset) in list(self._tz.items()):
+            new_offset = _offset_minutes(tzinfo, now_utc)
+            if new_offset == offset:
+                continue
+
+            self._tz[tz_name] = (tzinfo, new_offset)
+            for key in self._by_tz[tz_name]:
+                old_minute, _ = self._slots[key]
+                new_minute = self._utc_minute(parse_hhmm(key[3]), tz_name)
+                self._buckets[old_minute].discard(key)
+                if not self._buckets[old_minute]:
+                    del self._buckets[old_minute]
+                self._buckets[new_minute].add(key)
+                self._slots[key] = (new_minute, tz_name)
+            self._stats['rebuckets'] += 1
+
+    # ===== TICKING =====
+    def due(self, now_utc=None):
+        """
+        Keys due since the previous call (including catch-up of skipped
+        minutes after a late tick, capped at MAX_CATCHUP_MINUTES).
+        """
+        started = time.monotonic()
+        now_utc = now_utc or datetime.datetime.now(pytz.UTC)
+        current = int(now_utc.timestamp() // 60)
+
+        self._refresh_offsets(now_utc)
+
+        first = current if self._last_minute is None else self._last_minute + 1
+        first = max(first, current - MAX_CATCHUP_MINUTES + 1)
+
+        due = []
+        for minute in range(first, current + 1):
+            due.extend(self._buckets.get(minute % MINUTES_PER_DAY, ()))
+        self._last_minute = current
+
+        self._stats['ticks'] += 1
+        self._stats['fired'] += len(due)
+        self._stats['last_tick_ms'] = (time.monotonic() - started) * 1000
+        return due
+
+    def start(self, job_queue, callback):
+        """One repeating job at the top of every minute"""
+        if self._job is not None:
+            return self._job
+        now = datetime.datetime.now(pytz.UTC)
+        first = 60 - now.second - now.microsecond / 1_000_000
+        self._job = job_queue.run_repeating(callback, interval=60, first=first, name='reminder_tick')
+        return self._job
+
+    # ===== METRICS =====
+    def stats(self):
+        """Index size and tick counters"""
+        stats = dict(self._stats)
+        stats['reminders'] = len(self._slots)
+        stats['buckets'] = len(self._buckets)
+        stats['users'] = len(self._by_chat)
+        stats['timezones'] = len(self._tz)
+        return stats
+
+
+# Shared instance used by bot.py and the handlers
+reminder_engine = ReminderEngine()
@@ -0,0 +1,275 @@
+"""
+Weekly Report Pipeline
+The Sunday report run as stages, each with its own concurrency knob:
+
+    fetch   weekly stats + 7-day series for a whole chunk in two queries
+    chart   chart cache, else warm chart workers        (REPORT_CHART_QUEUE, services/chart_service.py)
+    ai      batched insight calls, REPORT_AI_BATCH users per request, bounded
+            (REPORT_AI_CONCURRENCY); REPORT_AI_BATCH=1 is one call per user
+            on a thread pool
+    send    send_photo via the outbound dispatcher      (REPORT_SEND_CONCURRENCY)
+
+Chart and AI for a user run concurrently and the users of a chunk run in
+parallel. Each chunk is finished (and its badges written in one statement)
+before the next is requested, so the job checkpoint always points at the
+last fully sent chunk and a crashed run resumes there.
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from database.async_db import run_sync
+from database.job_db import iter_users_checkpointed
+from database.premium_db import get_weekly_stats_bulk, get_daily_completions_bulk, award_badges_bulk
+from services.ai_analytics import generate_weekly_analysis, generate_weekly_analysis_batch, weekly_fallback
+from services.chart_cache import chart_cache, get_chart, send_photo_cached
+from services.chart_service import chart_service
+
+REPORT_CHUNK = int(os.getenv('REPORT_CHUNK', 500))
+REPORT_CHART_QUEUE = int(os.getenv('REPORT_CHART_QUEUE', 50))   # leaves chart_service room for handlers
+REPORT_AI_CONCURRENCY = int(os.getenv('REPORT_AI_CONCURRENCY', 16))
+REPORT_AI_TIMEOUT = float(os.getenv('REPORT_AI_TIMEOUT', 30))  # per AI request, single or batched
+REPORT_AI_BATCH = int(os.getenv('REPORT_AI_BATCH', 10))         # users per AI request
+REPORT_SEND_CONCURRENCY = int(os.getenv('REPORT_SEND_CONCURRENCY', 20))
+
+# (minimum completion %, badge_type, name, emoji) - best first
+BADGES = [
+    (90, 'soul_diamond', 'Soul Diamond', '💎'),
+    (80, 'soul_gold', 'Soul Gold', '🥇'),
+    (50, 'soul_silver', 'Soul Silver', '🥈'),
+]
+
+
+def completion_rate(stats):
+    done = (stats.get('goals_completed') or 0) + (stats.get('habits_completed') or 0)
+    total = (stats.get('total_goals') or 0) + (stats.get('total_habits') or 0)
+    return done / total * 100 if total else 0
+
+
+def pick_badge(rate):
+    """(badge_type, name, emoji) earned at this completion rate, or None"""
+    for minimum, badge_type, name, emoji in BADGES:
+        if rate >= minimum:
+            return badge_type, name, emoji
+    return None
+
+
+def week_series(daily, today):
+    """Last 7 days (oldest first) as (day labels, completions); missing days are 0"""
+    days = [today - timedelta(days=offset) for offset in range(6, -1, -1)]
+    return [d.strftime('%a') for d in days], [int(daily.get(d, 0) or 0) for d in days]
+
+
+def build_report(user_name, stats, rate, badge, ai_insights):
+    badge_line = f"🏆 **New Achievement!**\n{badge[2]} **{badge[1]}** badge earned!" if badge else ""
+    return f"""
+╔═══════════════════════════════╗
+║  📊 **WEEKLY PROGRESS REPORT** ║
+╚═══════════════════════════════╝
+
+**Hey {user_name}!** Your week is complete!
+
+📈 **Performance:**
+• Completion Rate: **{rate:.1f}%**
+• Goals: {stats.get('goals_completed') or 0}/{stats.get('total_goals') or 0} ✅
+• Habits: {stats.get('habits_completed') or 0}/{stats.get('total_habits') or 0} ✅
+
+{badge_line}
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+🧠 **AI Insights:**
+
+{ai_insights}
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+Have an amazing week ahead! 💪
+"""
+
+
+class WeeklyReportPipeline:
+    """Pools, limits and per-stage timings for one report run"""
+
+    def __init__(self, bot, charts=chart_service, cache=chart_cache, chart_queue=REPORT_CHART_QUEUE,
+                 ai_concurrency=REPORT_AI_CONCURRENCY, send_concurrency=REPORT_SEND_CONCURRENCY,
+                 ai_timeout=REPORT_AI_TIMEOUT, ai_func=generate_weekly_analysis,
+                 ai_batch=REPORT_AI_BATCH, ai_batch_func=generate_weekly_analysis_batch):
+        self.bot = bot
+        self.ai_func = ai_func
+        self.ai_timeout = ai_timeout
+        self.ai_batch = ai_batch
+        self.ai_batch_func = ai_batch_func
+        self._ai_slots = asyncio.Semaphore(ai_concurrency)
+        self.charts = charts
+        self.cache = cache
+        self._chart_slots = asyncio.Semaphore(chart_queue)
+        self._ai_pool = ThreadPoolExecutor(max_workers=ai_concurrency, thread_name_prefix='report-ai')
+        self._send_slots = asyncio.Semaphore(send_concurrency)
+        self._timings = {stage: [0, 0.0, 0.0] for stage in ('fetch', 'chart', 'ai', 'send')}
+        self._counts = {'users': 0, 'sent': 0, 'skipped': 0, 'failed': 0, 'ai_fallbacks': 0, 'ai_requests': 0}
+
+    def _record(self, stage, started):
+        elapsed = time.monotonic() - started
+        timing = self._timings[stage]
+        timing[0] += 1
+        timing[1] += elapsed
+        timing[2] = max(timing[2], elapsed)
+
+    # ===== STAGES =====
+    async def fetch(self, chat_ids, today):
+        """Stats and 7-day series for a chunk: {chat_id: stats}, {chat_id: {date: n}}"""
+        started = time.monotonic()
+        stats, series = await asyncio.gather(
+            run_sync(get_weekly_stats_bulk, chat_ids),
+            run_sync(get_daily_completions_bulk, chat_ids, today - timedelta(days=6), today)
+        )
+        self._record('fetch', started)
+        return stats, series
+
+    async def chart(self, days, completions):
+        """(cache key, file_id or PNG bytes)"""
+        async with self._chart_slots:
+            started = time.monotonic()
+            key, photo = await get_chart('weekly', (days, completions), cache=self.cache, charts=self.charts)
+            self._record('chart', started)
+        return key, photo
+
+    async def ai_batch_call(self, users):
+        """One request for [(chat_id, stats, user_name)] -> {chat_id: insight} (may be partial)"""
+        async with self._ai_slots:
+            self._counts['ai_requests'] += 1
+            try:
+                return await asyncio.wait_for(self.ai_batch_func(users), self.ai_timeout)
+            except Exception as e:
+                print(f"⚠️ Weekly AI batch of {len(users)} failed: {e!r}")
+                return {}
+
+    def start_ai_batches(self, users):
+        """Kick off the chunk's batches; {chat_id: future of its batch's insights}"""
+        batches = {}
+        for i in range(0, len(users), self.ai_batch):
+            batch = users[i:i + self.ai_batch]
+            future = asyncio.ensure_future(self.ai_batch_call(batch))
+            for chat_id, _, _ in batch:
+                batches[chat_id] = future
+        return batches
+
+    async def ai(self, chat_id, stats, user_name, batch=None):
+        started = time.monotonic()
+        loop = asyncio.get_running_loop()
+        try:
+            if batch is not None:
+                # Shared by every user of the batch - one user failing mustn't cancel it
+                insight = (await asyncio.shield(batch)).get(chat_id)
+                if insight is None:
+                    raise ValueError("no usable insight in the batch reply")
+            else:
+                self._counts['ai_requests'] += 1
+                insight = await asyncio.wait_for(
+                    loop.run_in_executor(self._ai_pool, self.ai_func, chat_id, stats, user_name),
+                    self.ai_timeout
+                )
+        except Exception as e:
+            print(f"⚠️ Weekly AI insight for {chat_id} failed: {e!r}")
+            self._counts['ai_fallbacks'] += 1
+            insight = weekly_fallback(stats, user_name)
+        self._record('ai', started)
+        return insight
+
+    async def send(self, chat_id, chart, report):
+        key, photo = chart
+        async with self._send_slots:
+            started = time.monotonic()
+            await send_photo_cached(
+                self.bot, chat_id, key, photo, self.cache,
+                caption=report,
+                parse_mode='Markdown',
+                rate_limit_args={'priority': 'report'}
+            )
+            self._record('send', started)
+
+    # ===== DRIVER =====
+    async def process_user(self, user, stats, daily, today, awards, batch=None):
+        chat_id = user['chat_id']
+        user_name = user.get('name') or 'friend'
+        rate = completion_rate(stats)
+        badge = pick_badge(rate)
+        if badge:
+            awards.append((chat_id, badge[0], rate))
+
+        days, completions = week_series(daily, today)
+        chart, insight = await asyncio.gather(
+            self.chart(days, completions),
+            self.ai(chat_id, stats, user_name, batch)
+        )
+        await self.send(chat_id, chart, build_report(user_name, stats, rate, badge, insight))
+
+    async def process_chunk(self, users, stats_by_chat, series_by_chat, today):
+        """Render, analyse and send one chunk. Returns the badge awards to write."""
+        awards = []
+        eligible = []
+        for user in users:
+            stats = stats_by_chat.get(user['chat_id'])
+            if not stats or (stats.get('total_goals') or 0) + (stats.get('total_habits') or 0) == 0:
+                self._counts['skipped'] += 1
+                continue
+            eligible.append((user, stats))
+
+        batches = {}
+        if self.ai_batch > 1:
+            batches = self.start_ai_batches([(user['chat_id'], stats, user.get('name') or 'friend')
+                                             for user, stats in eligible])
+        jobs = []
+        for user, stats in eligible:
+            chat_id = user['chat_id']
+            jobs.append((user, self.process_user(user, stats, series_by_chat.get(chat_id, {}), today, awards,
+                                                 batches.get(chat_id))))
+
+        self._counts['users'] += len(users)
+        results = await asyncio.gather(*(job for _, job in jobs), return_exceptions=True)
+        for (user, _), result in zip(jobs, results):
+            if isinstance(result, Exception):
+                print(f"❌ Error sending report to {user['chat_id']}: {result}")
+                self._counts['failed'] += 1
+            else:
+                self._counts['sent'] += 1
+        return awards
+
+    async def run(self, run_key, chunk_size=REPORT_CHUNK):
+        """Whole premium user base, checkpointed per chunk under run_key"""
+        today = date.today()
+        chunks = iter_users_checkpointed('weekly_reports', run_key, chunk_size=chunk_size, premium_only=True)
+        while True:
+            users = await run_sync(next, chunks, None)
+            if users is None:
+                break
+            stats, series = await self.fetch([user['chat_id'] for user in users], today)
+            awards = await self.process_chunk(users, stats, series, today)
+            await run_sync(award_badges_bulk, awards)
+        return self.summary()
+
+    def summary(self):
+        """Counts plus per-stage calls / avg / max seconds"""
+        summary = dict(self._counts)
+        for stage, (calls, total, longest) in self._timings.items():
+            summary[stage] = {'calls': calls, 'avg_s': total / calls if calls else 0.0, 'max_s': longest}
+        return summary
+
+    def close(self):
+        self._ai_pool.shutdown(wait=False)
+
+
+async def run_weekly_reports(bot, run_key):
+    """Entry point for the Sunday job"""
+    pipeline = WeeklyReportPipeline(bot)
+    started = time.monotonic()
+    try:
+        summary = await pipeline.run(run_key)
+    finally:
+        pipeline.close()
+    summary['elapsed_s'] = time.monotonic() - started
+    return summary